@@ -15,6 +15,7 @@ import platform
 import webbrowser
 
 from system.system_controller import SystemController
+from src.classes.state_persister import StatePersister
 
 
 # ======================================================
@@ -26,6 +27,12 @@ COMMON_TICKERS = [
     "WMT", "JPM", "V", "MA"
 ]
 
+# Long ranges are downsampled (LTTB) to about this many chart points.
+CHART_MAX_POINTS = 1500
+
+# GUI state is saved in the compact columnar binary format.
+STATE_FILE = "data/app_state.stkb"
+
 
 # ======================================================
 # Autocomplete Entry
@@ -100,8 +107,11 @@ class StockApp(tk.Tk):
 
         self.sc = SystemController(portfolio_csv_path="ex_portfolio.csv")
 
-        saved = self.sc.load_state()
+        # Compact binary state; fall back to the JSON file older versions wrote.
+        saved = self.sc.load_state(STATE_FILE) or self.sc.load_state()
         self.last_payload = saved.get("last_payload")
+        # Saves are debounced and written off the Tk thread.
+        self.persister = StatePersister(lambda state: self.sc.save_state(state, STATE_FILE))
 
         container = tk.Frame(self)
         container.pack(fill="both", expand=True)
@@ -122,7 +132,8 @@ class StockApp(tk.Tk):
         self.frames[page].tkraise()
 
     def on_exit(self):
-        self.sc.save_state({"last_payload": self.last_payload})
+        self.persister.request_save({"last_payload": self.last_payload})
+        self.persister.close()
         self.destroy()
 
 
@@ -252,7 +263,9 @@ class Page1_Stock(tk.Frame):
         start_str = start_date.strftime("%Y-%m-%d")
         end_str = end_date.strftime("%Y-%m-%d")
 
-        payload = self.controller.sc.get_stock_timeseries(ticker, start_str, end_str)
+        payload = self.controller.sc.get_stock_timeseries(
+            ticker, start_str, end_str, max_points=CHART_MAX_POINTS
+        )
 
         if "error" in payload:
             message = payload["error"]
@@ -267,6 +280,7 @@ class Page1_Stock(tk.Frame):
             return
 
         self.controller.last_payload = payload
+        self.controller.persister.request_save({"last_payload": payload})
 
         prices = payload["datasets"][0]["data"]
         spark = generate_sparkline(prices)
@@ -768,7 +782,7 @@ class PageExport(tk.Frame):
 
         save_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json")],
+            filetypes=[("JSON Files", "*.json"), ("Compact Binary Report", "*.stkb")],
             title="Save Analysis Report"
         )
 
@@ -778,6 +792,8 @@ class PageExport(tk.Frame):
         try:
             self.controller.sc.export_analysis(self.controller.last_payload, save_path)
             self.status.config(text=f"Exported to:\n{save_path}")
+            if not save_path.endswith(".json"):
+                return  # binary reports are read back with SystemController.load_report
 
             if platform.system() == "Windows":
                 os.startfile(save_path)
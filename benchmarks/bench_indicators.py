@@ -0,0 +1,91 @@
+"""
+Throughput benchmarks for the shared indicator kernels.
+
+Run from the repository root:
+
+    python benchmarks/bench_indicators.py --bars 1000000 --repeat 5
+
+Every row reports the best of ``--repeat`` runs as bars per second, so a
+kernel optimization shows up here once and reaches every caller
+(StockAnalyzer, PanelAnalyzer, simple_moving_avg, calc_technical_indicators).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.Functions.analysis.indicator_kernels import (  # noqa: E402
+    pct_change_anomaly_mask,
+    rsi_kernel,
+    rsi_sweep_kernel,
+    sma_kernel,
+    sma_sweep_kernel,
+)
+from src.Functions.analysis.indicator_registry import compute_indicators  # noqa: E402
+from src.Functions.analysis.price_anomaly_detect import log_returns, rolling_zscores  # noqa: E402
+
+
+def make_ohlcv(bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size=bars)))
+    spread = close * rng.uniform(0.001, 0.02, size=bars)
+    return {
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000, 1_000_000, size=bars).astype(np.float64),
+    }
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(bars, repeat, tickers):
+    data = make_ohlcv(bars)
+    close = data["Close"]
+    panel = np.vstack([make_ohlcv(bars, seed=s)["Close"] for s in range(tickers)])
+    windows = list(range(5, 201))
+
+    cases = [
+        ("sma_kernel(20)", bars, lambda: sma_kernel(close, 20)),
+        ("rsi_kernel(14)", bars, lambda: rsi_kernel(close, 14)),
+        ("pct_change_anomaly_mask", bars, lambda: pct_change_anomaly_mask(close, 0.05)),
+        ("rolling_zscores(20)", bars, lambda: rolling_zscores(log_returns(close[np.newaxis, :]), 20, 3.0, 10)),
+        (f"sma_sweep_kernel({len(windows)} windows)", bars * len(windows),
+         lambda: sma_sweep_kernel(close, windows)),
+        ("rsi_sweep_kernel(4 windows)", bars * 4, lambda: rsi_sweep_kernel(close, [7, 14, 21, 28])),
+        ("registry EMA/MACD/BBANDS/ATR/VWAP/OBV", bars,
+         lambda: compute_indicators(data, ["EMA_12", "MACD_12_26_9", "BBANDS_20_2", "ATR_14", "VWAP", "OBV"])),
+        (f"panel sma_kernel(20) x {tickers}", bars * tickers, lambda: sma_kernel(panel, 20)),
+        (f"panel rsi_kernel(14) x {tickers}", bars * tickers, lambda: rsi_kernel(panel, 14)),
+    ]
+
+    print(f"{'benchmark':<42}{'seconds':>12}{'bars/sec':>16}")
+    print("-" * 70)
+    for name, work, fn in cases:
+        seconds = best_time(fn, repeat)
+        print(f"{name:<42}{seconds:>12.4f}{work / seconds:>16,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indicator kernel throughput.")
+    parser.add_argument("--bars", type=int, default=1_000_000, help="Bars per series.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark (best is reported).")
+    parser.add_argument("--tickers", type=int, default=10, help="Rows in the panel benchmarks.")
+    args = parser.parse_args()
+    run(args.bars, args.repeat, args.tickers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import pandas as pd
+
+from src.classes.stock_data_manager import StockDataManager
+
+try:
+    import requests
+    _REQUESTS_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+except ImportError:  # requests is only needed by the yfinance backend
+    _REQUESTS_ERRORS = ()
+
+
+class EmptyDataError(RuntimeError):
+    """The provider returned no bars (yfinance signals failures this way instead of raising)."""
+
+
+class AsyncStockDataManager(StockDataManager):
+    """
+    StockDataManager variant that fetches many tickers concurrently with asyncio.
+
+    Each ticker goes through the normal ``fetch_stock_data`` path (memory cache,
+    disk cache, provider) on a dedicated pool of ``max_concurrency`` threads.
+    A slot is only freed when its thread has really finished, so an attempt
+    that timed out keeps its slot until the abandoned fetch returns and
+    retries never push the number of running fetches past the limit. Every
+    attempt has a timeout; connection errors, timeouts and empty results are
+    retried with exponential backoff. Failures are collected in
+    ``last_errors`` instead of being printed.
+
+    Example:
+        >>> manager = AsyncStockDataManager(max_concurrency=16, cache_dir="data/stock_cache")
+        >>> frames = manager.fetch_many_concurrent(["AAPL", "MSFT", "NVDA"], "2024-01-01", "2024-05-01")
+        >>> manager.last_errors
+        {}
+    """
+
+    # Errors worth retrying: network hiccups, timeouts and empty responses - not bad
+    # input or local failures such as permission/disk errors from the cache write.
+    TRANSIENT_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError, EmptyDataError) + _REQUESTS_ERRORS
+
+    def __init__(self, *args, max_concurrency: int = 16, timeout: float = 30.0,
+                 retries: int = 3, backoff: float = 0.5, **kwargs):
+        """
+        Initialize the concurrency limits on top of the StockDataManager settings.
+
+        Args:
+            max_concurrency (int): Maximum number of fetches running at once.
+            timeout (float): Seconds allowed for a single attempt.
+            retries (int): Extra attempts after a transient failure.
+            backoff (float): Base delay in seconds; attempt ``n`` waits about ``backoff * 2**n``.
+
+        Raises:
+            ValueError: If a limit is out of range.
+        """
+        super().__init__(*args, **kwargs)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        if retries < 0 or backoff < 0:
+            raise ValueError("retries and backoff must be non-negative")
+
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._last_errors: Dict[str, str] = {}
+
+    @property
+    def last_errors(self):
+        """Return {ticker: error message} for tickers that failed in the last batch."""
+        return dict(self._last_errors)
+
+    # ------------------------------------------------
+    # Async API
+    # ------------------------------------------------
+    async def fetch_stock_data_async(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """
+        Fetch one ticker with a per-attempt timeout and retry/backoff.
+
+        Raises:
+            ValueError: If the ticker is invalid (never retried).
+            EmptyDataError: If every attempt returned no bars.
+            Exception: The last transient error once all retries are used up.
+        """
+        executor = ThreadPoolExecutor(max_workers=self._max_concurrency, thread_name_prefix="stock-fetch")
+        try:
+            return await self._fetch_with_retries(
+                ticker, start, end, asyncio.Semaphore(self._max_concurrency), executor
+            )
+        finally:
+            executor.shutdown(wait=False)
+
+    async def fetch_many_async(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch many tickers concurrently, at most ``max_concurrency`` at a time.
+
+        Returns:
+            dict[str, pd.DataFrame]: One frame per ticker; failed tickers map to an
+            empty DataFrame and their error is recorded in ``last_errors``.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        slots = asyncio.Semaphore(self._max_concurrency)
+        executor = ThreadPoolExecutor(max_workers=self._max_concurrency, thread_name_prefix="stock-fetch")
+        errors: Dict[str, str] = {}
+
+        async def worker(ticker):
+            try:
+                return ticker, await self._fetch_with_retries(ticker, start, end, slots, executor)
+            except Exception as e:
+                errors[ticker] = f"{type(e).__name__}: {e}"
+                return ticker, pd.DataFrame()
+
+        try:
+            results = await asyncio.gather(*(worker(t) for t in tickers))
+        finally:
+            executor.shutdown(wait=False)
+        self._last_errors = errors
+        return dict(results)
+
+    async def _fetch_with_retries(self, ticker, start, end, slots, executor) -> pd.DataFrame:
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(ticker, start, end, slots, executor)
+            except self.TRANSIENT_ERRORS:
+                if attempt >= self._retries:
+                    raise
+                delay = self._backoff * (2 ** attempt)
+                # Jitter spreads retries out so a burst of failures does not retry in lockstep.
+                await asyncio.sleep(delay + random.uniform(0, delay))
+                attempt += 1
+
+    async def _attempt(self, ticker, start, end, slots, executor) -> pd.DataFrame:
+        """Run one fetch; the slot is released when the thread finishes, even after a timeout."""
+        await slots.acquire()
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, self.fetch_stock_data, ticker, start, end
+        )
+
+        def release(done):
+            slots.release()
+            if not done.cancelled():
+                done.exception()  # mark as retrieved when nobody awaits an abandoned attempt
+
+        future.add_done_callback(release)
+        try:
+            data = await asyncio.wait_for(asyncio.shield(future), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"no response for {ticker} within {self._timeout}s") from None
+
+        if data is None or data.empty:
+            raise EmptyDataError(f"no data returned for {ticker}")
+        return data
+
+    def fetch_many_concurrent(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+        """Blocking wrapper around fetch_many_async for scripts and nightly jobs."""
+        return asyncio.run(self.fetch_many_async(tickers, start, end))
+
+    def __str__(self):
+        return (
+            f"AsyncStockDataManager(api='{self.api}', max_concurrency={self._max_concurrency}, "
+            f"retries={self._retries})"
+        )
+
+    def __repr__(self):
+        return (
+            f"AsyncStockDataManager(api={self.api!r}, max_concurrency={self._max_concurrency!r}, "
+            f"timeout={self._timeout!r}, retries={self._retries!r}, backoff={self._backoff!r})"
+        )
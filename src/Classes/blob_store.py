@@ -0,0 +1,187 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Iterable, Set
+
+import numpy as np
+
+from src.Functions.reporting.binary_report import dumps_binary_report, loads_binary_report
+
+BLOB_KEY = "__blob__"
+
+
+class BlobStore:
+    """
+    Content-addressed storage for the large arrays inside analysis reports.
+
+    ``dedupe`` replaces every long flat list or array in a payload with a
+    small ``{"__blob__": <hash>, "length": n}`` reference and stores the
+    values once under ``<root>/<hash[:2]>/<hash>.stkb`` (compact binary
+    format). The hash is taken over the uncompressed encoding, so identical
+    price or indicator series share one file and re-exporting the same
+    analysis writes no new blobs. ``resolve`` restores the original payload.
+
+    Example:
+        >>> store = BlobStore("data/analysis_reports/blobs")
+        >>> slim = store.dedupe(payload)          # arrays -> {"__blob__": ...}
+        >>> store.resolve(slim) == payload
+        True
+    """
+
+    def __init__(self, root: str, min_length: int = 256):
+        """
+        Args:
+            root (str): Folder holding the blobs (created on the first ``put``).
+            min_length (int): Lists shorter than this stay inline in the report.
+
+        Raises:
+            ValueError: If min_length is not positive.
+        """
+        if min_length < 1:
+            raise ValueError("min_length must be positive.")
+        self._root = root
+        self._min_length = min_length
+        self._lock = threading.Lock()
+        self._written = 0
+        self._reused = 0
+
+    @property
+    def root(self):
+        return self._root
+
+    # ------------------------------------------------
+    # Blobs
+    # ------------------------------------------------
+    def put(self, values) -> str:
+        """
+        Store one list/array and return its content hash; existing blobs are not rewritten.
+
+        Raises:
+            OSError: If the blob cannot be written.
+        """
+        raw = dumps_binary_report(values, compression="none")
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            try:
+                os.utime(path)  # mark as in use so a concurrent collect_garbage keeps it
+            except FileNotFoundError:
+                pass  # collected meanwhile; write it again below
+            else:
+                with self._lock:
+                    self._reused += 1
+                return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(dumps_binary_report(values))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        with self._lock:
+            self._written += 1
+        return digest
+
+    def get(self, digest: str) -> list:
+        """
+        Load the values stored under ``digest``.
+
+        Raises:
+            FileNotFoundError: If the blob is missing.
+        """
+        with open(self._path(digest), "rb") as f:
+            return loads_binary_report(f.read())
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self._root, digest[:2], f"{digest}.stkb")
+
+    # ------------------------------------------------
+    # Payloads
+    # ------------------------------------------------
+    def dedupe(self, payload: Any) -> Any:
+        """Return a copy of ``payload`` with every large flat list/array stored as a blob reference."""
+        if isinstance(payload, dict):
+            return {k: self.dedupe(v) for k, v in payload.items()}
+        if self._is_blob_candidate(payload):
+            return {BLOB_KEY: self.put(payload), "length": len(payload)}
+        if isinstance(payload, (list, tuple)):
+            return [self.dedupe(v) for v in payload]
+        return payload
+
+    def resolve(self, document: Any) -> Any:
+        """Return ``document`` with every blob reference replaced by its values."""
+        if isinstance(document, dict):
+            if BLOB_KEY in document:
+                return self.get(document[BLOB_KEY])
+            return {k: self.resolve(v) for k, v in document.items()}
+        if isinstance(document, list):
+            return [self.resolve(v) for v in document]
+        return document
+
+    @staticmethod
+    def references(document: Any) -> Set[str]:
+        """Return the blob hashes a (deduplicated) document points to."""
+        if isinstance(document, dict):
+            if BLOB_KEY in document:
+                return {document[BLOB_KEY]}
+            return set().union(*(BlobStore.references(v) for v in document.values()))
+        if isinstance(document, list):
+            return set().union(*(BlobStore.references(v) for v in document))
+        return set()
+
+    def _is_blob_candidate(self, value) -> bool:
+        if isinstance(value, np.ndarray):
+            return value.ndim == 1 and len(value) >= self._min_length
+        return (
+            isinstance(value, (list, tuple)) and len(value) >= self._min_length
+            and not any(isinstance(v, (dict, list, tuple)) for v in value)
+        )
+
+    # ------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------
+    def collect_garbage(self, referenced: Iterable[str], min_age_seconds: float = 0.0) -> int:
+        """
+        Delete blobs not in ``referenced``; returns how many were removed.
+
+        Args:
+            referenced (Iterable[str]): Hashes still used by some report.
+            min_age_seconds (float): Keep unreferenced blobs written or reused more
+                recently than this, since a report being exported right now may
+                point to them before it is on disk.
+        """
+        keep = set(referenced)
+        cutoff = time.time() - min_age_seconds
+        removed = 0
+        for digest in self.digests() - keep:
+            path = self._path(digest)
+            try:
+                if os.path.getmtime(path) > cutoff:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+        return removed
+
+    def digests(self) -> Set[str]:
+        """Return the hashes of every stored blob."""
+        found = set()
+        for folder, _, files in os.walk(self._root):
+            found.update(name[:-len(".stkb")] for name in files if name.endswith(".stkb"))
+        return found
+
+    def stats(self) -> dict:
+        """Return how many blobs this store wrote or reused, and how many exist on disk."""
+        with self._lock:
+            return {"written": self._written, "reused": self._reused, "blobs": len(self.digests())}
+
+    def __str__(self):
+        return f"BlobStore(root={self._root!r})"
+
+    def __repr__(self):
+        return f"BlobStore(root={self._root!r}, min_length={self._min_length!r})"
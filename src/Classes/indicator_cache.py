@@ -0,0 +1,271 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+
+class IndicatorCache:
+    """
+    Bounded cache of indicator results keyed by data fingerprint and parameters.
+
+    The key is the blake2b fingerprint of the input columns (see
+    ``IndicatorContext.fingerprint``) plus the indicator name and parameters,
+    so the same ticker and range analyzed twice - or two overlapping batch
+    jobs that see identical bars - reuse the stored arrays instead of
+    recomputing them. Entries are evicted least-recently-used once
+    ``max_bytes`` is exceeded. With ``spill_dir`` every result is also written
+    to disk (bounded by ``max_disk_bytes``) so CLI reruns start warm.
+
+    Example:
+        >>> cache = IndicatorCache(max_bytes=32 * 1024 * 1024)
+        >>> cache.get_or_compute("ab12", "SMA", (20,), lambda: {"SMA_20": np.zeros(3)})["SMA_20"]
+        array([0., 0., 0.])
+        >>> cache.stats()["misses"]
+        1
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024, spill_dir: Optional[str] = None,
+                 max_disk_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the cache limits.
+
+        Args:
+            max_bytes (int): Memory budget across all cached arrays.
+            spill_dir (str | None): Folder for on-disk copies; None keeps the cache in memory only.
+            max_disk_bytes (int): Disk budget; the least recently used files are removed beyond it.
+
+        Raises:
+            ValueError: If a limit is not positive.
+        """
+        if max_bytes < 1 or max_disk_bytes < 1:
+            raise ValueError("max_bytes and max_disk_bytes must be positive.")
+
+        self._max_bytes = max_bytes
+        self._spill_dir = spill_dir
+        self._max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._disk: Optional[OrderedDict] = None
+        self._disk_bytes = 0
+
+    @property
+    def spill_dir(self):
+        return self._spill_dir
+
+    @staticmethod
+    def make_key(fingerprint: str, name: str, params=()) -> str:
+        """
+        Return the cache key for a fingerprint, indicator name and parameters.
+
+        Parameters are keyed as spelled (``str``), the same way indicator
+        output names are built, so ``BBANDS_20_2`` and ``BBANDS_20_2.0`` -
+        whose outputs are named differently - never share an entry.
+        """
+        parts = [fingerprint, name.upper()] + [str(p) for p in params]
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+
+    # ------------------------------------------------
+    # Lookup
+    # ------------------------------------------------
+    def get(self, fingerprint: str, name: str, params=()) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Return the cached outputs for this key, or None.
+
+        Returns:
+            dict[str, np.ndarray] | None: Read-only arrays keyed by output name.
+        """
+        key = self.make_key(fingerprint, name, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry["outputs"]
+
+        outputs = self._load(key)
+        with self._lock:
+            if outputs is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._insert(key, outputs)
+        return outputs
+
+    def get_or_compute(self, fingerprint: str, name: str, params,
+                       compute: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """Return cached outputs, or run ``compute()`` once and store its result."""
+        outputs = self.get(fingerprint, name, params)
+        if outputs is None:
+            outputs = compute()
+            self.put(fingerprint, name, params, outputs)
+        return outputs
+
+    # ------------------------------------------------
+    # Storage
+    # ------------------------------------------------
+    def put(self, fingerprint: str, name: str, params, outputs: Dict[str, np.ndarray]) -> None:
+        """Store one indicator's outputs (and spill them to disk when enabled)."""
+        outputs = {k: _read_only(v) for k, v in outputs.items()}
+        key = self.make_key(fingerprint, name, params)
+        with self._lock:
+            self._insert(key, outputs)
+        self._spill(key, outputs)
+
+    def clear(self) -> None:
+        """Drop every entry from memory and from the spill folder."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        for path in self._spill_files():
+            _remove_quietly(path)
+        with self._lock:
+            self._disk = None  # rebuilt from the (now empty) folder on next use
+
+    def _insert(self, key: str, outputs: Dict[str, np.ndarray]) -> None:
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)["bytes"]
+        size = sum(v.nbytes for v in outputs.values())
+        self._entries[key] = {"outputs": outputs, "bytes": size}
+        self._bytes += size
+
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            _, oldest = self._entries.popitem(last=False)
+            self._bytes -= oldest["bytes"]
+            self._evictions += 1
+
+    # ------------------------------------------------
+    # Disk spill
+    # ------------------------------------------------
+    def _path(self, key: str) -> str:
+        return os.path.join(self._spill_dir, f"{key}.npz")
+
+    def _disk_index(self) -> OrderedDict:
+        """
+        Spill file sizes keyed by path, oldest first.
+
+        Built from the folder once (call with the lock held) and then kept up
+        to date by ``_load``/``_spill``, so writes never list or stat the folder.
+        Files another process deletes are simply skipped when evicted.
+        """
+        if self._disk is None:
+            found = []
+            if os.path.isdir(self._spill_dir):
+                for name in os.listdir(self._spill_dir):
+                    if not name.endswith(".npz"):
+                        continue
+                    path = os.path.join(self._spill_dir, name)
+                    try:
+                        found.append((os.path.getmtime(path), path, os.path.getsize(path)))
+                    except FileNotFoundError:
+                        continue
+            self._disk = OrderedDict((path, size) for _, path, size in sorted(found))
+            self._disk_bytes = sum(self._disk.values())
+        return self._disk
+
+    def _spill_files(self):
+        if not self._spill_dir:
+            return []
+        with self._lock:
+            return list(self._disk_index())
+
+    def _load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        if not self._spill_dir:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                outputs = {k: _read_only(stored[k]) for k in stored.files}
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Ignoring unreadable indicator cache file {path}: {e}")
+            return None
+        with self._lock:
+            index = self._disk_index()
+            if path in index:
+                index.move_to_end(path)
+        return outputs
+
+    def _spill(self, key: str, outputs: Dict[str, np.ndarray]) -> None:
+        """Write atomically, then evict the oldest files beyond the disk budget."""
+        if not self._spill_dir:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self._spill_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **outputs)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Failed to write indicator cache file {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            index = self._disk_index()
+            self._disk_bytes += size - index.pop(path, 0)
+            index[path] = size
+            evicted = []
+            while self._disk_bytes > self._max_disk_bytes and len(index) > 1:
+                oldest, oldest_size = index.popitem(last=False)
+                self._disk_bytes -= oldest_size
+                evicted.append(oldest)
+        for oldest in evicted:
+            _remove_quietly(oldest)
+
+    # ------------------------------------------------
+    # Statistics
+    # ------------------------------------------------
+    def stats(self) -> dict:
+        """Return hit/miss counters and current memory usage."""
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": round((self._hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return f"IndicatorCache(entries={len(self._entries)}, bytes={self._bytes})"
+
+    def __repr__(self):
+        return (
+            f"IndicatorCache(max_bytes={self._max_bytes!r}, spill_dir={self._spill_dir!r}, "
+            f"max_disk_bytes={self._max_disk_bytes!r})"
+        )
+
+
+def _remove_quietly(path: str) -> None:
+    """Delete a spill file; another process may already have removed it."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_only(array) -> np.ndarray:
+    array = np.asarray(array)
+    if array.flags.writeable:
+        array = array.view()
+        array.setflags(write=False)
+    return array
@@ -0,0 +1,309 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class OHLCVResampler:
+    """
+    Builds weekly, monthly and quarterly OHLCV bars from daily bars and caches them.
+
+    Aggregation is one vectorized pass: bars are bucketed by calendar period
+    and reduced with ``np.ufunc.reduceat`` (Open first, High max, Low min,
+    Close last, Volume sum). Each coarse bar is labelled with the date of its
+    last daily bar. Results are cached per (ticker, rule, first daily date)
+    together with the daily bar count and a fingerprint of the boundary rows
+    plus a fixed sample of rows in between, so refetched last bars and
+    back-adjusted history are not served stale, while checking the cache
+    costs O(1) rather than O(n). When the same ticker comes back with the
+    same history plus extra daily bars at the end, only the new bars are
+    aggregated and merged into the last (possibly partial) period. With
+    ``cache_dir`` the aggregates are also saved next to the daily cache so a
+    new session starts warm.
+
+    Example:
+        >>> resampler = OHLCVResampler()
+        >>> weekly = resampler.get("AAPL", daily_df, "W")
+        >>> analyzer = StockAnalyzer("AAPL", weekly)   # indicators on weekly bars
+    """
+
+    RULES = {"D": "daily", "W": "weekly", "M": "monthly", "Q": "quarterly"}
+    SAMPLE_ROWS = 32
+
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None):
+        """
+        Args:
+            max_entries (int): Maximum number of cached (ticker, rule, start) series.
+            cache_dir (str | None): Folder for on-disk aggregates (one ``<TICKER>_<rule>.npz``
+                per series); None keeps them in memory only. Created on the first write.
+
+        Raises:
+            ValueError: If max_entries is not positive.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive.")
+        self._max_entries = max_entries
+        self._cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._incremental = 0
+        self._full = 0
+
+    # ------------------------------------------------
+    # Public API
+    # ------------------------------------------------
+    @classmethod
+    def resample(cls, daily: pd.DataFrame, rule: str) -> pd.DataFrame:
+        """
+        Aggregate daily bars to ``rule`` ("D", "W", "M" or "Q") without caching.
+
+        Raises:
+            ValueError: If the rule is unknown or the frame lacks Date/Close.
+        """
+        rule = cls._check_rule(rule)
+        columns = cls._columns(daily)
+        if rule == "D":
+            return daily.reset_index(drop=True)
+        return cls._to_frame(cls._aggregate(columns, rule))
+
+    def get(self, ticker: str, daily: pd.DataFrame, rule: str) -> pd.DataFrame:
+        """
+        Return ``daily`` resampled to ``rule``, reusing and extending cached aggregates.
+
+        Args:
+            ticker (str): Ticker the bars belong to.
+            daily (pd.DataFrame): Daily bars with 'Date' and 'Close' (plus any of Open/High/Low/Volume),
+                sorted by date.
+            rule (str): "D", "W", "M" or "Q".
+
+        Returns:
+            pd.DataFrame: Coarse bars with the same columns as ``daily``.
+        """
+        rule = self._check_rule(rule)
+        if rule == "D":
+            return daily.reset_index(drop=True)
+
+        columns = self._columns(daily)
+        days = columns["Date"]
+        key = (ticker.upper(), rule, days[0])
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._load(key)
+
+        fingerprint = self._fingerprint(columns, len(days))
+        if entry is not None and len(days) == entry["daily_count"] and fingerprint == entry["fingerprint"]:
+            with self._lock:
+                self._hits += 1
+            return self._to_frame(entry["bars"])
+
+        # Only extend when the cached daily bars are the prefix we have now (same
+        # columns, last date and fingerprint - revised or back-adjusted bars force a full pass).
+        count = entry["daily_count"] if entry is not None else 0
+        if entry is not None and days[-1] > entry["last_daily"] and len(days) > count \
+                and set(entry["bars"]) - {"_bucket"} == set(columns) \
+                and days[count - 1] == entry["last_daily"] \
+                and self._fingerprint(columns, count) == entry["fingerprint"]:
+            tail = {name: values[count:] for name, values in columns.items()}
+            bars = self._merge(entry["bars"], self._aggregate(tail, rule))
+            counter = "_incremental"
+        else:
+            bars = self._aggregate(columns, rule)
+            counter = "_full"
+
+        entry = {
+            "bars": bars, "last_daily": days[-1], "daily_count": len(days),
+            "fingerprint": fingerprint,
+        }
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        self._save(key, entry)
+        return self._to_frame(bars)
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        """Forget cached aggregates (in memory and on disk) for one ticker, or for every ticker."""
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == ticker.upper()]:
+                    del self._entries[key]
+        if not self._cache_dir or not os.path.isdir(self._cache_dir):
+            return
+        prefix = f"{ticker.upper()}_" if ticker is not None else ""
+        for name in os.listdir(self._cache_dir):
+            if name.startswith(prefix) and name.endswith(".npz"):
+                try:
+                    os.remove(os.path.join(self._cache_dir, name))
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> dict:
+        """Return how many requests were cache hits, incremental updates or full passes."""
+        with self._lock:
+            return {
+                "hits": self._hits, "incremental": self._incremental,
+                "full": self._full, "entries": len(self._entries),
+            }
+
+    # ------------------------------------------------
+    # Input
+    # ------------------------------------------------
+    @classmethod
+    def _check_rule(cls, rule: str) -> str:
+        rule = str(rule).upper()
+        if rule not in cls.RULES:
+            raise ValueError(f"Unknown resample rule {rule!r}; use one of {', '.join(cls.RULES)}.")
+        return rule
+
+    @staticmethod
+    def _columns(daily: pd.DataFrame) -> Dict[str, np.ndarray]:
+        if daily is None or daily.empty or "Date" not in daily.columns or "Close" not in daily.columns:
+            raise ValueError("Daily data must be a non-empty DataFrame with 'Date' and 'Close' columns.")
+
+        columns = {"Date": pd.to_datetime(daily["Date"]).to_numpy().astype("datetime64[D]")}
+        for name in ("Open", "High", "Low", "Close", "Volume"):
+            if name in daily.columns:
+                values = daily[name]
+                if isinstance(values, pd.DataFrame):
+                    values = values.iloc[:, 0]
+                columns[name] = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+        return columns
+
+    @classmethod
+    def _fingerprint(cls, columns: Dict[str, np.ndarray], stop: int) -> str:
+        """
+        Hash the bar count, the first and last of the first ``stop`` daily bars and
+        ``SAMPLE_ROWS`` evenly spaced bars between them (O(1) in the series length).
+        """
+        rows = np.unique(np.linspace(0, stop - 1, min(stop, cls.SAMPLE_ROWS + 2)).astype(np.int64))
+        digest = hashlib.blake2b(str(stop).encode(), digest_size=16)
+        for name in sorted(columns):
+            digest.update(name.encode())
+            digest.update(np.ascontiguousarray(columns[name][rows]).tobytes())
+        return digest.hexdigest()
+
+    # ------------------------------------------------
+    # Disk cache
+    # ------------------------------------------------
+    def _path(self, key) -> str:
+        ticker, rule, _ = key
+        return os.path.join(self._cache_dir, f"{ticker}_{rule}.npz")
+
+    def _load(self, key) -> Optional[dict]:
+        """Return the entry saved for ``key`` (same ticker, rule and first daily date), or None."""
+        if not self._cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                if stored["first_daily"] != key[2]:
+                    return None
+                bars = {name[len("bar_"):]: stored[name] for name in stored.files if name.startswith("bar_")}
+                return {
+                    "bars": bars, "last_daily": stored["last_daily"][()],
+                    "daily_count": int(stored["daily_count"]), "fingerprint": str(stored["fingerprint"]),
+                }
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] Ignoring unreadable resample cache file {path}: {e}")
+            return None
+
+    def _save(self, key, entry: dict) -> None:
+        """Write one entry atomically; failures only cost a recomputation later."""
+        if not self._cache_dir:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f, first_daily=key[2], last_daily=entry["last_daily"],
+                    daily_count=entry["daily_count"], fingerprint=entry["fingerprint"],
+                    **{f"bar_{name}": values for name, values in entry["bars"].items()},
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Failed to write resample cache file {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------
+    @staticmethod
+    def _bucket_ids(days: np.ndarray, rule: str) -> np.ndarray:
+        if rule == "W":
+            # 1970-01-01 was a Thursday; shifting by 3 days starts weeks on Monday.
+            return (days.astype(np.int64) + 3) // 7
+        months = days.astype("datetime64[M]").astype(np.int64)
+        return months if rule == "M" else months // 3
+
+    @classmethod
+    def _aggregate(cls, columns: Dict[str, np.ndarray], rule: str) -> Dict[str, np.ndarray]:
+        days = columns["Date"]
+        ids = cls._bucket_ids(days, rule)
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        ends = np.r_[starts[1:], len(days)] - 1
+
+        bars = {"Date": days[ends], "_bucket": ids[starts]}
+        reducers = {
+            "Open": lambda v: v[starts],
+            "High": lambda v: np.fmax.reduceat(v, starts),
+            "Low": lambda v: np.fmin.reduceat(v, starts),
+            "Close": lambda v: v[ends],
+            "Volume": lambda v: np.add.reduceat(np.nan_to_num(v), starts),
+        }
+        for name, reduce in reducers.items():
+            if name in columns:
+                bars[name] = reduce(columns[name])
+        return bars
+
+    @staticmethod
+    def _merge(old: Dict[str, np.ndarray], new: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Append freshly aggregated bars, folding the first one into a shared last period."""
+        if old["_bucket"][-1] != new["_bucket"][0]:
+            return {name: np.concatenate([old[name], new[name]]) for name in old}
+
+        merged = {name: values.copy() for name, values in old.items()}
+        combine = {
+            "Date": lambda a, b: b,
+            "_bucket": lambda a, b: a,
+            "Open": lambda a, b: a,
+            "High": lambda a, b: np.fmax(a, b),
+            "Low": lambda a, b: np.fmin(a, b),
+            "Close": lambda a, b: b,
+            "Volume": lambda a, b: a + b,
+        }
+        for name in merged:
+            merged[name][-1] = combine[name](merged[name][-1], new[name][0])
+        return {name: np.concatenate([merged[name], new[name][1:]]) for name in merged}
+
+    @staticmethod
+    def _to_frame(bars: Dict[str, np.ndarray]) -> pd.DataFrame:
+        frame = pd.DataFrame({name: values for name, values in bars.items() if name != "_bucket"})
+        frame["Date"] = pd.to_datetime(frame["Date"])
+        return frame
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return f"OHLCVResampler(entries={len(self._entries)})"
+
+    def __repr__(self):
+        return f"OHLCVResampler(max_entries={self._max_entries!r}, cache_dir={self._cache_dir!r})"
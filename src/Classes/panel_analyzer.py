@@ -0,0 +1,154 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.Functions.analysis.indicator_kernels import (
+    pct_change_anomaly_mask,
+    rsi_kernel,
+    sma_kernel,
+)
+
+
+class PanelAnalyzer:
+    """
+    Computes indicators for many tickers at once over a tickers x dates close matrix.
+
+    Where StockAnalyzer needs one instance (and one DataFrame copy) per ticker,
+    PanelAnalyzer keeps a single float64 matrix and runs each indicator as one
+    vectorized pass over all rows. Results use the same (tickers, dates) layout.
+    For a row without gaps the values equal StockAnalyzer's for that ticker.
+
+    Example:
+        >>> frames = manager.fetch_many(["AAPL", "MSFT"], "2024-01-01", "2024-05-01")
+        >>> panel = PanelAnalyzer.from_frames(frames)
+        >>> panel.calculate_sma(20).shape
+        (2, 82)
+    """
+
+    def __init__(self, tickers: List[str], dates, closes):
+        closes = np.ascontiguousarray(closes, dtype=np.float64)
+        if closes.ndim != 2 or closes.size == 0:
+            raise ValueError("closes must be a non-empty 2D array shaped (tickers, dates).")
+        if closes.shape != (len(tickers), len(dates)):
+            raise ValueError("closes shape must be (len(tickers), len(dates)).")
+
+        self._tickers = [t.upper() for t in tickers]
+        self._dates = pd.DatetimeIndex(dates)
+        # A read-only view: the caller's own array (returned as-is by
+        # ascontiguousarray when already float64) stays writable.
+        self._closes = closes.view()
+        self._closes.setflags(write=False)
+        self._indicators: Dict[str, np.ndarray] = {}
+
+    # ------------------------------------------------
+    # Constructors
+    # ------------------------------------------------
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "PanelAnalyzer":
+        """
+        Build a panel from per-ticker Date/Close frames (e.g. StockDataManager.fetch_many).
+
+        Dates are aligned on their union; a ticker without a bar on a date gets NaN.
+        Empty frames are skipped.
+        """
+        series = {}
+        for ticker, df in frames.items():
+            if df is None or df.empty or "Close" not in df.columns:
+                continue
+            close = df["Close"]
+            if isinstance(close, pd.DataFrame):
+                close = close.iloc[:, 0]
+            index = pd.to_datetime(df["Date"]) if "Date" in df.columns else pd.to_datetime(df.index)
+            series[ticker] = pd.Series(close.to_numpy(dtype=np.float64), index=pd.DatetimeIndex(index))
+
+        if not series:
+            raise ValueError("No ticker has Close data to analyze.")
+        return cls.from_wide(pd.DataFrame(series))
+
+    @classmethod
+    def from_wide(cls, wide: pd.DataFrame) -> "PanelAnalyzer":
+        """Build a panel from a dates x tickers DataFrame of closes."""
+        wide = wide.sort_index()
+        return cls(list(wide.columns), wide.index, wide.to_numpy(dtype=np.float64).T)
+
+    # ------------------------------------------------
+    # Properties
+    # ------------------------------------------------
+    @property
+    def tickers(self):
+        return list(self._tickers)
+
+    @property
+    def dates(self):
+        return self._dates
+
+    @property
+    def closes(self):
+        """Return the read-only (tickers, dates) close matrix."""
+        return self._closes
+
+    @property
+    def indicators(self):
+        return self._indicators
+
+    # ------------------------------------------------
+    # Indicators (one vectorized pass each)
+    # ------------------------------------------------
+    def calculate_sma(self, window=20) -> np.ndarray:
+        sma = sma_kernel(self._closes, window)
+        self._indicators[f"SMA_{window}"] = sma
+        return sma
+
+    def calculate_rsi(self, window=14) -> np.ndarray:
+        rsi = rsi_kernel(self._closes, window)
+        self._indicators[f"RSI_{window}"] = rsi
+        return rsi
+
+    def calculate_returns(self) -> np.ndarray:
+        """Simple returns p[t] / p[t-1] - 1; NaN for the first date and around gaps."""
+        returns = np.full(self._closes.shape, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns[:, 1:] = self._closes[:, 1:] / self._closes[:, :-1] - 1.0
+        returns[~np.isfinite(returns)] = np.nan
+        self._indicators["RETURNS"] = returns
+        return returns
+
+    def detect_anomalies(self, threshold=0.05) -> np.ndarray:
+        """Boolean (tickers, dates) mask using StockAnalyzer's percent-change rule."""
+        flags = pct_change_anomaly_mask(self._closes, threshold)
+        self._indicators["ANOMALY"] = flags
+        return flags
+
+    def analyze(self, sma_window=20, rsi_window=14, threshold=0.05) -> Dict[str, np.ndarray]:
+        """Run SMA, RSI, returns and anomaly flags for every ticker."""
+        return {
+            f"SMA_{sma_window}": self.calculate_sma(sma_window),
+            f"RSI_{rsi_window}": self.calculate_rsi(rsi_window),
+            "RETURNS": self.calculate_returns(),
+            "ANOMALY": self.detect_anomalies(threshold),
+        }
+
+    # ------------------------------------------------
+    # Views
+    # ------------------------------------------------
+    def row(self, ticker: str) -> Dict[str, np.ndarray]:
+        """Return every computed indicator for one ticker as 1D arrays."""
+        i = self._tickers.index(ticker.upper())
+        return {name: values[i] for name, values in self._indicators.items()}
+
+    def anomaly_indices(self, ticker: str) -> List[int]:
+        """Return the flagged date positions for one ticker (detect_anomalies must run first)."""
+        if "ANOMALY" not in self._indicators:
+            raise RuntimeError("Call detect_anomalies() first.")
+        return np.flatnonzero(self.row(ticker)["ANOMALY"]).tolist()
+
+    def to_frame(self, name: str) -> pd.DataFrame:
+        """Return one indicator as a dates x tickers DataFrame."""
+        return pd.DataFrame(self._indicators[name].T, index=self._dates, columns=self._tickers)
+
+    def __str__(self):
+        return f"PanelAnalyzer({len(self._tickers)} tickers x {len(self._dates)} dates)"
+
+    def __repr__(self):
+        return f"PanelAnalyzer(tickers={len(self._tickers)!r}, dates={len(self._dates)!r})"
@@ -29,13 +29,20 @@ class PortfolioManager:
 
         This method demonstrates composition in action.
         """
-        total = 0.0
-        for ticker, info in self._portfolio.items():
-            shares = float(info.get("shares", 0))
-            if shares <= 0:
-                continue
+        held = {
+            ticker: float(info.get("shares", 0))
+            for ticker, info in self._portfolio.items()
+            if float(info.get("shares", 0)) > 0
+        }
+        if not held:
+            return 0.0
 
-            df = self._data_manager.fetch_stock_data(ticker, start_date, end_date)
+        # One batched download for every position instead of one per ticker.
+        frames = self._data_manager.fetch_many(list(held), start_date, end_date)
+
+        total = 0.0
+        for ticker, shares in held.items():
+            df = frames.get(ticker)
             if df is None or df.empty:
                 continue
 
@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Optional
+
+import pandas as pd
+
+
+class PriceMemoryCache:
+    """
+    Bounded in-process cache of OHLCV frames with a TTL and LRU eviction.
+
+    One entry is kept per ticker together with the [start, end) range it was
+    fetched for. Any request whose range falls inside a cached range is answered
+    by slicing, so after a 1Y fetch the 6M/3M/1M ranges never hit the network.
+
+    Example:
+        >>> cache = PriceMemoryCache(ttl_seconds=300, max_entries=32)
+        >>> cache.get("AAPL", "2024-01-01", "2024-02-01") is None
+        True
+        >>> cache.stats()["misses"]
+        1
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 64,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache limits.
+
+        Args:
+            ttl_seconds (float): Seconds before an entry expires.
+            max_entries (int): Maximum number of tickers kept.
+            max_bytes (int): Approximate memory budget across all cached frames.
+            clock (callable): Time source, replaceable in tests.
+
+        Raises:
+            ValueError: If any limit is not positive.
+        """
+        if ttl_seconds <= 0 or max_entries < 1 or max_bytes < 1:
+            raise ValueError("ttl_seconds, max_entries and max_bytes must be positive.")
+
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ------------------------------------------------
+    # Lookup
+    # ------------------------------------------------
+    def get(self, ticker: str, start: str, end: str) -> Optional[pd.DataFrame]:
+        """
+        Return bars for [start, end) if a live cached range contains it, else None.
+
+        Returns:
+            pd.DataFrame | None: A sliced copy of the cached frame.
+        """
+        key = ticker.upper()
+        start_dt, end_dt = _parse(start), _parse(end)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry["stored_at"] > self._ttl:
+                self._drop(key)
+                entry = None
+
+            if entry is None or not (entry["start"] <= start_dt and end_dt <= entry["end"]):
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            frame = entry["frame"]
+
+        dates = frame["Date"]
+        lo = dates.searchsorted(pd.Timestamp(start_dt), side="left")
+        hi = dates.searchsorted(pd.Timestamp(end_dt), side="left")
+        return frame.iloc[lo:hi].reset_index(drop=True)
+
+    # ------------------------------------------------
+    # Storage
+    # ------------------------------------------------
+    def put(self, ticker: str, start: str, end: str, frame: pd.DataFrame) -> None:
+        """
+        Store the bars fetched for [start, end).
+
+        A live entry that overlaps the new range is merged into it so the cached
+        range keeps growing towards the widest window the user has asked for.
+        The merged entry keeps the older entry's timestamp, so bars are never
+        served past the TTL of their original fetch.
+        """
+        if frame is None or frame.empty or "Date" not in frame.columns:
+            return
+
+        key = ticker.upper()
+        start_dt, end_dt = _parse(start), _parse(end)
+        frame = frame.copy()
+        frame["Date"] = pd.to_datetime(frame["Date"])
+
+        with self._lock:
+            stored_at = self._clock()
+            old = self._entries.get(key)
+            if old is not None and self._clock() - old["stored_at"] <= self._ttl \
+                    and old["start"] <= end_dt and start_dt <= old["end"]:
+                frame = (
+                    pd.concat([old["frame"], frame])
+                    .drop_duplicates(subset="Date", keep="last")
+                )
+                start_dt, end_dt = min(start_dt, old["start"]), max(end_dt, old["end"])
+                stored_at = old["stored_at"]
+
+            frame = frame.sort_values("Date").reset_index(drop=True)
+            if old is not None:
+                self._drop(key)
+
+            size = int(frame.memory_usage(index=True).sum())
+            self._entries[key] = {
+                "start": start_dt, "end": end_dt, "frame": frame,
+                "stored_at": stored_at, "bytes": size,
+            }
+            self._bytes += size
+
+            while len(self._entries) > self._max_entries or \
+                    (self._bytes > self._max_bytes and len(self._entries) > 1):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        """Forget one ticker, or everything when no ticker is given."""
+        with self._lock:
+            if ticker is None:
+                self._entries.clear()
+                self._bytes = 0
+            elif ticker.upper() in self._entries:
+                self._drop(ticker.upper())
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry["bytes"]
+
+    # ------------------------------------------------
+    # Statistics
+    # ------------------------------------------------
+    def stats(self) -> dict:
+        """Return hit/miss counters and current usage."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return f"PriceMemoryCache(entries={len(self._entries)}, ttl={self._ttl}s)"
+
+    def __repr__(self):
+        return (
+            f"PriceMemoryCache(ttl_seconds={self._ttl!r}, max_entries={self._max_entries!r}, "
+            f"max_bytes={self._max_bytes!r})"
+        )
+
+
+def _parse(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d")
@@ -0,0 +1,288 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    path TEXT PRIMARY KEY,
+    start_date TEXT,
+    end_date TEXT,
+    created_at TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    format TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS report_tickers (
+    path TEXT NOT NULL REFERENCES reports(path) ON DELETE CASCADE,
+    ticker TEXT NOT NULL,
+    PRIMARY KEY (path, ticker)
+);
+CREATE TABLE IF NOT EXISTS report_indicators (
+    path TEXT NOT NULL REFERENCES reports(path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    PRIMARY KEY (path, name)
+);
+CREATE INDEX IF NOT EXISTS idx_report_tickers_ticker ON report_tickers(ticker);
+CREATE INDEX IF NOT EXISTS idx_report_indicators_name ON report_indicators(name);
+CREATE INDEX IF NOT EXISTS idx_reports_created ON reports(created_at);
+"""
+
+
+class ReportCatalog:
+    """
+    SQLite index over exported analysis reports.
+
+    Every export records the report's tickers, date range, creation time,
+    indicator names, file size and content hash, so questions such as "all
+    AAPL reports created last month" are answered from the index without
+    opening or parsing any report file.
+
+    Example:
+        >>> catalog = ReportCatalog("data/analysis_reports/catalog.sqlite3")
+        >>> entry = catalog.record("data/analysis_reports/a.json", payload)
+        >>> catalog.query(ticker="AAPL", created_after="2025-11-01")
+        [{'path': 'data/analysis_reports/a.json', 'tickers': ['AAPL'], ...}]
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Point the catalog at its database; the file is created on the first write.
+
+        Args:
+            db_path (str): SQLite file path.
+        """
+        self._db_path = db_path
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @property
+    def db_path(self):
+        return self._db_path
+
+    def exists(self) -> bool:
+        """Return True once the database file has been created."""
+        return os.path.exists(self._db_path)
+
+    @contextmanager
+    def _connect(self):
+        """Yield a connection that commits on success and is always closed (creating the schema once)."""
+        if not self._ready:
+            folder = os.path.dirname(self._db_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=10)
+            try:
+                conn.executescript(_SCHEMA)
+            finally:
+                conn.close()
+            self._ready = True
+        conn = sqlite3.connect(self._db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------
+    # Recording
+    # ------------------------------------------------
+    def record(self, path: str, payload: Optional[Dict[str, Any]] = None,
+               tickers: Optional[Iterable[str]] = None, start: Optional[str] = None,
+               end: Optional[str] = None, indicators: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Add or refresh the catalog entry for a report that was just written.
+
+        Metadata not given explicitly is taken from ``payload``: the ticker
+        from ``payload["ticker"]`` (or the "<TICKER> Price Chart" title), the
+        date range from the first and last label, and the indicator names
+        from ``payload["indicators"]`` (or the non-price dataset labels).
+
+        Args:
+            path (str): Report file; its size and content hash are read from disk.
+            payload (dict | None): The exported payload.
+            tickers (Iterable[str] | None): Tickers covered (batch reports).
+            start (str | None): First date covered (YYYY-MM-DD).
+            end (str | None): Last date covered (YYYY-MM-DD).
+            indicators (Iterable[str] | None): Indicator names in the report.
+
+        Returns:
+            dict: The stored entry.
+
+        Raises:
+            FileNotFoundError: If ``path`` does not exist.
+        """
+        payload = payload if isinstance(payload, dict) else {}
+        path = os.path.abspath(path)
+        tickers = sorted({t.upper() for t in (tickers or _payload_tickers(payload))})
+        labels = payload.get("labels") or []
+        start = _as_date(start) or (_as_date(labels[0]) if labels else None)
+        end = _as_date(end) or (_as_date(labels[-1]) if labels else None)
+        indicators = sorted(set(indicators if indicators is not None else _payload_indicators(payload)))
+
+        entry = {
+            "path": path,
+            "tickers": tickers,
+            "start_date": start,
+            "end_date": end,
+            "created_at": datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds"),
+            "size_bytes": os.path.getsize(path),
+            "content_hash": _file_hash(path),
+            "format": os.path.splitext(path)[1].lstrip(".").lower() or "unknown",
+            "indicators": indicators,
+        }
+
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM reports WHERE path = ?", (path,))
+            conn.execute(
+                "INSERT INTO reports (path, start_date, end_date, created_at, size_bytes, content_hash, format) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, start, end, entry["created_at"], entry["size_bytes"], entry["content_hash"], entry["format"]),
+            )
+            conn.executemany("INSERT INTO report_tickers (path, ticker) VALUES (?, ?)",
+                             [(path, t) for t in tickers])
+            conn.executemany("INSERT INTO report_indicators (path, name) VALUES (?, ?)",
+                             [(path, n) for n in indicators])
+        return entry
+
+    def remove(self, path: str) -> bool:
+        """Drop the entry for ``path``; returns True if one existed."""
+        if not self._ready and not self.exists():
+            return False
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute("DELETE FROM reports WHERE path = ?", (os.path.abspath(path),))
+            return cursor.rowcount > 0
+
+    def prune(self) -> int:
+        """Remove entries whose report file no longer exists; returns how many."""
+        missing = [e["path"] for e in self.query() if not os.path.exists(e["path"])]
+        for path in missing:
+            self.remove(path)
+        return len(missing)
+
+    # ------------------------------------------------
+    # Queries
+    # ------------------------------------------------
+    def query(self, ticker: Optional[str] = None, start: Optional[str] = None, end: Optional[str] = None,
+              indicator: Optional[str] = None, created_after: Optional[str] = None,
+              created_before: Optional[str] = None, content_hash: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        List catalogued reports, newest first, without reading any report file.
+
+        Args:
+            ticker (str | None): Only reports covering this ticker.
+            start (str | None): Only reports whose date range ends on/after this date.
+            end (str | None): Only reports whose date range starts on/before this date.
+            indicator (str | None): Only reports containing this indicator (e.g. "RSI_14").
+            created_after (str | None): ISO date/time lower bound on creation (inclusive).
+            created_before (str | None): ISO date/time upper bound on creation (exclusive).
+            content_hash (str | None): Only reports with this exact content.
+            limit (int | None): Maximum number of rows.
+
+        Returns:
+            list[dict]: Entries with path, tickers, start_date, end_date, created_at,
+            size_bytes, content_hash, format and indicators.
+        """
+        clauses, params = [], []
+        if ticker:
+            clauses.append("path IN (SELECT path FROM report_tickers WHERE ticker = ?)")
+            params.append(ticker.upper())
+        if indicator:
+            clauses.append("path IN (SELECT path FROM report_indicators WHERE name = ?)")
+            params.append(indicator)
+        if start:
+            clauses.append("end_date >= ?")
+            params.append(start)
+        if end:
+            clauses.append("start_date <= ?")
+            params.append(end)
+        if created_after:
+            clauses.append("created_at >= ?")
+            params.append(created_after)
+        if created_before:
+            clauses.append("created_at < ?")
+            params.append(created_before)
+        if content_hash:
+            clauses.append("content_hash = ?")
+            params.append(content_hash)
+
+        return self._select(clauses, params, limit)
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for one report path, or None."""
+        rows = self._select(["path = ?"], [os.path.abspath(path)])
+        return rows[0] if rows else None
+
+    def _select(self, clauses, params, limit=None) -> List[Dict[str, Any]]:
+        sql = "SELECT * FROM reports"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC, path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = list(params) + [int(limit)]
+
+        if not self._ready and not self.exists():
+            return []  # nothing exported yet; don't create the file just to read it
+        with self._connect() as conn:
+            rows = [dict(r) for r in conn.execute(sql, params)]
+            for row in rows:
+                row["tickers"] = [r[0] for r in conn.execute(
+                    "SELECT ticker FROM report_tickers WHERE path = ? ORDER BY ticker", (row["path"],))]
+                row["indicators"] = [r[0] for r in conn.execute(
+                    "SELECT name FROM report_indicators WHERE path = ? ORDER BY name", (row["path"],))]
+        return rows
+
+    def __len__(self):
+        if not self._ready and not self.exists():
+            return 0
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def __str__(self):
+        return f"ReportCatalog(reports={len(self)})"
+
+    def __repr__(self):
+        return f"ReportCatalog(db_path={self._db_path!r})"
+
+
+def _payload_tickers(payload: Dict[str, Any]) -> List[str]:
+    if payload.get("ticker"):
+        return [str(payload["ticker"])]
+    if isinstance(payload.get("tickers"), list):
+        return [str(t) for t in payload["tickers"]]
+    title = str(payload.get("title") or "")
+    if title.endswith(" Price Chart") and title != "Price Chart":
+        return [title[:-len(" Price Chart")]]
+    return []
+
+
+def _payload_indicators(payload: Dict[str, Any]) -> List[str]:
+    if isinstance(payload.get("indicators"), dict):
+        return [str(name) for name in payload["indicators"]]
+    return [
+        str(d.get("label")) for d in payload.get("datasets") or []
+        if isinstance(d, dict) and d.get("label") not in (None, "Price")
+    ]
+
+
+def _as_date(value) -> Optional[str]:
+    text = str(value) if value is not None else ""
+    return text[:10] if _DATE.match(text) else None
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
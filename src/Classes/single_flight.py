@@ -0,0 +1,76 @@
+import threading
+from typing import Any, Callable, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share the same key into one execution.
+
+    The first caller for a key runs the function; callers that arrive while it
+    is still running wait for it and receive the same result (or exception).
+    Once the call finishes the key is forgotten, so later calls run again.
+
+    Example:
+        >>> flight = SingleFlight()
+        >>> flight.do(("AAPL", "2024-01-01", "2024-02-01"), lambda: 42)
+        (42, False)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._executed = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run ``fn(*args, **kwargs)`` unless an identical call is already in flight.
+
+        Returns:
+            tuple: (result, shared) where ``shared`` is True when the result came
+            from another caller's execution.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> dict:
+        """Return how many calls ran and how many were served from another caller."""
+        with self._lock:
+            return {"executed": self._executed, "shared": self._shared, "in_flight": len(self._calls)}
+
+    def __str__(self):
+        return f"SingleFlight(in_flight={len(self._calls)})"
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
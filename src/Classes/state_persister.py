@@ -0,0 +1,168 @@
+import hashlib
+import threading
+import time
+from typing import Callable, Optional
+
+from src.Functions.reporting.binary_report import dumps_binary_report
+
+
+class StatePersister:
+    """
+    Saves GUI state in the background, coalescing bursts of save requests.
+
+    ``request_save`` only records the newest snapshot and returns
+    immediately, so the Tk thread never serializes or touches the disk. A
+    worker thread waits until no new request has arrived for
+    ``debounce_seconds`` (but never longer than ``max_wait_seconds`` after
+    the first unsaved request), fingerprints the snapshot and calls ``save``
+    only if it differs from the last one written; repeated saves of an
+    unchanged state cost no I/O. ``save`` is expected to write atomically
+    (e.g. ``SystemController.save_state``), so a crash mid-write never leaves
+    a truncated state file. A ``save`` that raises or returns False counts as
+    failed, and the same state is written again on the next request.
+
+    Example:
+        >>> persister = StatePersister(lambda s: sc.save_state(s, "data/app_state.stkb"))
+        >>> persister.request_save({"last_payload": payload})   # returns at once
+        >>> persister.close()                                   # flush on exit
+    """
+
+    def __init__(self, save: Callable[[dict], Optional[bool]], debounce_seconds: float = 0.5,
+                 max_wait_seconds: float = 5.0):
+        """
+        Args:
+            save (Callable[[dict], bool | None]): Writes one snapshot; called on the worker
+                thread. Returning False (or raising) marks the write as failed.
+            debounce_seconds (float): Quiet period before a pending snapshot is written.
+            max_wait_seconds (float): Longest a snapshot waits while requests keep arriving.
+
+        Raises:
+            ValueError: If debounce_seconds or max_wait_seconds is negative.
+        """
+        if debounce_seconds < 0 or max_wait_seconds < 0:
+            raise ValueError("debounce_seconds and max_wait_seconds must be >= 0.")
+        self._save = save
+        self._debounce = debounce_seconds
+        self._max_wait = max_wait_seconds
+        self._first_request = 0.0
+        self._cond = threading.Condition()
+        self._pending: Optional[dict] = None
+        self._deadline = 0.0
+        self._flush_requested = False
+        self._closed = False
+        self._writing = False
+        self._last_fingerprint: Optional[str] = None
+        self._requested = 0
+        self._written = 0
+        self._skipped = 0
+        self._failed = 0
+        self._worker = threading.Thread(target=self._run, name="StatePersister", daemon=True)
+        self._worker.start()
+
+    # ------------------------------------------------
+    # Public API
+    # ------------------------------------------------
+    def request_save(self, state: dict) -> None:
+        """
+        Schedule ``state`` to be saved; a newer request before the write replaces it.
+
+        Raises:
+            RuntimeError: If the persister has been closed.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("StatePersister is closed.")
+            now = time.monotonic()
+            if self._pending is None:
+                self._first_request = now
+            self._pending = dict(state)
+            self._deadline = min(now + self._debounce, self._first_request + self._max_wait)
+            self._requested += 1
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write any pending snapshot now and wait for it.
+
+        Returns:
+            bool: True if nothing is left pending when the call returns.
+        """
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(lambda: self._pending is None and not self._writing, timeout)
+            self._flush_requested = False
+            return done
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush pending state and stop the worker (call from the window's exit handler)."""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join(timeout)
+
+    def stats(self) -> dict:
+        """Return how many saves were requested, written, skipped as unchanged and failed."""
+        with self._cond:
+            return {"requested": self._requested, "written": self._written,
+                    "skipped": self._skipped, "failed": self._failed}
+
+    # ------------------------------------------------
+    # Worker
+    # ------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending is not None:
+                        remaining = self._deadline - time.monotonic()
+                        if self._flush_requested or self._closed or remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    elif self._closed:
+                        return
+                    else:
+                        self._cond.wait()
+                state, self._pending = self._pending, None
+                self._writing = True
+
+            try:
+                self._write(state)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, state: dict) -> None:
+        try:
+            fingerprint = hashlib.blake2b(
+                dumps_binary_report(state, compression="none"), digest_size=16
+            ).hexdigest()
+        except (TypeError, ValueError):
+            fingerprint = None  # not fingerprintable; always write
+
+        if fingerprint is not None and fingerprint == self._last_fingerprint:
+            with self._cond:
+                self._skipped += 1
+            return
+
+        try:
+            saved = self._save(state) is not False
+        except Exception as e:
+            print(f"[WARNING] Background state save failed: {e}")
+            saved = False
+        if not saved:
+            # Keep the old fingerprint so the next request retries this state.
+            with self._cond:
+                self._failed += 1
+            return
+        self._last_fingerprint = fingerprint
+        with self._cond:
+            self._written += 1
+
+    def __str__(self):
+        return f"StatePersister(written={self._written}, skipped={self._skipped})"
+
+    def __repr__(self):
+        return f"StatePersister(debounce_seconds={self._debounce!r}, max_wait_seconds={self._max_wait!r})"
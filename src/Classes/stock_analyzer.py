@@ -1,16 +1,56 @@
+import numpy as np
 import pandas as pd
-import math
+
+from src.Functions.analysis.indicator_kernels import (
+    rsi_sweep_kernel,
+    sma_sweep_kernel,
+    to_optional_list,
+)
+from src.Functions.analysis.indicator_registry import IndicatorContext, compute_indicators
+from src.classes.streaming_indicators import (
+    IndicatorStream,
+    StreamingEMA,
+    StreamingRollingStats,
+    StreamingRSI,
+    StreamingSMA,
+)
+
+OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
 
 class StockAnalyzer:
-    """Performs analytical operations on stock data such as SMA, RSI, and anomaly detection."""
+    """
+    Performs analytical operations on stock data such as SMA, RSI, and anomaly detection.
+
+    Derived series (close array, returns, gains/losses, RSI prefix sums, ...)
+    live in a lazy IndicatorContext that is built on first use and shared by
+    every calculate_* call until append_data() invalidates it.
+
+    With ``copy=False`` the analyzer keeps a reference to the caller's
+    DataFrame and never writes to it: indicators are kept as read-only
+    float64 arrays instead of list columns, and ``to_frame()`` builds a
+    DataFrame with the indicator columns only when asked.
+
+    An optional IndicatorCache makes repeat analyses of identical bars reuse
+    earlier results instead of recomputing them.
 
-    def __init__(self, ticker: str, data: pd.DataFrame):
+    Example:
+        >>> analyzer = StockAnalyzer("AAPL", df, copy=False)
+        >>> sma = analyzer.calculate_sma(20)   # np.ndarray, df is untouched
+        >>> frame = analyzer.to_frame()        # df columns + SMA_20
+    """
+
+    def __init__(self, ticker: str, data: pd.DataFrame, copy: bool = True, cache=None):
         if data.empty or "Close" not in data.columns:
             raise ValueError("Data must be a non-empty DataFrame containing a 'Close' column.")
 
         self._ticker = ticker.upper()
-        self._data = data.copy()
+        self._copy = copy
+        self._data = data.copy() if copy else data
         self._indicators = {}
+        self._context = None
+        self._specs = {}
+        self._cache = cache
 
     @property
     def ticker(self):
@@ -18,145 +58,186 @@ class StockAnalyzer:
 
     @property
     def data(self):
+        """Return the analyzed DataFrame (the caller's own frame when copy=False)."""
         return self._data
 
+    @property
+    def zero_copy(self):
+        return not self._copy
+
     @property
     def indicators(self):
         return self._indicators
 
+    @property
+    def context(self):
+        """Return the memoized IndicatorContext for the current data."""
+        if self._context is None:
+            self._context = IndicatorContext({
+                name: self._data[name] for name in OHLCV_COLUMNS if name in self._data.columns
+            })
+        return self._context
+
     # ============================================================
     # SAFE PRICE EXTRACTOR
     # ============================================================
     def _get_close_prices(self):
         """
-        Safely return closing prices as a float list.
-        Handles cases where: 
+        Safely return closing prices as a float64 NumPy array.
+        Handles cases where:
         - Yahoo returns duplicate columns
         - Close is a DataFrame instead of Series
         - Values are dtype=object instead of float
+        Values that cannot be converted become NaN.
         """
-        prices = self._data["Close"]
-
-        # Fix: Close returned as DataFrame with 1 column
-        if isinstance(prices, pd.DataFrame):
-            prices = prices.iloc[:, 0]
-
-        # Convert to Python list
-        prices = prices.tolist()
-
-        # Convert to float and filter out None/NaN
-        clean_prices = []
-        for p in prices:
-            try:
-                clean_prices.append(float(p))
-            except Exception:
-                clean_prices.append(None)
-
-        return clean_prices
+        return self.context.column("Close")
 
     # ============================================================
-    # SMA
+    # PUBLIC METHODS
     # ============================================================
-    def _simple_moving_average(self, values, window=20):
-        if not isinstance(values, list):
-            raise TypeError("values must be a list")
+    def calculate_sma(self, window=20):
         if window < 1:
             raise ValueError("window must be >= 1")
+        return self._compute_one(f"SMA_{window}")
 
-        n = len(values)
-        out = [None] * n
-        running_sum = 0.0
-
-        for i, v in enumerate(values):
-            if v is None:
-                continue  # Skip invalid entries
-            
-            running_sum += float(v)
-            if i >= window:
-                if values[i - window] is not None:
-                    running_sum -= float(values[i - window])
-
-            if i >= window - 1:
-                out[i] = running_sum / window
-
-        return out
+    def calculate_rsi(self, window=14):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        return self._compute_one(f"RSI_{window}")
 
-    # ============================================================
-    # RSI
-    # ============================================================
-    def _calculate_rsi(self, prices, window=14):
-        gains, losses = [0.0], [0.0]
-        rsi = []
+    def detect_anomalies(self, threshold=0.05):
+        ctx = self.context
+        if self._cache is None:
+            mask = ctx.anomaly_mask(threshold)
+        else:
+            mask = self._cache.get_or_compute(
+                ctx.fingerprint(), "ANOMALY", (threshold,),
+                lambda: {"ANOMALY": ctx.anomaly_mask(threshold)},
+            )["ANOMALY"]
+        return np.flatnonzero(mask).tolist()
+
+    def calculate_indicators(self, specs):
+        """
+        Compute several registered indicators in one pass over the OHLCV columns.
 
-        # Compute gains and losses
-        for i in range(1, len(prices)):
-            if prices[i] is None or prices[i - 1] is None:
-                gains.append(0.0)
-                losses.append(0.0)
-                continue
+        Specs use the registry naming ("EMA_12", "MACD_12_26_9", "BBANDS_20_2",
+        "ATR_14", "VWAP", "OBV", "SMA_20", "RSI_14"); intermediates such as
+        EMAs and the true range are shared between them. Every output series
+        is stored in ``indicators`` so prepare_chart_payload can overlay it.
 
-            change = prices[i] - prices[i - 1]
-            gains.append(max(change, 0))
-            losses.append(max(-change, 0))
+        Args:
+            specs (list[str]): Indicator specs to compute.
 
-        for i in range(len(prices)):
-            if i + 1 < window:
-                rsi.append(None)
-                continue
+        Returns:
+            dict[str, list]: Output series with None where undefined
+            (float64 arrays with NaN when copy=False).
 
-            avg_gain = sum(gains[i + 1 - window:i + 1]) / window
-            avg_loss = sum(losses[i + 1 - window:i + 1]) / window
+        Raises:
+            ValueError: If a spec is unknown or a required column is missing.
+        """
+        specs = list(specs)
+        outputs = compute_indicators(self.context, specs, cache=self._cache)
+        for spec in specs:
+            self._specs[spec] = None
+        return {name: self._store(name, values, remember=False) for name, values in outputs.items()}
 
-            if avg_loss == 0:
-                rsi.append(100.0)
-                continue
+    def append_data(self, rows: pd.DataFrame):
+        """
+        Append new bars, invalidate every derived series and refresh computed indicators.
 
-            rs = avg_gain / avg_loss
-            rsi_val = 100 - (100 / (1 + rs))
-            rsi.append(rsi_val)
+        Indicators requested earlier (calculate_sma/rsi/indicators) are
+        recomputed over the extended data so ``indicators`` stays aligned.
 
-        return rsi
+        Raises:
+            ValueError: If ``rows`` has no 'Close' column.
+        """
+        if rows is None or rows.empty:
+            return
+        if "Close" not in rows.columns:
+            raise ValueError("Appended rows must contain a 'Close' column.")
 
-    # ============================================================
-    # Anomalies
-    # ============================================================
-    def _detect_price_anomalies(self, prices, threshold=0.05):
-        anomalies = []
+        ignore_index = isinstance(self._data.index, pd.RangeIndex)
+        self._data = pd.concat([self._data, rows], ignore_index=ignore_index)
+        self._context = None
 
-        for i in range(1, len(prices)):
-            if prices[i] is None or prices[i - 1] is None:
-                continue
+        if self._specs:
+            for name, values in compute_indicators(self.context, list(self._specs), cache=self._cache).items():
+                self._store(name, values, remember=False)
 
-            if prices[i - 1] == 0:
-                continue
+    def to_frame(self):
+        """
+        Return the data with every computed indicator as a column.
 
-            change_pct = abs(prices[i] - prices[i - 1]) / prices[i - 1]
+        In zero-copy mode this is the only point where a new DataFrame is
+        built; the indicator arrays are joined in one concat.
+        """
+        if self._copy:
+            return self._data.copy()
+        if not self._indicators:
+            return self._data.copy()
+        extra = pd.DataFrame(self._indicators, index=self._data.index)
+        base = self._data.drop(columns=[c for c in extra.columns if c in self._data.columns])
+        return pd.concat([base, extra], axis=1)
+
+    def _compute_one(self, spec):
+        (values,) = compute_indicators(self.context, [spec], cache=self._cache).values()
+        return self._store(spec, values)
+
+    def _store(self, name, values, remember=True):
+        """
+        Save an indicator: a list plus a data column by default, or the
+        read-only float64 array itself in zero-copy mode.
+        """
+        if remember:
+            self._specs[name] = None
+        if not self._copy:
+            self._indicators[name] = values
+            return values
+        self._indicators[name] = to_optional_list(values)
+        self._data[name] = values
+        return self._indicators[name]
+
+    def sweep_sma(self, windows=range(5, 201)):
+        """
+        Compute the SMA for many windows from a single prefix-sum pass.
 
-            if change_pct > threshold:
-                anomalies.append(i)
+        Returns:
+            np.ndarray: Matrix shaped (len(windows), len(data)); row ``i`` holds
+            the SMA for ``windows[i]`` with NaN where it is undefined.
+        """
+        return sma_sweep_kernel(self._get_close_prices(), windows)
 
-        return anomalies
+    def sweep_rsi(self, windows=(7, 14, 21, 28)):
+        """
+        Compute the RSI for many lookbacks, building gains/losses only once.
 
-    # ============================================================
-    # PUBLIC METHODS
-    # ============================================================
-    def calculate_sma(self, window=20):
-        prices = self._get_close_prices()
-        sma_values = self._simple_moving_average(prices, window)
-        self._indicators[f"SMA_{window}"] = sma_values
-        self._data[f"SMA_{window}"] = sma_values
-        return sma_values
+        Returns:
+            np.ndarray: Matrix shaped (len(windows), len(data)).
+        """
+        return rsi_sweep_kernel(self._get_close_prices(), windows)
 
-    def calculate_rsi(self, window=14):
-        prices = self._get_close_prices()
-        rsi_values = self._calculate_rsi(prices, window)
-        self._indicators[f"RSI_{window}"] = rsi_values
-        self._data[f"RSI_{window}"] = rsi_values
-        return rsi_values
+    def to_stream(self, sma_windows=(20,), rsi_windows=(14,), ema_spans=(), stats_windows=()):
+        """
+        Build an IndicatorStream primed with this analyzer's close history.
 
-    def detect_anomalies(self, threshold=0.05):
-        prices = self._get_close_prices()
-        return self._detect_price_anomalies(prices, threshold)
+        The history is consumed once; after that each new close is a constant
+        time ``stream.update(close)`` instead of a full recalculation. For a
+        series without missing closes the SMA and RSI values equal
+        calculate_sma and calculate_rsi.
+        """
+        indicators = {}
+        for w in sma_windows:
+            indicators[f"SMA_{w}"] = StreamingSMA(w)
+        for w in rsi_windows:
+            indicators[f"RSI_{w}"] = StreamingRSI(w)
+        for span in ema_spans:
+            indicators[f"EMA_{span}"] = StreamingEMA(span)
+        for w in stats_windows:
+            indicators[f"STATS_{w}"] = StreamingRollingStats(w)
+
+        stream = IndicatorStream(indicators)
+        stream.update_many(self._get_close_prices().tolist())
+        return stream
 
     def __str__(self):
         return f"StockAnalyzer({self._ticker}) with {len(self._data)} records"
@@ -0,0 +1,242 @@
+import os
+import threading
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class StockCache:
+    """
+    Disk-backed, per-ticker columnar store for daily OHLCV bars.
+
+    Each ticker is saved as one NumPy ``.npz`` file holding a ``Date`` column
+    (datetime64[D]), one float64 column per price field and the date range the
+    file is known to cover. The covered range is what lets the cache tell an
+    empty weekend apart from a range that was never downloaded.
+
+    Example:
+        >>> cache = StockCache("data/stock_cache")
+        >>> cache.missing_ranges("AAPL", "2024-01-01", "2024-05-01")
+        [('2024-01-01', '2024-05-01')]
+    """
+
+    COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+    def __init__(self, cache_dir: str = "data/stock_cache"):
+        """
+        Initialize the cache and create its directory if needed.
+
+        Args:
+            cache_dir (str): Folder that holds one ``<TICKER>.npz`` file per symbol.
+        """
+        self._cache_dir = cache_dir
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    @property
+    def cache_dir(self):
+        """Return the folder used for cached files."""
+        return self._cache_dir
+
+    # ------------------------------------------------
+    # Reading
+    # ------------------------------------------------
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self._cache_dir, f"{ticker.upper()}.npz")
+
+    def _load(self, ticker: str) -> Optional[dict]:
+        """Return the raw arrays stored for a ticker, or None if nothing is cached."""
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                return {key: stored[key] for key in stored.files}
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Ignoring unreadable cache file {path}: {e}")
+            return None
+
+    def covered_range(self, ticker: str) -> Optional[Tuple[np.datetime64, np.datetime64]]:
+        """Return the half-open [start, end) date range stored for a ticker."""
+        stored = self._load(ticker)
+        if stored is None:
+            return None
+        return stored["covered"][0], stored["covered"][1]
+
+    def last_date(self, ticker: str) -> Optional[str]:
+        """Return the date of the newest stored bar as 'YYYY-MM-DD', or None."""
+        stored = self._load(ticker)
+        if stored is None or len(stored["Date"]) == 0:
+            return None
+        return str(stored["Date"][-1])
+
+    def read(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """
+        Return cached bars with ``start <= Date < end`` (the same convention as yfinance).
+
+        Returns:
+            pd.DataFrame: ['Date', 'Open', 'High', 'Low', 'Close', 'Volume'];
+            empty if nothing is cached for the ticker.
+        """
+        stored = self._load(ticker)
+        if stored is None:
+            return pd.DataFrame()
+
+        dates = stored["Date"]
+        lo = np.searchsorted(dates, _to_day(start), side="left")
+        hi = np.searchsorted(dates, _to_day(end), side="left")
+        return _to_frame(stored, slice(lo, hi))
+
+    def missing_ranges(self, ticker: str, start: str, end: str) -> List[Tuple[str, str]]:
+        """
+        Return the date gaps of [start, end) that the store does not cover yet.
+
+        Gaps that contain no business day (weekends) are dropped, and the end of
+        the request is clamped to today because today's bar is not final.
+
+        Returns:
+            list[tuple[str, str]]: Half-open ('YYYY-MM-DD', 'YYYY-MM-DD') ranges to download.
+        """
+        start_d = _to_day(start)
+        end_d = min(_to_day(end), _today() + 1)
+        if end_d <= start_d:
+            return []
+
+        covered = self.covered_range(ticker)
+        if covered is None:
+            gaps = [(start_d, end_d)]
+        else:
+            cov_start, cov_end = covered
+            gaps = []
+            # Gaps are measured against the covered hull so the store always
+            # stays one contiguous block; a disjoint request also fetches the bridge.
+            if start_d < cov_start:
+                gaps.append((start_d, cov_start))
+            if end_d > cov_end:
+                gaps.append((cov_end, end_d))
+
+        return [
+            (str(g_start), str(g_end))
+            for g_start, g_end in gaps
+            if g_end > g_start and np.busday_count(g_start, g_end) > 0
+        ]
+
+    # ------------------------------------------------
+    # Writing
+    # ------------------------------------------------
+    def merge(self, ticker: str, frame: pd.DataFrame, start: str, end: str) -> None:
+        """
+        Merge freshly downloaded bars for [start, end) into the ticker's file.
+
+        Rows already stored for the same day are replaced by the new ones. The
+        covered range only grows when the download returned data, so a failed
+        request is retried next time instead of being remembered as empty.
+        """
+        start_d = _to_day(start)
+        end_d = min(_to_day(end), _today())
+
+        new = _from_frame(frame)
+        if len(new["Date"]) == 0:
+            return
+
+        stored = self._load(ticker)
+        if stored is None:
+            merged = new
+            covered = (start_d, max(end_d, start_d))
+        else:
+            merged = _merge_arrays(stored, new)
+            cov_start, cov_end = stored["covered"]
+            covered = (min(cov_start, start_d), max(cov_end, end_d))
+
+        merged["covered"] = np.array(covered, dtype="datetime64[D]")
+        self._write(ticker, merged)
+
+    def _write(self, ticker: str, arrays: dict) -> None:
+        """Write atomically so a crash never leaves a truncated file behind."""
+        path = self._path(ticker)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Failed to write cache file {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self, ticker: Optional[str] = None) -> None:
+        """Remove the cached file for one ticker, or for every ticker."""
+        if ticker is not None:
+            paths = [self._path(ticker)]
+        else:
+            paths = [
+                os.path.join(self._cache_dir, name)
+                for name in os.listdir(self._cache_dir)
+                if name.endswith(".npz")
+            ]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __str__(self):
+        return f"StockCache(dir='{self._cache_dir}')"
+
+    def __repr__(self):
+        return f"StockCache(cache_dir={self._cache_dir!r})"
+
+
+# ------------------------------------------------
+# Array helpers
+# ------------------------------------------------
+def _today() -> np.datetime64:
+    return np.datetime64(date.today(), "D")
+
+
+def _to_day(value) -> np.datetime64:
+    if isinstance(value, str):
+        return np.datetime64(datetime.strptime(value, "%Y-%m-%d").date(), "D")
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+def _from_frame(frame: pd.DataFrame) -> dict:
+    """Convert a Date + OHLCV DataFrame into sorted, de-duplicated column arrays."""
+    if frame is None or frame.empty:
+        arrays = {"Date": np.array([], dtype="datetime64[D]")}
+        arrays.update({col: np.array([], dtype=np.float64) for col in StockCache.COLUMNS})
+        return arrays
+
+    dates = pd.DatetimeIndex(pd.to_datetime(frame["Date"]))
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+
+    arrays = {"Date": dates.values.astype("datetime64[D]")}
+    for col in StockCache.COLUMNS:
+        if col in frame.columns:
+            arrays[col] = pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64)
+        else:
+            arrays[col] = np.full(len(frame), np.nan)
+
+    return _merge_arrays(None, arrays)
+
+
+def _merge_arrays(old: Optional[dict], new: dict) -> dict:
+    """Concatenate two column sets; on duplicate days the row from ``new`` wins."""
+    keys = ("Date",) + StockCache.COLUMNS
+    if old is None:
+        combined = {k: new[k] for k in keys}
+    else:
+        combined = {k: np.concatenate([old[k], new[k]]) for k in keys}
+
+    # Reverse so that np.unique's "first occurrence" is the newest row.
+    reversed_dates = combined["Date"][::-1]
+    _, first = np.unique(reversed_dates, return_index=True)
+    keep = len(reversed_dates) - 1 - first
+    return {k: combined[k][keep] for k in keys}
+
+
+def _to_frame(arrays: dict, rows: slice) -> pd.DataFrame:
+    frame = pd.DataFrame({"Date": pd.to_datetime(arrays["Date"][rows])})
+    for col in StockCache.COLUMNS:
+        frame[col] = arrays[col][rows]
+    return frame
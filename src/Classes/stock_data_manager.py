@@ -1,7 +1,12 @@
 import pandas as pd
-import yfinance as yf
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import re
+from typing import Dict, List
+
+from src.classes.stock_cache import StockCache
+from src.classes.price_memory_cache import PriceMemoryCache
+from src.classes.single_flight import SingleFlight
+from src.providers_base_classes_subclasses import BasePriceProvider, PRICE_PROVIDERS
 
 
 class StockDataManager:
@@ -14,20 +19,36 @@ class StockDataManager:
         >>> print(df.head())
     """
 
-    def __init__(self, api: str = "yahoo"):
+    def __init__(self, api: str = "yahoo", cache_dir: str = None,
+                 memory_cache: PriceMemoryCache = None, provider: BasePriceProvider = None,
+                 provider_options: dict = None):
         """
         Initialize StockDataManager with an API source.
 
         Args:
-            api (str): The API to use for data retrieval (currently only 'yahoo' supported).
+            api (str): The price source: 'yahoo' (live), 'replay' (recorded files
+                on disk) or 'synthetic' (deterministic GBM series).
+            cache_dir (str | None): Optional folder for the on-disk OHLCV cache.
+                When given, fetched bars are stored there and only missing
+                date ranges are downloaded on later calls.
+            memory_cache (PriceMemoryCache | None): Optional in-process cache checked
+                before the disk cache and the network.
+            provider (BasePriceProvider | None): A ready-made provider instance;
+                overrides the one selected by ``api``.
+            provider_options (dict | None): Keyword arguments for the provider
+                selected by ``api`` (e.g. ``{"data_dir": "data/replay"}``).
 
         Raises:
             ValueError: If the API is not supported.
         """
-        if api.lower() not in ["yahoo"]:
-            raise ValueError("Currently only 'yahoo' API is supported.")
+        if api.lower() not in PRICE_PROVIDERS:
+            raise ValueError(f"Unsupported API '{api}'. Choose one of: {', '.join(PRICE_PROVIDERS)}.")
         self._api = api.lower()
         self._last_ticker = None
+        self._provider = provider or PRICE_PROVIDERS[self._api](**(provider_options or {}))
+        self._cache = StockCache(cache_dir) if cache_dir else None
+        self._memory_cache = memory_cache
+        self._flight = SingleFlight()
 
     # ------------------------------------------------
     # Encapsulated Properties
@@ -37,11 +58,31 @@ class StockDataManager:
         """Return the active API source."""
         return self._api
 
+    @property
+    def single_flight(self):
+        """Return the SingleFlight that coalesces identical concurrent fetches."""
+        return self._flight
+
+    @property
+    def provider(self):
+        """Return the price provider that serves downloads."""
+        return self._provider
+
     @property
     def last_ticker(self):
         """Return the most recently validated ticker."""
         return self._last_ticker
 
+    @property
+    def cache(self):
+        """Return the on-disk StockCache, or None when caching is disabled."""
+        return self._cache
+
+    @property
+    def memory_cache(self):
+        """Return the in-process PriceMemoryCache, or None when it is disabled."""
+        return self._memory_cache
+
     # ------------------------------------------------
     # Ticker validation
     # ------------------------------------------------
@@ -65,7 +106,11 @@ class StockDataManager:
     # ------------------------------------------------
     def fetch_stock_data(self, ticker: str, start: str, end: str) -> pd.DataFrame:
         """
-        Fetch OHLCV data for a given ticker using yfinance.
+        Fetch OHLCV data for a given ticker from the configured price provider.
+
+        When a cache folder was configured, cached bars are returned directly and
+        only the date gaps the cache does not cover yet are downloaded. Identical
+        requests made at the same time from several threads trigger one fetch.
 
         Args:
             ticker (str): Stock symbol.
@@ -83,19 +128,160 @@ class StockDataManager:
         if not self.validate_ticker(ticker):
             raise ValueError(f"Invalid ticker: {ticker}")
 
-        start_dt = datetime.strptime(start, "%Y-%m-%d")
-        end_dt = datetime.strptime(end, "%Y-%m-%d")
-
-        data = yf.download(ticker, start=start_dt, end=end_dt, progress=False)
+        if self._memory_cache is not None:
+            cached = self._memory_cache.get(ticker, start, end)
+            if cached is not None:
+                return cached
+
+        # Concurrent callers asking for the same range share a single fetch;
+        # followers get their own copy so nobody mutates a shared frame.
+        data, shared = self._flight.do(
+            (ticker, start, end), self._fetch_uncached, ticker, start, end
+        )
+        return data.copy() if shared else data
+
+    def _fetch_uncached(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """Serve a request from the disk cache and the provider, then fill the memory cache."""
+        if self._cache is None:
+            data = self._download(ticker, start, end)
+        else:
+            # Only the gaps the cache does not cover yet go to the network.
+            for gap_start, gap_end in self._cache.missing_ranges(ticker, start, end):
+                fresh = self._download(ticker, gap_start, gap_end)
+                self._cache.merge(ticker, fresh, gap_start, gap_end)
+            data = self._cache.read(ticker, start, end)
 
         if data.empty:
             print(f"No data found for {ticker}.")
             return pd.DataFrame()
 
-        data.reset_index(inplace=True)
-        data = data[["Date", "Open", "High", "Low", "Close", "Volume"]]
+        if self._memory_cache is not None:
+            self._memory_cache.put(ticker, start, end, data)
         return data
 
+    def fetch_many(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for several tickers with one grouped yfinance request.
+
+        Tickers that share the same missing date range are downloaded together,
+        so a fully uncached portfolio costs a single round trip instead of one
+        per symbol.
+
+        Args:
+            tickers (list[str]): Stock symbols.
+            start (str): Start date in 'YYYY-MM-DD'.
+            end (str): End date in 'YYYY-MM-DD'.
+
+        Returns:
+            dict[str, pd.DataFrame]: One frame per requested ticker (empty when no data).
+
+        Raises:
+            ValueError: If any ticker is invalid.
+
+        Example:
+            >>> manager = StockDataManager()
+            >>> frames = manager.fetch_many(["AAPL", "MSFT"], "2024-01-01", "2024-05-01")
+            >>> print(frames["MSFT"].tail(1))
+        """
+        tickers = list(dict.fromkeys(tickers))
+        invalid = [t for t in tickers if not self.validate_ticker(t)]
+        if invalid:
+            raise ValueError(f"Invalid ticker(s): {', '.join(invalid)}")
+
+        frames = {}
+        if self._memory_cache is not None:
+            for ticker in tickers:
+                cached = self._memory_cache.get(ticker, start, end)
+                if cached is not None:
+                    frames[ticker] = cached
+        remaining = [t for t in tickers if t not in frames]
+
+        if self._cache is None:
+            frames.update(self._download_many(remaining, start, end))
+        else:
+            # Group tickers by identical gap so each distinct gap is one request.
+            pending: Dict[tuple, List[str]] = {}
+            for ticker in remaining:
+                for gap in self._cache.missing_ranges(ticker, start, end):
+                    pending.setdefault(gap, []).append(ticker)
+
+            for (gap_start, gap_end), group in pending.items():
+                fresh = self._download_many(group, gap_start, gap_end)
+                for ticker in group:
+                    self._cache.merge(ticker, fresh[ticker], gap_start, gap_end)
+
+            frames.update({t: self._cache.read(t, start, end) for t in remaining})
+
+        for ticker in remaining:
+            if frames[ticker].empty:
+                print(f"No data found for {ticker}.")
+                frames[ticker] = pd.DataFrame()
+            elif self._memory_cache is not None:
+                self._memory_cache.put(ticker, start, end, frames[ticker])
+        return {t: frames[t] for t in tickers}
+
+    def refresh(self, tickers: List[str], start: str = None) -> Dict[str, pd.DataFrame]:
+        """
+        Incrementally bring the cached history of each ticker up to today.
+
+        Only bars from the last stored date onward are downloaded. The last
+        stored day is fetched again because it may have been saved intraday,
+        and the new row replaces the old one when the two are merged.
+
+        Args:
+            tickers (list[str]): Stock symbols to refresh.
+            start (str | None): Start date used for tickers with no stored history yet.
+
+        Returns:
+            dict[str, pd.DataFrame]: The bars downloaded for each ticker (the delta only).
+
+        Raises:
+            RuntimeError: If the manager was created without a cache_dir.
+            ValueError: If a ticker is invalid, or has no history and no start was given.
+
+        Example:
+            >>> manager = StockDataManager(cache_dir="data/stock_cache")
+            >>> delta = manager.refresh(["AAPL", "MSFT"])
+            >>> print(len(delta["AAPL"]))
+        """
+        if self._cache is None:
+            raise RuntimeError("Incremental refresh requires a cache_dir.")
+
+        tickers = list(dict.fromkeys(tickers))
+        invalid = [t for t in tickers if not self.validate_ticker(t)]
+        if invalid:
+            raise ValueError(f"Invalid ticker(s): {', '.join(invalid)}")
+
+        # Group tickers by their last stored day so each group is one request.
+        since_groups: Dict[str, List[str]] = {}
+        for ticker in tickers:
+            since = self._cache.last_date(ticker) or start
+            if since is None:
+                raise ValueError(f"No stored history for {ticker}; pass start to seed it.")
+            since_groups.setdefault(since, []).append(ticker)
+
+        end = (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+        deltas = {}
+        for since, group in since_groups.items():
+            fresh = self._download_many(group, since, end)
+            for ticker in group:
+                self._cache.merge(ticker, fresh[ticker], since, end)
+                deltas[ticker] = fresh[ticker]
+                if self._memory_cache is not None:
+                    self._memory_cache.invalidate(ticker)
+        return deltas
+
+    def _download(self, ticker: str, start: str, end: str) -> pd.DataFrame:
+        """Download [start, end) for one ticker from the configured provider."""
+        return self._download_many([ticker], start, end).get(ticker, pd.DataFrame())
+
+    def _download_many(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+        """Download several tickers in one provider request, one frame per ticker."""
+        if not tickers:
+            return {}
+        frames = self._provider.fetch_data(tickers, start, end)
+        return {t: frames.get(t, pd.DataFrame()) for t in tickers}
+
     # ------------------------------------------------
     # Fetch news for a ticker
     # ------------------------------------------------
@@ -168,3 +354,4 @@ class StockDataManager:
     def __repr__(self):
         return f"StockDataManager(api={self._api!r}, last_ticker={self._last_ticker!r})"
 
+
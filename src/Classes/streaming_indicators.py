@@ -0,0 +1,377 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Iterable, Optional
+
+
+class StreamingIndicator(ABC):
+    """
+    Base class for indicators that consume one bar at a time in O(1).
+
+    Subclasses implement ``update(value)``, ``_from_params``,
+    ``_state_fields()`` and ``_restore``; the base class handles state
+    serialization so a live dashboard can persist and
+    restore indicators without replaying history.
+    """
+
+    kind = "base"
+
+    def __init__(self):
+        self._value = None
+        self._count = 0
+
+    @property
+    def value(self) -> Optional[float]:
+        """Return the latest indicator value (None until enough bars arrived)."""
+        return self._value
+
+    @property
+    def count(self) -> int:
+        """Return how many valid bars have been consumed."""
+        return self._count
+
+    @abstractmethod
+    def update(self, value) -> Optional[float]:
+        """Consume one bar and return the updated value."""
+
+    def update_many(self, values: Iterable) -> Optional[float]:
+        """Feed several bars in order and return the last value."""
+        for v in values:
+            self.update(v)
+        return self._value
+
+    # ------------------------------------------------
+    # Serialization
+    # ------------------------------------------------
+    def to_state(self) -> dict:
+        """Return a JSON-serializable snapshot of the indicator."""
+        state = {"kind": self.kind, "value": self._value, "count": self._count}
+        for name, field in self._state_fields().items():
+            state[name] = list(field) if isinstance(field, deque) else field
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict) -> "StreamingIndicator":
+        """Rebuild an indicator from ``to_state()`` output."""
+        indicator_cls = STREAMING_INDICATORS.get(state.get("kind"))
+        if indicator_cls is None or (cls is not StreamingIndicator and indicator_cls is not cls):
+            raise ValueError(f"Cannot restore indicator of kind {state.get('kind')!r} as {cls.__name__}")
+        indicator = indicator_cls._from_params(state)
+        indicator._value = state["value"]
+        indicator._count = state["count"]
+        indicator._restore(state)
+        return indicator
+
+    @classmethod
+    @abstractmethod
+    def _from_params(cls, state: dict) -> "StreamingIndicator":
+        """Construct an empty indicator with the parameters stored in ``state``."""
+
+    @abstractmethod
+    def _state_fields(self) -> dict:
+        """Return the running state to serialize, keyed by field name."""
+
+    @abstractmethod
+    def _restore(self, state: dict) -> None:
+        """Load the running state written by ``_state_fields``."""
+
+    def __repr__(self):
+        return f"{type(self).__name__}(value={self._value!r}, count={self._count})"
+
+
+def _clean(value) -> Optional[float]:
+    """Return value as float, or None for missing/invalid/NaN input."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+class StreamingSMA(StreamingIndicator):
+    """
+    Simple moving average with the same running-sum arithmetic as ``calculate_sma``.
+
+    Example:
+        >>> sma = StreamingSMA(3)
+        >>> [sma.update(v) for v in [1, 2, 3, 4]]
+        [None, None, 2.0, 3.0]
+    """
+
+    kind = "sma"
+
+    def __init__(self, window: int = 20):
+        super().__init__()
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self._buffer = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, value) -> Optional[float]:
+        value = _clean(value)
+        if value is None:
+            return self._value
+
+        self._sum += value
+        if len(self._buffer) == self.window:
+            self._sum -= self._buffer[0]
+        self._buffer.append(value)
+        self._count += 1
+
+        if self._count >= self.window:
+            self._value = self._sum / self.window
+        return self._value
+
+    @classmethod
+    def _from_params(cls, state):
+        return cls(state["window"])
+
+    def _state_fields(self):
+        return {"window": self.window, "buffer": self._buffer, "sum": self._sum}
+
+    def _restore(self, state):
+        self._buffer.extend(state["buffer"])
+        self._sum = state["sum"]
+
+
+class StreamingEMA(StreamingIndicator):
+    """
+    Exponential moving average seeded with the first bar (pandas ``adjust=False``).
+
+    Example:
+        >>> ema = StreamingEMA(span=3)
+        >>> [ema.update(v) for v in [2, 4, 4]]
+        [2.0, 3.0, 3.5]
+    """
+
+    kind = "ema"
+
+    def __init__(self, span: int = 12):
+        super().__init__()
+        if span < 1:
+            raise ValueError("span must be >= 1")
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+
+    def update(self, value) -> Optional[float]:
+        value = _clean(value)
+        if value is None:
+            return self._value
+
+        if self._value is None:
+            self._value = value
+        else:
+            self._value = self.alpha * value + (1 - self.alpha) * self._value
+        self._count += 1
+        return self._value
+
+    @classmethod
+    def _from_params(cls, state):
+        return cls(state["span"])
+
+    def _state_fields(self):
+        return {"span": self.span}
+
+    def _restore(self, state):
+        pass
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    RSI over simple window averages of gains and losses, matching ``calculate_rsi``.
+
+    The first bar contributes a zero gain/loss, so a value appears once
+    ``window`` bars have been seen. A window without losses gives exactly 100.0.
+
+    Example:
+        >>> rsi = StreamingRSI(2)
+        >>> [rsi.update(v) for v in [1, 2, 3, 2, 1]]
+        [None, 100.0, 100.0, 50.0, 0.0]
+    """
+
+    kind = "rsi"
+
+    def __init__(self, window: int = 14):
+        super().__init__()
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self._gains = deque(maxlen=window)
+        self._losses = deque(maxlen=window)
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._loss_bars = 0
+        self._last_price = None
+
+    def update(self, value) -> Optional[float]:
+        value = _clean(value)
+        if value is None:
+            return self._value
+
+        change = 0.0 if self._last_price is None else value - self._last_price
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        self._last_price = value
+
+        if len(self._gains) == self.window:
+            self._gain_sum -= self._gains[0]
+            self._loss_sum -= self._losses[0]
+            self._loss_bars -= self._losses[0] > 0
+        self._gains.append(gain)
+        self._losses.append(loss)
+        self._gain_sum += gain
+        self._loss_sum += loss
+        self._loss_bars += loss > 0
+        self._count += 1
+
+        if self._count >= self.window:
+            if self._loss_bars == 0:
+                self._value = 100.0
+            else:
+                avg_gain = max(self._gain_sum, 0.0) / self.window
+                avg_loss = self._loss_sum / self.window
+                self._value = 100 - (100 / (1 + avg_gain / avg_loss))
+        return self._value
+
+    @classmethod
+    def _from_params(cls, state):
+        return cls(state["window"])
+
+    def _state_fields(self):
+        return {
+            "window": self.window, "gains": self._gains, "losses": self._losses,
+            "gain_sum": self._gain_sum, "loss_sum": self._loss_sum,
+            "loss_bars": self._loss_bars, "last_price": self._last_price,
+        }
+
+    def _restore(self, state):
+        self._gains.extend(state["gains"])
+        self._losses.extend(state["losses"])
+        self._gain_sum = state["gain_sum"]
+        self._loss_sum = state["loss_sum"]
+        self._loss_bars = state["loss_bars"]
+        self._last_price = state["last_price"]
+
+
+class StreamingRollingStats(StreamingIndicator):
+    """
+    Rolling mean and standard deviation using a sliding-window Welford update.
+
+    ``value`` is the rolling mean; ``std`` is the rolling standard deviation
+    (population by default, ``ddof=1`` for the sample version).
+
+    Example:
+        >>> stats = StreamingRollingStats(3)
+        >>> stats.update_many([1, 2, 3, 4])
+        3.0
+        >>> round(stats.std, 6)
+        0.816497
+    """
+
+    kind = "rolling_stats"
+
+    def __init__(self, window: int = 20, ddof: int = 0):
+        super().__init__()
+        if window < 2:
+            raise ValueError("window must be >= 2")
+        if ddof not in (0, 1):
+            raise ValueError("ddof must be 0 or 1")
+        self.window = window
+        self.ddof = ddof
+        self._buffer = deque(maxlen=window)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._std = None
+
+    @property
+    def std(self) -> Optional[float]:
+        """Return the latest rolling standard deviation."""
+        return self._std
+
+    def update(self, value) -> Optional[float]:
+        value = _clean(value)
+        if value is None:
+            return self._value
+
+        if len(self._buffer) < self.window:
+            # Growing phase: standard Welford step.
+            n = len(self._buffer) + 1
+            delta = value - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (value - self._mean)
+        else:
+            # Sliding phase: replace the oldest value in one step.
+            old = self._buffer[0]
+            old_mean = self._mean
+            self._mean += (value - old) / self.window
+            self._m2 += (value - old) * (value - self._mean + old - old_mean)
+        self._buffer.append(value)
+        self._count += 1
+
+        if len(self._buffer) == self.window:
+            self._value = self._mean
+            variance = max(self._m2, 0.0) / (self.window - self.ddof)
+            self._std = math.sqrt(variance)
+        return self._value
+
+    @classmethod
+    def _from_params(cls, state):
+        return cls(state["window"], state["ddof"])
+
+    def _state_fields(self):
+        return {
+            "window": self.window, "ddof": self.ddof, "buffer": self._buffer,
+            "mean": self._mean, "m2": self._m2, "std": self._std,
+        }
+
+    def _restore(self, state):
+        self._buffer.extend(state["buffer"])
+        self._mean = state["mean"]
+        self._m2 = state["m2"]
+        self._std = state["std"]
+
+
+STREAMING_INDICATORS = {
+    cls.kind: cls
+    for cls in (StreamingSMA, StreamingEMA, StreamingRSI, StreamingRollingStats)
+}
+
+
+class IndicatorStream:
+    """
+    A named group of streaming indicators fed from the same close series.
+
+    Example:
+        >>> stream = IndicatorStream({"SMA_2": StreamingSMA(2), "RSI_2": StreamingRSI(2)})
+        >>> stream.update_many([1, 2, 3])
+        {'SMA_2': 2.5, 'RSI_2': 100.0}
+    """
+
+    def __init__(self, indicators: Dict[str, StreamingIndicator]):
+        self._indicators = dict(indicators)
+
+    @property
+    def indicators(self):
+        return self._indicators
+
+    def update(self, close) -> Dict[str, Optional[float]]:
+        """Feed one new close to every indicator and return the latest values."""
+        return {name: ind.update(close) for name, ind in self._indicators.items()}
+
+    def update_many(self, closes: Iterable) -> Dict[str, Optional[float]]:
+        for close in closes:
+            self.update(close)
+        return self.values()
+
+    def values(self) -> Dict[str, Optional[float]]:
+        return {name: ind.value for name, ind in self._indicators.items()}
+
+    def to_state(self) -> dict:
+        return {name: ind.to_state() for name, ind in self._indicators.items()}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "IndicatorStream":
+        return cls({name: StreamingIndicator.from_state(s) for name, s in state.items()})
+
+    def __str__(self):
+        return f"IndicatorStream({', '.join(self._indicators)})"
@@ -1,10 +1,19 @@
 from typing import List, Dict
-import math
+
+import numpy as np
+
+from src.Functions.analysis.indicator_kernels import rsi_kernel, sma_kernel, to_optional_list
 
 def calculate_technical_indicators(prices: List[float], window: int = 14) -> Dict[str, List[float]]:
     """
     Calculate moving averages (SMA) and Relative Strength Index (RSI) for a stock.
 
+    Both series come from the shared kernels in indicator_kernels, so they
+    match StockAnalyzer.calculate_sma / calculate_rsi. A window without
+    losses gives an RSI of exactly 100.0. As in the original loops, a
+    missing (NaN) price makes every SMA window containing it, and every RSI
+    window containing a price change to or from it, NaN.
+
     Parameters
     ----------
     prices : List[float]
@@ -28,32 +37,26 @@ def calculate_technical_indicators(prices: List[float], window: int = 14) -> Dic
     if len(prices) < window or window < 2:
         raise ValueError("Prices list too short or window < 2")
 
-    sma: List[float] = []
-    rsi: List[float] = []
-
-    # Calculate SMA
-    for i in range(len(prices)):
-        if i + 1 < window:
-            sma.append(None)
-        else:
-            sma.append(sum(prices[i+1-window:i+1])/window)
-
-    # Calculate RSI
-    gains: List[float] = [0.0]
-    losses: List[float] = [0.0]
-    for i in range(1, len(prices)):
-        change = prices[i] - prices[i-1]
-        gains.append(max(change, 0))
-        losses.append(max(-change, 0))
-
-    for i in range(len(prices)):
-        if i + 1 < window:
-            rsi.append(None)
-        else:
-            avg_gain = sum(gains[i+1-window:i+1])/window
-            avg_loss = sum(losses[i+1-window:i+1])/window
-            rs = avg_gain / avg_loss if avg_loss != 0 else math.inf
-            rsi_val = 100 - (100 / (1 + rs))
-            rsi.append(rsi_val)
-
-    return {"SMA": sma, "RSI": rsi}
+    prices = np.fromiter(map(float, prices), dtype=np.float64, count=len(prices))
+    missing = np.isnan(prices)
+    bad_change = missing.copy()
+    bad_change[1:] |= missing[:-1]
+    bad_change[0] = False  # the first bar has no change (gain and loss are 0)
+    # Windows touching a missing price are overwritten with NaN below; filling
+    # the gaps keeps the kernels' running sums exact for every other window.
+    filled = np.where(missing, 0.0, prices)
+    return {
+        "SMA": _with_nan_windows(sma_kernel(filled, window), missing, window),
+        "RSI": _with_nan_windows(rsi_kernel(filled, window), bad_change, window),
+    }
+
+
+def _with_nan_windows(values: np.ndarray, bad: np.ndarray, window: int) -> List[float]:
+    """Return ``values`` as a list (None during warm-up) with NaN wherever the window holds a ``bad`` input."""
+    out = to_optional_list(values)
+    if bad.any():
+        counts = np.concatenate(([0], np.cumsum(bad)))
+        tainted = counts[window:] - counts[:-window] > 0  # windows ending at window-1, window, ...
+        for i in np.flatnonzero(tainted) + window - 1:
+            out[i] = float("nan")
+    return out
@@ -0,0 +1,261 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+
+def to_float_array(values) -> np.ndarray:
+    """
+    Convert prices (list, Series or array) to a float64 NumPy array.
+
+    Entries that cannot be read as numbers (None, text) become NaN, which the
+    kernels below treat as missing values.
+
+    Examples:
+        >>> to_float_array([1, None, "x", 2.5])
+        array([1. , nan, nan, 2.5])
+    """
+    if isinstance(values, np.ndarray) and values.dtype == np.float64:
+        return values
+    if isinstance(values, pd.DataFrame):
+        values = values.iloc[:, 0]
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+        return values.astype(np.float64)
+    if isinstance(values, pd.Series) and values.dtype.kind in "iuf":
+        # Numeric columns convert directly (a float64 column is not copied).
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def to_optional_list(values: np.ndarray) -> List[Optional[float]]:
+    """
+    Convert a 1D float array to a list of Python floats with None for NaN.
+
+    Examples:
+        >>> to_optional_list(np.array([1.0, np.nan]))
+        [1.0, None]
+    """
+    out = values.astype(object)
+    out[np.isnan(values)] = None
+    return out.tolist()
+
+
+def sma_kernel(values, window: int = 20) -> np.ndarray:
+    """
+    Simple moving average over the last axis, matching StockAnalyzer's running-sum SMA.
+
+    Missing values are skipped exactly like the original loop: they add nothing
+    to the running sum and produce NaN at their own position. The running sum is
+    built with one interleaved cumulative sum (add the new value, then subtract
+    the value leaving the window) so results are bit-for-bit identical to the
+    sequential Python version.
+
+    Parameters
+    ----------
+    values : array-like
+        Prices, 1D or 2D (rows are independent series).
+    window : int
+        Window size (>= 1).
+
+    Returns
+    -------
+    np.ndarray
+        float64 array shaped like ``values``; NaN where no average is defined.
+
+    Examples:
+        >>> sma_kernel([1, 2, 3, 4, 5], window=3)
+        array([nan, nan,  2.,  3.,  4.])
+    """
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    x = to_float_array(values) if np.ndim(values) <= 1 else np.asarray(values, dtype=np.float64)
+    n = x.shape[-1]
+    valid = ~np.isnan(x)
+
+    add = np.where(valid, x, 0.0)
+    sub = np.zeros_like(x)
+    if n > window:
+        leaving = x[..., :-window]
+        take = valid[..., window:] & ~np.isnan(leaving)
+        sub[..., window:] = np.where(take, leaving, 0.0)
+
+    steps = np.empty(x.shape[:-1] + (2 * n,))
+    steps[..., 0::2] = add
+    steps[..., 1::2] = -sub
+    running = np.cumsum(steps, axis=-1)[..., 1::2]
+
+    out = running / window
+    out[..., :window - 1] = np.nan
+    out[~valid] = np.nan
+    return out
+
+
+def rsi_kernel(prices, window: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index over the last axis using simple window averages.
+
+    Gains and losses come from consecutive price changes (0 when either price
+    is missing); the first ``window - 1`` bars are NaN. Window sums are taken
+    from prefix sums, and a window with no losses is detected from an integer
+    count so it yields exactly 100.0 like the original loop.
+
+    Examples:
+        >>> rsi_kernel([1, 2, 3, 2, 1], window=2)
+        array([ nan, 100., 100.,  50.,   0.])
+    """
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    p = to_float_array(prices) if np.ndim(prices) <= 1 else np.asarray(prices, dtype=np.float64)
+    n = p.shape[-1]
+    out = np.full(p.shape, np.nan)
+    if n < window:
+        return out
+
+    out[..., window - 1:] = rsi_from_prefix_sums(gain_loss_prefix_sums(*gains_losses(p)), window)
+    return out
+
+
+def sma_sweep_kernel(values, windows) -> np.ndarray:
+    """
+    Simple moving averages for many windows from one prefix-sum pass.
+
+    The prices are centered on their mean and accumulated once; every window
+    is then a difference of two prefix sums, so each extra window costs one
+    subtraction over the series. A series with missing values falls back to
+    ``sma_kernel`` per window so the skip-missing semantics stay identical.
+
+    Parameters
+    ----------
+    values : array-like
+        1D price series.
+    windows : iterable of int
+        Window sizes (each >= 1).
+
+    Returns
+    -------
+    np.ndarray
+        float64 matrix shaped (len(windows), len(values)); row ``i`` equals
+        ``sma_kernel(values, windows[i])`` up to floating-point rounding.
+
+    Examples:
+        >>> sma_sweep_kernel([1, 2, 3, 4], windows=[2, 3])
+        array([[nan, 1.5, 2.5, 3.5],
+               [nan, nan, 2. , 3. ]])
+    """
+    windows = _check_windows(windows)
+    x = to_float_array(values)
+    n = x.shape[-1]
+    out = np.full((len(windows), n), np.nan)
+
+    if np.isnan(x).any():
+        for i, w in enumerate(windows):
+            out[i] = sma_kernel(x, w)
+        return out
+
+    center = x.mean() if n else 0.0
+    prefix = prefix_sums(x - center)
+    for i, w in enumerate(windows):
+        if w <= n:
+            out[i, w - 1:] = (prefix[w:] - prefix[:-w]) / w + center
+    return out
+
+
+def rsi_sweep_kernel(prices, windows) -> np.ndarray:
+    """
+    RSI for many lookbacks; gains, losses and their prefix sums are built once.
+
+    Returns a float64 matrix shaped (len(windows), len(prices)) whose row ``i``
+    is identical to ``rsi_kernel(prices, windows[i])``.
+
+    Examples:
+        >>> rsi_sweep_kernel([1, 2, 3, 2, 1], windows=[1, 2])
+        array([[100., 100., 100.,   0.,   0.],
+               [ nan, 100., 100.,  50.,   0.]])
+    """
+    windows = _check_windows(windows)
+    p = to_float_array(prices)
+    n = p.shape[-1]
+    out = np.full((len(windows), n), np.nan)
+
+    prefixes = gain_loss_prefix_sums(*gains_losses(p))
+    for i, w in enumerate(windows):
+        if w <= n:
+            out[i, w - 1:] = rsi_from_prefix_sums(prefixes, w)
+    return out
+
+
+def pct_change_anomaly_mask(prices, threshold: float = 0.05) -> np.ndarray:
+    """
+    Flag bars whose absolute percent change from the previous bar exceeds ``threshold``.
+
+    Bars with a missing price, a missing previous price or a previous price of
+    zero are never flagged. Works over the last axis.
+
+    Examples:
+        >>> pct_change_anomaly_mask([100, 110, 111], threshold=0.05)
+        array([False,  True, False])
+    """
+    p = to_float_array(prices) if np.ndim(prices) <= 1 else np.asarray(prices, dtype=np.float64)
+    mask = np.zeros(p.shape, dtype=bool)
+    prev, cur = p[..., :-1], p[..., 1:]
+
+    usable = ~np.isnan(prev) & ~np.isnan(cur) & (prev != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = np.abs(cur - prev) / prev
+    mask[..., 1:] = usable & (change_pct > threshold)
+    return mask
+
+
+def _check_windows(windows) -> List[int]:
+    windows = [int(w) for w in windows]
+    if not windows:
+        raise ValueError("windows must not be empty")
+    if min(windows) < 1:
+        raise ValueError("every window must be >= 1")
+    return windows
+
+
+def prefix_sums(values: np.ndarray) -> np.ndarray:
+    """Cumulative sums along the last axis with a leading zero (length n + 1)."""
+    zero = np.zeros(values.shape[:-1] + (1,), dtype=values.dtype)
+    return np.concatenate([zero, np.cumsum(values, axis=-1)], axis=-1)
+
+
+def gains_losses(p: np.ndarray):
+    """
+    Per-bar gains and losses from consecutive price changes, as used by RSI.
+
+    The first bar and any change involving a missing price count as 0.
+    """
+    change = np.zeros_like(p)
+    change[..., 1:] = np.diff(p, axis=-1)
+    change[np.isnan(change)] = 0.0
+    return np.maximum(change, 0.0), np.maximum(-change, 0.0)
+
+
+def gain_loss_prefix_sums(gains: np.ndarray, losses: np.ndarray):
+    """Prefix sums of gains, losses and their non-zero counts for RSI windows."""
+    return (
+        prefix_sums(gains),
+        prefix_sums(losses),
+        prefix_sums((gains > 0).astype(np.int64)),
+        prefix_sums((losses > 0).astype(np.int64)),
+    )
+
+
+def rsi_from_prefix_sums(prefixes, window: int) -> np.ndarray:
+    """RSI for every full trailing window (length n - window + 1)."""
+    gain_sum, loss_sum, gain_count, loss_count = (
+        prefix[..., window:] - prefix[..., :-window] for prefix in prefixes
+    )
+
+    # Prefix-sum differences can leave tiny residues; exact zeros come from the counts.
+    gain_sum = np.where(gain_count == 0, 0.0, np.maximum(gain_sum, 0.0))
+    loss_sum = np.where(loss_count == 0, 0.0, np.maximum(loss_sum, 0.0))
+
+    avg_gain = gain_sum / window
+    avg_loss = loss_sum / window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    return np.where(loss_count == 0, 100.0, rsi)
@@ -0,0 +1,420 @@
+import hashlib
+import inspect
+import math
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from src.Functions.analysis.indicator_kernels import (
+    gain_loss_prefix_sums,
+    gains_losses,
+    pct_change_anomaly_mask,
+    rsi_from_prefix_sums,
+    sma_kernel,
+    to_float_array,
+)
+from src.Functions.analysis.price_anomaly_detect import log_returns, rolling_zscores
+
+
+# Maps an indicator base name ("EMA", "MACD", ...) to a function
+# ``fn(ctx, *params) -> Dict[str, np.ndarray]``.
+INDICATOR_REGISTRY: Dict[str, Callable] = {}
+
+
+def register_indicator(name: str):
+    """
+    Decorator that adds an indicator function to INDICATOR_REGISTRY.
+
+    The function receives an IndicatorContext followed by the numeric
+    parameters parsed from the spec ("BBANDS_20_2" -> ctx, 20, 2) and returns
+    {series name: float64 array}. Parameters left out of the spec use the
+    function's defaults.
+    """
+    def decorator(fn):
+        INDICATOR_REGISTRY[name.upper()] = fn
+        return fn
+    return decorator
+
+
+def parse_indicator_spec(spec: str) -> Tuple[str, tuple]:
+    """
+    Split an indicator spec into its registry name and numeric parameters.
+
+    Parameters must be positive integers (windows, spans), except where the
+    indicator function annotates one as ``float`` (e.g. the BBANDS band width).
+
+    Examples:
+        >>> parse_indicator_spec("macd_12_26_9")
+        ('MACD', (12, 26, 9))
+        >>> parse_indicator_spec("BBANDS_20_2.5")
+        ('BBANDS', (20, 2.5))
+        >>> parse_indicator_spec("SMA_2.5")
+        Traceback (most recent call last):
+        ...
+        ValueError: Invalid parameters in indicator spec: 'SMA_2.5' (window must be a positive integer)
+    """
+    if not isinstance(spec, str) or not spec.strip():
+        raise ValueError("indicator spec must be a non-empty string")
+
+    base, *raw = spec.strip().upper().split("_")
+    if base not in INDICATOR_REGISTRY:
+        raise ValueError(f"Unknown indicator: {spec!r}")
+
+    names = list(inspect.signature(INDICATOR_REGISTRY[base]).parameters.values())[1:]
+    if len(raw) > len(names):
+        raise ValueError(f"Too many parameters in indicator spec: {spec!r}")
+
+    params = []
+    for token, param in zip(raw, names):
+        value = _parse_param(token, real=param.annotation is float)
+        if value is None:
+            kind = "a positive number" if param.annotation is float else "a positive integer"
+            raise ValueError(f"Invalid parameters in indicator spec: {spec!r} ({param.name} must be {kind})")
+        params.append(value)
+    return base, tuple(params)
+
+
+def _parse_param(token: str, real: bool):
+    """Return the token as a positive int (or positive finite float if ``real``), else None."""
+    if token.isdigit():
+        value = int(token)
+        return value if value > 0 else None
+    if not real:
+        return None
+    try:
+        value = float(token)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) and value > 0 else None
+
+
+class IndicatorContext:
+    """
+    Lazy, memoized graph of series derived from one set of OHLCV columns.
+
+    Each method is a named node (close, diff, returns, log returns, gains,
+    losses, RSI prefix sums, SMA, rolling std, ...) that pulls the nodes it
+    depends on and is computed once on first demand. Columns are converted
+    to float64 only when a node needs them. Requesting "EMA_12" and
+    "MACD_12_26_9", or RSI for several windows, therefore shares the base
+    work. Call ``invalidate()`` (or build a new context) when the data changes.
+
+    Example:
+        >>> ctx = IndicatorContext({"Close": [1, 2, 3, 2]})
+        >>> ctx.rsi(2)
+        array([ nan, 100., 100.,  50.])
+        >>> ctx.computed()
+        ['Close', 'gains_losses', 'rsi_prefixes', 'rsi(2)']
+    """
+
+    def __init__(self, columns: Dict[str, object]):
+        self._memo: Dict[tuple, object] = {}
+        self._set_sources(columns)
+
+    def _set_sources(self, columns):
+        sources = {name.title(): values for name, values in columns.items()}
+        if len({len(v) for v in sources.values()}) > 1:
+            raise ValueError("All OHLCV columns must have the same length.")
+        self._sources = sources
+
+    def __len__(self):
+        return len(next(iter(self._sources.values()), ()))
+
+    def column(self, name: str) -> np.ndarray:
+        name = name.title()
+        if name not in self._sources:
+            raise ValueError(f"Indicator needs a '{name}' column.")
+        # A view, so marking it read-only never touches the caller's own array.
+        return self.memo((name,), lambda: to_float_array(self._sources[name]).view())
+
+    def memo(self, key: tuple, fn: Callable[[], object]):
+        """Return node ``key``, building it with ``fn`` on first use (results are read-only)."""
+        if key not in self._memo:
+            value = fn()
+            for array in (value if isinstance(value, tuple) else (value,)):
+                if isinstance(array, np.ndarray):
+                    array.setflags(write=False)
+            self._memo[key] = value
+        return self._memo[key]
+
+    def invalidate(self, columns: Dict[str, object] = None) -> None:
+        """Drop every computed node, optionally swapping in new column data."""
+        if columns is not None:
+            self._set_sources(columns)
+        self._memo.clear()
+
+    def fingerprint(self) -> str:
+        """
+        Return a blake2b content hash of every column (names, lengths and values).
+
+        Identical bars give the same fingerprint in any process, so it can key
+        cached indicator results.
+        """
+        def build():
+            digest = hashlib.blake2b(digest_size=16)
+            for name in sorted(self._sources):
+                values = np.ascontiguousarray(self.column(name))
+                digest.update(f"{name}:{len(values)};".encode())
+                digest.update(values.tobytes())
+            return digest.hexdigest()
+        return self.memo(("fingerprint",), build)
+
+    def computed(self) -> List[str]:
+        """Return the names of the nodes computed so far, in evaluation order."""
+        return [
+            key[0] if len(key) == 1 else f"{key[0]}({', '.join(map(str, key[1:]))})"
+            for key in self._memo
+        ]
+
+    # ------------------------------------------------
+    # Price-change nodes
+    # ------------------------------------------------
+    def diff(self) -> np.ndarray:
+        """close[t] - close[t-1]; NaN on the first bar and around missing closes."""
+        def build():
+            close = self.column("Close")
+            out = np.full(close.shape, np.nan)
+            out[1:] = np.diff(close)
+            return out
+        return self.memo(("diff",), build)
+
+    def returns(self) -> np.ndarray:
+        """Simple returns diff / previous close (NaN where undefined)."""
+        def build():
+            close = self.column("Close")
+            out = np.full(close.shape, np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[1:] = self.diff()[1:] / close[:-1]
+            out[~np.isfinite(out)] = np.nan
+            return out
+        return self.memo(("returns",), build)
+
+    def log_returns(self) -> np.ndarray:
+        return self.memo(("log_returns",), lambda: log_returns(self.column("Close")))
+
+    def gains(self) -> np.ndarray:
+        return self._gains_losses()[0]
+
+    def losses(self) -> np.ndarray:
+        return self._gains_losses()[1]
+
+    def _gains_losses(self):
+        return self.memo(("gains_losses",), lambda: gains_losses(self.column("Close")))
+
+    # ------------------------------------------------
+    # Windowed nodes
+    # ------------------------------------------------
+    def sma(self, window: int) -> np.ndarray:
+        return self.memo(("sma", window), lambda: sma_kernel(self.column("Close"), window))
+
+    def rsi_prefixes(self):
+        """Prefix sums of gains, losses and their counts, shared by every RSI window."""
+        return self.memo(("rsi_prefixes",), lambda: gain_loss_prefix_sums(self.gains(), self.losses()))
+
+    def rsi(self, window: int) -> np.ndarray:
+        def build():
+            out = np.full(len(self), np.nan)
+            if window <= len(self):
+                out[window - 1:] = rsi_from_prefix_sums(self.rsi_prefixes(), window)
+            return out
+        return self.memo(("rsi", window), build)
+
+    def ema(self, span: int, source: str = "Close") -> np.ndarray:
+        """EMA seeded with the first bar (adjust=False), skipping missing values."""
+        def build():
+            values = pd.Series(self.column(source))
+            return values.ewm(span=span, adjust=False, ignore_na=True).mean().to_numpy()
+        return self.memo(("ema", span, source), build)
+
+    def rolling_std(self, window: int) -> np.ndarray:
+        def build():
+            close = pd.Series(self.column("Close"))
+            return close.rolling(window).std(ddof=0).to_numpy()
+        return self.memo(("std", window), build)
+
+    def volatility(self, window: int) -> np.ndarray:
+        """Rolling population standard deviation of log returns."""
+        def build():
+            return pd.Series(self.log_returns()).rolling(window).std(ddof=0).to_numpy()
+        return self.memo(("volatility", window), build)
+
+    def zscores(self, window: int, z_threshold: float = 3.0, min_window_non_null: int = None):
+        """(z, flagged) arrays of the rolling log-return z-score detector."""
+        if min_window_non_null is None:
+            min_window_non_null = math.ceil(window * 0.5)
+
+        def build():
+            z, flagged = rolling_zscores(
+                self.log_returns()[np.newaxis, :], window, z_threshold, min_window_non_null)
+            return z[0], flagged[0]
+        return self.memo(("zscores", window, z_threshold, min_window_non_null), build)
+
+    def anomaly_mask(self, threshold: float) -> np.ndarray:
+        return self.memo(("anomaly_mask", threshold),
+                         lambda: pct_change_anomaly_mask(self.column("Close"), threshold))
+
+    # ------------------------------------------------
+    # OHLCV nodes
+    # ------------------------------------------------
+    def true_range(self) -> np.ndarray:
+        """max(high - low, |high - prev close|, |low - prev close|); high - low on the first bar."""
+        def build():
+            high, low, close = self.column("High"), self.column("Low"), self.column("Close")
+            prev = np.concatenate([[np.nan], close[:-1]])
+            ranges = np.vstack([high - low, np.abs(high - prev), np.abs(low - prev)])
+            return np.fmax.reduce(ranges, axis=0)
+        return self.memo(("true_range",), build)
+
+    def typical_price(self) -> np.ndarray:
+        return self.memo(
+            ("typical",),
+            lambda: (self.column("High") + self.column("Low") + self.column("Close")) / 3.0,
+        )
+
+
+def _check_window(window, name="window"):
+    if window < 1:
+        raise ValueError(f"{name} must be >= 1")
+
+
+# ------------------------------------------------
+# Registered indicators
+# ------------------------------------------------
+@register_indicator("SMA")
+def _sma(ctx, window=20):
+    _check_window(window)
+    return {f"SMA_{window}": ctx.sma(window)}
+
+
+@register_indicator("RSI")
+def _rsi(ctx, window=14):
+    _check_window(window)
+    return {f"RSI_{window}": ctx.rsi(window)}
+
+
+@register_indicator("VOLATILITY")
+def _volatility(ctx, window=20):
+    if window < 2:
+        raise ValueError("window must be >= 2")
+    return {f"VOLATILITY_{window}": ctx.volatility(window)}
+
+
+@register_indicator("ZSCORE")
+def _zscore(ctx, window=20):
+    if window < 2:
+        raise ValueError("window must be >= 2")
+    return {f"ZSCORE_{window}": ctx.zscores(window)[0]}
+
+
+@register_indicator("EMA")
+def _ema(ctx, span=12):
+    _check_window(span, "span")
+    return {f"EMA_{span}": ctx.ema(span)}
+
+
+@register_indicator("MACD")
+def _macd(ctx, fast=12, slow=26, signal=9):
+    for value, name in ((fast, "fast"), (slow, "slow"), (signal, "signal")):
+        _check_window(value, name)
+    if fast >= slow:
+        raise ValueError("MACD fast span must be shorter than the slow span")
+
+    suffix = f"{fast}_{slow}_{signal}"
+    line = ctx.memo(("macd", fast, slow), lambda: ctx.ema(fast) - ctx.ema(slow))
+    signal_line = pd.Series(line).ewm(span=signal, adjust=False, ignore_na=True).mean().to_numpy()
+    return {
+        f"MACD_{suffix}": line,
+        f"MACD_SIGNAL_{suffix}": signal_line,
+        f"MACD_HIST_{suffix}": line - signal_line,
+    }
+
+
+@register_indicator("BBANDS")
+def _bbands(ctx, window=20, num_std: float = 2):
+    _check_window(window)
+    suffix = f"{window}_{num_std}"
+    mid = ctx.sma(window)
+    width = num_std * ctx.rolling_std(window)
+    return {
+        f"BB_UPPER_{suffix}": mid + width,
+        f"BB_MID_{suffix}": mid,
+        f"BB_LOWER_{suffix}": mid - width,
+    }
+
+
+@register_indicator("ATR")
+def _atr(ctx, window=14):
+    """Average true range with Wilder smoothing (alpha = 1 / window)."""
+    _check_window(window)
+    tr = pd.Series(ctx.true_range())
+    atr = tr.ewm(alpha=1.0 / window, adjust=False, ignore_na=True).mean().to_numpy(copy=True)
+    atr[:window - 1] = np.nan
+    return {f"ATR_{window}": atr}
+
+
+@register_indicator("VWAP")
+def _vwap(ctx):
+    """Volume-weighted average price anchored at the first bar."""
+    typical, volume = ctx.typical_price(), ctx.column("Volume")
+    usable = ~np.isnan(typical) & ~np.isnan(volume)
+    pv = np.cumsum(np.where(usable, typical * volume, 0.0))
+    vol = np.cumsum(np.where(usable, volume, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = pv / vol
+    vwap[vol == 0] = np.nan
+    return {"VWAP": vwap}
+
+
+@register_indicator("OBV")
+def _obv(ctx):
+    """On-balance volume: running sum of volume signed by the close-to-close direction."""
+    close, volume = ctx.column("Close"), ctx.column("Volume")
+    direction = np.zeros(len(close))
+    direction[1:] = np.sign(np.diff(close))
+    signed = np.nan_to_num(direction * volume)
+    return {"OBV": np.cumsum(signed)}
+
+
+def compute_indicators(columns, specs: Iterable[str], cache=None) -> Dict[str, np.ndarray]:
+    """
+    Compute a set of registered indicators together over OHLCV columns.
+
+    Parameters
+    ----------
+    columns : dict or IndicatorContext
+        {"Open"/"High"/"Low"/"Close"/"Volume": array-like}. Only the columns an
+        indicator needs have to be present.
+    specs : iterable of str
+        Indicator specs such as "EMA_12", "MACD_12_26_9", "BBANDS_20_2",
+        "ATR_14", "VWAP", "OBV".
+    cache : IndicatorCache, optional
+        When given, each spec is looked up by the context fingerprint plus its
+        name and parameters and only computed on a miss.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Output series keyed by name (multi-line indicators such as MACD and
+        Bollinger Bands return several entries), all as long as the input.
+
+    Raises
+    ------
+    ValueError
+        If a spec is unknown/invalid or a required column is missing.
+
+    Examples:
+        >>> out = compute_indicators({"Close": [1, 2, 3, 4]}, ["SMA_2", "EMA_3"])
+        >>> list(out)
+        ['SMA_2', 'EMA_3']
+    """
+    ctx = columns if isinstance(columns, IndicatorContext) else IndicatorContext(columns)
+    results: Dict[str, np.ndarray] = {}
+    for spec in specs:
+        base, params = parse_indicator_spec(spec)
+        fn = INDICATOR_REGISTRY[base]
+        if cache is None:
+            results.update(fn(ctx, *params))
+        else:
+            results.update(cache.get_or_compute(ctx.fingerprint(), base, params, lambda: fn(ctx, *params)))
+    return results
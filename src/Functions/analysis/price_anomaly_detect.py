@@ -1,8 +1,11 @@
 import math
-import statistics
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+import numpy as np
+
+from src.Functions.analysis.indicator_kernels import to_float_array
+
 def detect_price_anomalies(
     prices: List[float],
     timestamps: Optional[List[datetime]] = None,
@@ -14,6 +17,8 @@ def detect_price_anomalies(
     Detect unusual stock price changes using rolling z-scores on log returns.
 
     Returns beginner-friendly alerts with index, price, timestamp, and reason.
+    Rolling means and deviations are computed with NumPy prefix sums in one
+    pass; missing prices (None/NaN) leave gaps that are skipped in each window.
 
     Parameters
     ----------
@@ -55,31 +60,173 @@ def detect_price_anomalies(
     if min_window_non_null is None:
         min_window_non_null = math.ceil(window * 0.5)
 
-    # Compute log returns
-    n = len(prices)
-    returns: List[Optional[float]] = [None] * n
-    for i in range(1, n):
-        try:
-            returns[i] = math.log(prices[i] / prices[i-1])
-        except (TypeError, ValueError, ZeroDivisionError):
-            returns[i] = None
+    returns = log_returns(to_float_array(prices)[np.newaxis, :])
+    z, flagged = rolling_zscores(returns, window, z_threshold, min_window_non_null)
+    return _build_alerts(prices, timestamps, z[0], flagged[0])
+
+
+def detect_price_anomalies_batch(
+    prices_by_ticker: Dict[str, List[float]],
+    timestamps_by_ticker: Optional[Dict[str, List[datetime]]] = None,
+    window: int = 20,
+    z_threshold: float = 3.0,
+    min_window_non_null: Optional[int] = None
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Run detect_price_anomalies for many tickers in a single vectorized pass.
+
+    Series of different lengths are stacked into one NaN-padded matrix (padding
+    goes at the end, so it never falls inside an earlier window).
+
+    Parameters
+    ----------
+    prices_by_ticker : Dict[str, List[float]]
+        Chronological prices per ticker.
+    timestamps_by_ticker : Optional[Dict[str, List[datetime]]]
+        Optional timestamps per ticker, aligned with its prices.
+    window, z_threshold, min_window_non_null
+        Same meaning as in detect_price_anomalies.
+
+    Returns
+    -------
+    Dict[str, List[Dict[str, Any]]]
+        Alerts per ticker, identical to calling detect_price_anomalies on each.
+
+    Raises
+    ------
+    ValueError
+        If any series is invalid.
+    """
+    timestamps_by_ticker = timestamps_by_ticker or {}
+    for ticker, prices in prices_by_ticker.items():
+        timestamps = timestamps_by_ticker.get(ticker)
+        if not isinstance(prices, list) or len(prices) < 2:
+            raise ValueError(f"prices for {ticker} must be a list with at least 2 entries")
+        if timestamps and len(timestamps) != len(prices):
+            raise ValueError(f"timestamps for {ticker} must match prices length")
+    if window < 2:
+        raise ValueError("window must be >= 2")
+    if z_threshold <= 0:
+        raise ValueError("z_threshold must be positive")
+    if not prices_by_ticker:
+        return {}
+
+    if min_window_non_null is None:
+        min_window_non_null = math.ceil(window * 0.5)
+
+    tickers = list(prices_by_ticker)
+    width = max(len(prices_by_ticker[t]) for t in tickers)
+    matrix = np.full((len(tickers), width), np.nan)
+    for row, ticker in enumerate(tickers):
+        series = to_float_array(prices_by_ticker[ticker])
+        matrix[row, :len(series)] = series
+
+    z, flagged = rolling_zscores(log_returns(matrix), window, z_threshold, min_window_non_null)
+    return {
+        ticker: _build_alerts(
+            prices_by_ticker[ticker], timestamps_by_ticker.get(ticker),
+            z[row, :len(prices_by_ticker[ticker])], flagged[row, :len(prices_by_ticker[ticker])]
+        )
+        for row, ticker in enumerate(tickers)
+    }
+
+
+def log_returns(matrix: np.ndarray) -> np.ndarray:
+    """
+    Log returns along the last axis; NaN for the first bar, missing prices and
+    non-positive price ratios.
+    """
+    returns = np.full(matrix.shape, np.nan)
+    prev, cur = matrix[..., :-1], matrix[..., 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = cur / prev
+        usable = np.isfinite(ratio) & (ratio > 0)
+        returns[..., 1:] = np.where(usable, np.log(np.where(usable, ratio, 1.0)), np.nan)
+    return returns
+
+
+def rolling_zscores(
+    returns: np.ndarray, window: int, z_threshold: float, min_window_non_null: int
+):
+    """
+    Rolling z-scores for every row of a (rows, n) returns matrix.
+
+    Window moments come from prefix sums of (centered) returns, so each bar
+    costs O(1) whatever the window. Missing returns (NaN) are excluded from
+    the window counts. A window whose returns are all identical has zero
+    deviation and gives an infinite z-score, like the original
+    statistics.pstdev version; constant windows are detected exactly by
+    counting value changes.
+
+    Returns
+    -------
+    (z, flagged) : tuple of np.ndarray
+        z-scores (NaN where not computed) and the boolean alert mask.
+    """
+    rows, n = returns.shape
+    valid = ~np.isnan(returns)
+    counts_per_row = valid.sum(axis=1, keepdims=True)
+    center = np.where(counts_per_row > 0,
+                      np.nansum(returns, axis=1, keepdims=True) / np.maximum(counts_per_row, 1), 0.0)
+    centered = np.where(valid, returns - center, 0.0)
+
+    def prefix(values):
+        return np.concatenate([np.zeros((rows, 1)), np.cumsum(values, axis=1)], axis=1)
+
+    idx = np.arange(n)
+    lo = np.maximum(idx - window, 0)
+    count_p = prefix(valid.astype(np.float64))
+    sum_p = prefix(centered)
+    sq_p = prefix(centered * centered)
+
+    count = count_p[:, idx] - count_p[:, lo]
+    safe_count = np.maximum(count, 1)
+    mean_c = (sum_p[:, idx] - sum_p[:, lo]) / safe_count
+    var = np.maximum((sq_p[:, idx] - sq_p[:, lo]) / safe_count - mean_c * mean_c, 0.0)
+
+    # Exact constant-window check: no value change after the window's first valid return.
+    last_valid = np.maximum.accumulate(np.where(valid, idx, -1), axis=1)
+    prev_valid = np.concatenate([np.full((rows, 1), -1), last_valid[:, :-1]], axis=1)
+    prev_value = np.take_along_axis(returns, np.maximum(prev_valid, 0), axis=1)
+    breaks = valid & (prev_valid >= 0) & (returns != prev_value)
+    break_p = prefix(breaks.astype(np.float64))
+    next_valid = np.minimum.accumulate(np.where(valid, idx, n)[:, ::-1], axis=1)[:, ::-1]
+    first = np.minimum(next_valid[:, lo], idx[np.newaxis, :])
+    first_after = np.minimum(first + 1, idx[np.newaxis, :])
+    constant = (break_p[:, idx] - np.take_along_axis(break_p, first_after, axis=1)) == 0
+
+    eligible = valid & (count >= min_window_non_null) & (idx[np.newaxis, :] >= 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (returns - center - mean_c) / np.sqrt(var)
+
+    # Prefix-sum differences lose precision when a window's spread is tiny next to
+    # the running totals; those few windows are recomputed directly (two-pass).
+    magnitude = sq_p[:, idx] + sq_p[:, lo]
+    ill = eligible & ~constant & (var * safe_count <= 1e-7 * magnitude)
+    if ill.any():
+        r_idx, c_idx = np.nonzero(ill)
+        cols = c_idx[:, np.newaxis] - window + np.arange(window)
+        in_range = cols >= 0
+        vals = np.where(in_range, returns[r_idx[:, np.newaxis], np.maximum(cols, 0)], np.nan)
+        local_mean = np.nanmean(vals, axis=1)
+        local_std = np.sqrt(np.nanmean((vals - local_mean[:, np.newaxis]) ** 2, axis=1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z[r_idx, c_idx] = (returns[r_idx, c_idx] - local_mean) / local_std
+    z = np.where(constant, np.inf, z)
+    z = np.where(eligible, z, np.nan)
+
+    flagged = eligible & (np.abs(z) > z_threshold)
+    return z, flagged
+
 
+def _build_alerts(prices, timestamps, z, flagged) -> List[Dict[str, Any]]:
     alerts: List[Dict[str, Any]] = []
-    for i in range(1, n):
-        start_idx = max(1, i - window)
-        window_vals = [r for r in returns[start_idx:i] if r is not None]
-        if len(window_vals) < min_window_non_null or returns[i] is None:
-            continue
-        mean_w = statistics.mean(window_vals)
-        std_w = statistics.pstdev(window_vals)
-        z = (returns[i] - mean_w) / std_w if std_w != 0 else float('inf')
-
-        if abs(z) > z_threshold:
-            alerts.append({
-                "index": i,
-                "timestamp": timestamps[i] if timestamps else None,
-                "price": prices[i],
-                "z_score": round(z, 4),
-                "reason": "High volatility detected"
-            })
+    for i in np.flatnonzero(flagged).tolist():
+        alerts.append({
+            "index": i,
+            "timestamp": timestamps[i] if timestamps else None,
+            "price": prices[i],
+            "z_score": round(float(z[i]), 4),
+            "reason": "High volatility detected"
+        })
     return alerts
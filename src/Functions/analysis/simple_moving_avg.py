@@ -1,6 +1,14 @@
+import numpy as np
+
+from src.Functions.analysis.indicator_kernels import sma_kernel
+
+
 def simple_moving_average(values, window=20):
     """Compute a simple moving average (SMA) over a list of prices.
 
+    Delegates to the shared ``sma_kernel``; results are identical to the
+    original running-sum loop.
+
     Args:
         values (list[float]): Sequence of numeric prices (e.g., closing prices).
         window (int): Window size for the SMA (default 20).
@@ -30,14 +38,15 @@ def simple_moving_average(values, window=20):
     if n == 0:
         return []
 
-    out = [None] * n
-    running_sum = 0.0
+    # float() per value keeps the original conversion errors for bad entries.
+    prices = np.fromiter(map(float, values), dtype=np.float64, count=n)
+    sma = sma_kernel(prices, window)
 
-    for i, v in enumerate(values):
-        running_sum += float(v)
-        if i >= window:
-            running_sum -= float(values[i - window])
-        if i >= window - 1:
-            out[i] = running_sum / window
+    # The original running sum stays NaN once a NaN price has entered it.
+    nan_at = np.flatnonzero(np.isnan(prices))
+    if nan_at.size:
+        sma[nan_at[0]:] = np.nan
 
+    out = sma.tolist()
+    out[:window - 1] = [None] * min(window - 1, n)
     return out
@@ -1,31 +1,99 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Union
 from datetime import datetime
-import statistics
+
+import numpy as np
+import pandas as pd
+
+from src.Functions.analysis.indicator_kernels import to_float_array, to_optional_list
+from src.Functions.interface.downsampling import lttb_indices
+
+Series = Union[Sequence[Optional[float]], np.ndarray, pd.Series]
+
 
 def prepare_chart_payload(
-    prices: List[float],
-    timestamps: Optional[List[datetime]] = None,
-    indicators: Optional[Dict[str, List[Optional[float]]]] = None,
-    title: Optional[str] = None
+    prices: Series,
+    timestamps: Optional[Sequence] = None,
+    indicators: Optional[Dict[str, Series]] = None,
+    title: Optional[str] = None,
+    max_points: Optional[int] = None,
+    keep_indices: Optional[List[int]] = None
 ) -> Dict[str, Any]:
     """
     Prepare a JSON-serializable payload for frontend charting libraries.
 
     Returns labels (ISO datetimes or index), datasets for price and indicators,
     and simple meta stats (min, max, avg).
+
+    Prices and indicators may be lists (None for gaps), NumPy arrays or pandas
+    Series. Everything is handled column-wise: values are rounded to 4
+    decimals with NumPy, NaN/None become ``null`` and the meta stats are
+    NaN-aware array reductions, so no per-element Python work is done.
+
+    When ``max_points`` is set and the series is longer, the price series is
+    downsampled with Largest-Triangle-Three-Buckets and the same positions are
+    taken from the labels and every indicator. ``keep_indices`` (e.g. anomaly
+    positions) are always kept. The payload then has an ``indices`` entry
+    listing the original position of each point; meta stats always cover the
+    full series.
     """
-    if not isinstance(prices, list) or len(prices) == 0:
-        raise ValueError("prices must be a non-empty list")
-    n = len(prices)
+    if not isinstance(prices, (list, tuple, np.ndarray, pd.Series)) or len(prices) == 0:
+        raise ValueError("prices must be a non-empty list or array")
+    values = to_float_array(prices)
+    n = len(values)
     if timestamps is not None and len(timestamps) != n:
         raise ValueError("timestamps length must match prices")
-    labels = ([t.isoformat() if isinstance(t, datetime) else str(t) for t in timestamps]
-              if timestamps else [str(i) for i in range(n)])
-    datasets = [{"label": "Price", "data": [None if p is None else round(float(p), 4) for p in prices], "type": "line"}]
+    if max_points is not None and max_points < 3:
+        raise ValueError("max_points must be >= 3")
+
+    finite = values[~np.isnan(values)]
+    meta = {
+        "min": float(finite.min()) if finite.size else None,
+        "max": float(finite.max()) if finite.size else None,
+        "avg": round(float(finite.mean()), 4) if finite.size else None,
+    }
+
+    indices = None
+    if max_points is not None and n > max_points:
+        indices = lttb_indices(values, max_points, keep_indices=keep_indices)
+
+    def select(array):
+        return array if indices is None else array[indices]
+
+    datasets = [{"label": "Price", "data": _rounded(select(values)), "type": "line"}]
     if isinstance(indicators, dict):
         for name, series in indicators.items():
-            if isinstance(series, list) and len(series) == n:
-                datasets.append({"label": name, "data": [None if v is None else round(float(v), 4) for v in series], "type": "line"})
-    numeric = [float(p) for p in prices if p is not None]
-    meta = {"min": min(numeric) if numeric else None, "max": max(numeric) if numeric else None, "avg": round(statistics.mean(numeric), 4) if numeric else None}
-    return {"title": title or "Price Chart", "labels": labels, "datasets": datasets, "meta": meta}
+            if isinstance(series, (list, tuple, np.ndarray, pd.Series)) and len(series) == n:
+                datasets.append({"label": name, "data": _rounded(select(to_float_array(series))), "type": "line"})
+
+    payload = {
+        "title": title or "Price Chart",
+        "labels": _labels(timestamps, n, indices),
+        "datasets": datasets,
+        "meta": meta,
+    }
+    if indices is not None:
+        payload["indices"] = indices.tolist()
+    return payload
+
+
+def _rounded(values: np.ndarray) -> List[Optional[float]]:
+    """Round to 4 decimals and return a list with None for NaN."""
+    return to_optional_list(np.round(values, 4))
+
+
+def _labels(timestamps, n: int, indices: Optional[np.ndarray]) -> List[str]:
+    if timestamps is None or len(timestamps) == 0:
+        positions = np.arange(n) if indices is None else indices
+        return positions.astype(str).tolist()
+
+    if isinstance(timestamps, (np.ndarray, pd.Series, pd.Index)):
+        stamps = np.asarray(timestamps)
+        if indices is not None:
+            stamps = stamps[indices]
+        if stamps.dtype.kind == "M":
+            return np.datetime_as_string(stamps, unit="s").tolist()
+        return stamps.astype(str).tolist()
+
+    if indices is not None:
+        timestamps = [timestamps[i] for i in indices]
+    return [t.isoformat() if isinstance(t, datetime) else str(t) for t in timestamps]
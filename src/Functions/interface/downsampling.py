@@ -0,0 +1,86 @@
+from typing import Iterable, Optional
+
+import numpy as np
+
+
+def lttb_indices(
+    y,
+    max_points: int,
+    x=None,
+    keep_indices: Optional[Iterable[int]] = None
+) -> np.ndarray:
+    """
+    Choose which points to draw with Largest-Triangle-Three-Buckets downsampling.
+
+    The series is split into ``max_points - 2`` buckets; from each bucket the
+    point forming the largest triangle with the previously chosen point and
+    the average of the next bucket is kept, which preserves the visual shape
+    (peaks, troughs, trends) far better than striding. The first and last
+    points are always kept. ``keep_indices`` (e.g. anomaly positions) are
+    always added; the LTTB budget shrinks accordingly so the result stays
+    close to ``max_points``.
+
+    Parameters
+    ----------
+    y : array-like
+        Values to downsample (None/NaN allowed).
+    max_points : int
+        Target number of points (>= 3).
+    x : array-like, optional
+        X positions; defaults to 0..n-1.
+    keep_indices : Iterable[int], optional
+        Positions that must appear in the result.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted, unique int64 positions into the original series.
+
+    Raises
+    ------
+    ValueError
+        If max_points < 3 or x has a different length.
+
+    Examples:
+        >>> lttb_indices([0, 5, 0, 0, 0, 0, 0, -5, 0, 0], max_points=4).tolist()
+        [0, 1, 7, 9]
+    """
+    if max_points < 3:
+        raise ValueError("max_points must be >= 3")
+
+    y = np.array([np.nan if v is None else v for v in y], dtype=np.float64) \
+        if not isinstance(y, np.ndarray) else y.astype(np.float64, copy=False)
+    n = len(y)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    if len(x) != n:
+        raise ValueError("x must have the same length as y")
+
+    keep = np.unique(np.asarray(list(keep_indices or []), dtype=np.int64))
+    keep = keep[(keep >= 0) & (keep < n)]
+    if n <= max_points:
+        return np.arange(n, dtype=np.int64)
+
+    target = max(max_points - len(keep), 3)
+    every = (n - 2) / (target - 2)
+    chosen = np.empty(target, dtype=np.int64)
+    chosen[0], chosen[-1] = 0, n - 1
+
+    a = 0
+    for i in range(target - 2):
+        lo = int(i * every) + 1
+        hi = int((i + 1) * every) + 1
+        next_lo = hi
+        next_hi = min(int((i + 2) * every) + 1, n)
+
+        with np.errstate(invalid="ignore"):
+            avg_x = x[next_lo:next_hi].mean()
+            next_y = y[next_lo:next_hi]
+            avg_y = np.nanmean(next_y) if np.isfinite(next_y).any() else np.nan
+            area = np.abs(
+                (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+            )
+
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        chosen[i + 1] = a
+
+    return np.union1d(chosen, keep)
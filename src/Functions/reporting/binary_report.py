@@ -0,0 +1,289 @@
+import gzip
+import json
+import struct
+import warnings
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is used instead
+    zstandard = None
+
+MAGIC = b"STKB"
+VERSION = 2  # 2: dict keys that could be mistaken for column markers are escaped
+_READABLE_VERSIONS = (1, 2)
+BINARY_SUFFIX = ".stkb"
+MIN_COLUMN_LENGTH = 16
+
+_COLUMN_KEY = "__column__"
+_ESCAPE = "~"
+
+_COMPRESSION_IDS = {"none": 0, "gzip": 1, "zstd": 2}
+_COMPRESSION_NAMES = {v: k for k, v in _COMPRESSION_IDS.items()}
+_NUMERIC_TYPES = (int, float, np.integer, np.floating)
+
+
+def write_binary_report(data: Any, output_path: str, compression: str = "auto",
+                        float_dtype: str = "float64") -> int:
+    """
+    Save a JSON-like object (report, chart payload, app state) in the compact binary format.
+
+    Long numeric lists and arrays are stored as raw float/int64 columns,
+    lists of ISO date strings as delta-encoded int64 day (or second) counts
+    in the narrowest integer type that fits, and everything else as a small
+    JSON skeleton. The body is compressed with zstd when ``zstandard`` is
+    installed, otherwise gzip.
+
+    Parameters
+    ----------
+    data : Any
+        JSON-serializable object; NumPy arrays are accepted as columns and
+        other objects are stored with ``str`` like ``json.dump(default=str)``.
+    output_path : str
+        Destination file (conventionally ending in ``.stkb``).
+    compression : str
+        "auto", "zstd", "gzip" or "none".
+    float_dtype : str
+        "float64" (lossless) or "float32" (half the size, ~7 significant digits).
+
+    Returns
+    -------
+    int
+        Number of bytes written.
+
+    Raises
+    ------
+    ValueError
+        If compression or float_dtype is unknown.
+    ImportError
+        If zstd is requested but zstandard is not installed.
+    """
+    blob = dumps_binary_report(data, compression=compression, float_dtype=float_dtype)
+    with open(output_path, "wb") as f:
+        f.write(blob)
+    return len(blob)
+
+
+def read_binary_report(path: str) -> Any:
+    """
+    Load a file written by ``write_binary_report``.
+
+    Columns come back as plain lists (NaN -> None, dates as the original ISO
+    strings), so the result compares equal to the object that was saved.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a binary report or uses an unsupported version.
+    """
+    with open(path, "rb") as f:
+        return loads_binary_report(f.read())
+
+
+def is_binary_report(path: str) -> bool:
+    """Return True if ``path`` starts with the binary report magic bytes."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def dumps_binary_report(data: Any, compression: str = "auto", float_dtype: str = "float64") -> bytes:
+    """Encode ``data`` to bytes; see ``write_binary_report``."""
+    if float_dtype not in {"float64", "float32"}:
+        raise ValueError("float_dtype must be 'float64' or 'float32'")
+    compression = _resolve_compression(compression)
+
+    columns: List[Dict[str, Any]] = []
+    chunks: List[bytes] = []
+    skeleton = _extract(data, columns, chunks, np.dtype(float_dtype))
+    header = json.dumps(
+        {"skeleton": skeleton, "columns": columns}, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+    body = struct.pack("<I", len(header)) + header + b"".join(chunks)
+    if compression == "gzip":
+        body = gzip.compress(body, compresslevel=6, mtime=0)  # deterministic bytes
+    elif compression == "zstd":
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+    return MAGIC + struct.pack("<BB", VERSION, _COMPRESSION_IDS[compression]) + body
+
+
+def loads_binary_report(blob: bytes) -> Any:
+    """
+    Decode bytes produced by ``dumps_binary_report``.
+
+    Raises
+    ------
+    ValueError
+        If the data is not a binary report or is truncated/corrupt (every
+        decompression, header or column error is reported this way).
+    ImportError
+        If the report is zstd-compressed and zstandard is not installed.
+    """
+    if blob[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary report (bad magic bytes).")
+    try:
+        return _decode(blob)
+    except (ValueError, ImportError):
+        raise
+    except Exception as e:
+        # Truncated or garbled input fails in many ways (EOFError, zlib/zstd
+        # errors, struct.error, bad header JSON or dtypes); report them all alike.
+        raise ValueError(f"Corrupt binary report: {type(e).__name__}: {e}") from e
+
+
+def _decode(blob: bytes) -> Any:
+    version, compression_id = struct.unpack_from("<BB", blob, len(MAGIC))
+    if version not in _READABLE_VERSIONS:
+        raise ValueError(f"Unsupported binary report version {version}.")
+
+    body = blob[len(MAGIC) + 2:]
+    compression = _COMPRESSION_NAMES.get(compression_id)
+    if compression == "gzip":
+        body = gzip.decompress(body)
+    elif compression == "zstd":
+        if zstandard is None:
+            raise ImportError("Reading zstd-compressed reports requires zstandard: pip install zstandard")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif compression != "none":
+        raise ValueError(f"Unknown compression id {compression_id}.")
+
+    (header_len,) = struct.unpack_from("<I", body, 0)
+    if 4 + header_len > len(body):
+        raise ValueError("Corrupt binary report: header extends past the end of the file.")
+    header = json.loads(body[4:4 + header_len].decode("utf-8"))
+    data = memoryview(body)[4 + header_len:]
+    columns, offset = [], 0
+    for spec in header["columns"]:
+        if spec["nbytes"] != spec["length"] * np.dtype(spec["dtype"]).itemsize \
+                or offset + spec["nbytes"] > len(data):
+            raise ValueError("Corrupt binary report: column data out of range.")
+        columns.append(_decode_column(spec, data, offset))
+        offset += spec["nbytes"]
+    return _restore(header["skeleton"], columns, escaped=version >= 2)
+
+
+# ------------------------------------------------
+# Encoding helpers
+# ------------------------------------------------
+def _resolve_compression(compression: str) -> str:
+    if compression == "auto":
+        return "zstd" if zstandard is not None else "gzip"
+    if compression not in _COMPRESSION_IDS:
+        raise ValueError("compression must be 'auto', 'zstd', 'gzip' or 'none'")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("zstd compression requires zstandard: pip install zstandard")
+    return compression
+
+
+def _extract(value, columns, chunks, float_dtype):
+    """Replace column-like values with {"__column__": i} markers (escaping keys that look like one)."""
+    if isinstance(value, dict):
+        return {_escape(str(k)): _extract(v, columns, chunks, float_dtype) for k, v in value.items()}
+
+    array = spec = None
+    if isinstance(value, np.ndarray) and value.ndim == 1 and value.dtype.kind in "iuf":
+        array = value
+    elif isinstance(value, (list, tuple)) and len(value) >= MIN_COLUMN_LENGTH:
+        array = _numeric_array(value)
+        if array is None:
+            array, spec = _datetime_column(value)
+
+    if array is not None:
+        if spec is None:
+            if array.dtype.kind == "f":
+                array, spec = array.astype(float_dtype, copy=False), {"kind": "float"}
+            else:
+                array, spec = array.astype(np.int64, copy=False), {"kind": "int"}
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        spec.update(dtype=array.dtype.str, length=len(array), nbytes=array.nbytes)
+        columns.append(spec)
+        chunks.append(array.tobytes())
+        return {_COLUMN_KEY: len(columns) - 1}
+
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_extract(v, columns, chunks, float_dtype) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _numeric_array(values) -> Optional[np.ndarray]:
+    if not all(v is None or (isinstance(v, _NUMERIC_TYPES) and not isinstance(v, bool)) for v in values):
+        return None
+    if all(isinstance(v, (int, np.integer)) for v in values):
+        try:
+            return np.array(values, dtype=np.int64)
+        except OverflowError:
+            return None
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _datetime_column(values):
+    """Delta-encode ISO date strings if they round-trip exactly; else (None, None)."""
+    if not all(isinstance(v, str) for v in values):
+        return None, None
+    original = np.array(values)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            stamps = original.astype("datetime64[s]")
+    except ValueError:
+        return None, None
+
+    for unit in ("D", "s"):
+        if np.array_equal(np.datetime_as_string(stamps, unit=unit), original):
+            ticks = stamps.astype(f"datetime64[{unit}]").astype(np.int64)
+            deltas = np.diff(ticks, prepend=0)
+            return deltas.astype(_narrowest_int(deltas)), {"kind": "datetime", "unit": unit}
+    return None, None
+
+
+def _narrowest_int(values: np.ndarray):
+    lo, hi = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return np.int64
+
+
+# ------------------------------------------------
+# Decoding helpers
+# ------------------------------------------------
+def _decode_column(spec, data, offset):
+    array = np.frombuffer(data, dtype=np.dtype(spec["dtype"]), count=spec["length"], offset=offset)
+    if spec["kind"] == "float":
+        out = array.astype(object)
+        out[np.isnan(array)] = None
+        return out.tolist()
+    if spec["kind"] == "int":
+        return array.tolist()
+    unit = spec["unit"]
+    ticks = np.cumsum(array.astype(np.int64)).astype(f"datetime64[{unit}]")
+    return np.datetime_as_string(ticks, unit=unit).tolist()
+
+
+def _restore(value, columns, escaped=True):
+    if isinstance(value, dict):
+        if len(value) == 1 and _COLUMN_KEY in value:
+            return columns[value[_COLUMN_KEY]]
+        return {
+            (_unescape(k) if escaped else k): _restore(v, columns, escaped) for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_restore(v, columns, escaped) for v in value]
+    return value
+
+
+def _escape(key: str) -> str:
+    """Prefix the marker key (and keys already starting with the prefix) so user dicts never read as columns."""
+    return _ESCAPE + key if key == _COLUMN_KEY or key.startswith(_ESCAPE) else key
+
+
+def _unescape(key: str) -> str:
+    return key[len(_ESCAPE):] if key.startswith(_ESCAPE) else key
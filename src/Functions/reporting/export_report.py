@@ -1,9 +1,10 @@
 import os
 import csv
-import json
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterator, List, Union
 
-def export_report(data: Union[List[Dict[str, Any]], Dict[str, Any]],
+from src.Functions.reporting.stream_json import write_json_stream
+
+def export_report(data: Union[List[Dict[str, Any]], Dict[str, Any], Iterator[Dict[str, Any]]],
                   output_path: str,
                   file_type: str = "csv") -> None:
     """
@@ -11,8 +12,9 @@ def export_report(data: Union[List[Dict[str, Any]], Dict[str, Any]],
 
     Parameters
     ----------
-    data : list[dict] or dict
-        Data to export
+    data : list[dict], dict or iterator of dict
+        Data to export. JSON is written incrementally, so rows may come from
+        a generator (JSON only) and never be held in memory together.
     output_path : str
         File path to save the report
     file_type : str
@@ -23,7 +25,10 @@ def export_report(data: Union[List[Dict[str, Any]], Dict[str, Any]],
     ValueError
         If inputs are invalid.
     """
-    if not isinstance(data, (list, dict)) or not data:
+    streamed = hasattr(data, "__next__")
+    if streamed and file_type != "json":
+        raise ValueError("Iterators can only be exported as JSON")
+    if not streamed and (not isinstance(data, (list, dict)) or not data):
         raise ValueError("Data must be a non-empty list or dict")
     if not isinstance(output_path, str) or not output_path.strip():
         raise ValueError("output_path must be a non-empty string")
@@ -34,7 +39,7 @@ def export_report(data: Union[List[Dict[str, Any]], Dict[str, Any]],
 
     if file_type == "json":
         with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+            write_json_stream(data, f, indent=4, default=None)
     elif file_type == "csv":
         if isinstance(data, dict):
             data = [data]
@@ -0,0 +1,125 @@
+import json
+import math
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def write_json_stream(data: Any, f: TextIO, indent: Optional[int] = None,
+                      default: Optional[Callable[[Any], Any]] = str,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """
+    Serialize ``data`` to an open text file piece by piece instead of building one string.
+
+    Dicts and lists are written element by element, generators and other
+    iterators are consumed lazily (so a batch report can yield one ticker's
+    payload at a time), and NumPy arrays / pandas Series are encoded
+    ``chunk_size`` values at a time with NaN written as ``null``. Peak memory
+    is bounded by the largest single element rather than the whole document.
+    For plain JSON data the output matches ``json.dump`` with the same indent.
+
+    Parameters
+    ----------
+    data : Any
+        Object to write; may contain generators, ndarrays and Series.
+    f : TextIO
+        Writable text file.
+    indent : int, optional
+        Same meaning as in ``json.dump``; None writes compact single-line JSON.
+    default : callable, optional
+        Fallback for objects JSON cannot encode (default ``str``).
+    chunk_size : int
+        Array elements encoded per write.
+
+    Raises
+    ------
+    ValueError
+        If chunk_size is not positive.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    for piece in iter_json(data, indent=indent, default=default, chunk_size=chunk_size):
+        f.write(piece)
+
+
+def iter_json(data: Any, indent: Optional[int] = None,
+              default: Optional[Callable[[Any], Any]] = str,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, _level: int = 0) -> Iterator[str]:
+    """Yield the JSON text of ``data`` in pieces; see ``write_json_stream``."""
+    if isinstance(data, pd.Series):
+        data = data.to_numpy()
+    if isinstance(data, np.ndarray) and data.ndim == 1:
+        yield from _iter_array(data, indent, default, _level, chunk_size)
+        return
+    if isinstance(data, np.generic):
+        data = data.item()
+
+    if isinstance(data, dict):
+        yield from _iter_container(
+            ((k, v) for k, v in data.items()), "{", "}", indent, default, chunk_size, _level, keyed=True
+        )
+    elif isinstance(data, (list, tuple, np.ndarray)) or _is_iterator(data):
+        yield from _iter_container(iter(data), "[", "]", indent, default, chunk_size, _level)
+    else:
+        yield json.dumps(data, default=default)
+
+
+# ------------------------------------------------
+# Helpers
+# ------------------------------------------------
+def _is_iterator(value) -> bool:
+    return hasattr(value, "__next__") and hasattr(value, "__iter__")
+
+
+def _separators(indent, level):
+    if indent is None:
+        return "", ", ", ""
+    pad = " " * indent
+    return "\n" + pad * (level + 1), ",\n" + pad * (level + 1), "\n" + pad * level
+
+
+def _iter_container(items, open_, close, indent, default, chunk_size, level, keyed=False):
+    first, between, last = _separators(indent, level)
+    yield open_
+    empty = True
+    for item in items:
+        yield first if empty else between
+        empty = False
+        if keyed:
+            key, item = item
+            yield (json.dumps(key) if isinstance(key, str) else json.dumps(str(_key(key)))) + ": "
+        yield from iter_json(item, indent, default, chunk_size, level + 1)
+    if not empty:
+        yield last
+    yield close
+
+
+def _key(key):
+    # Match json.dump's handling of non-string keys.
+    if isinstance(key, bool) or key is None:
+        return json.dumps(key)
+    if isinstance(key, float) and math.isfinite(key):
+        return repr(key)
+    return key
+
+
+def _iter_array(values: np.ndarray, indent, default, level, chunk_size):
+    first, between, last = _separators(indent, level)
+    yield "["
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        if chunk.dtype.kind == "f":
+            items = chunk.astype(object)
+            items[np.isnan(chunk)] = None
+            items = items.tolist()
+        else:
+            items = chunk.tolist()
+        yield (first if start == 0 else between) + between.join(
+            json.dumps(v, default=default) for v in items
+        )
+    if len(values):
+        yield last
+    yield "]"
@@ -2,9 +2,20 @@
 # Optionally re-export common classes:
 from .data_processor import DataProcessor
 from .stock_data_manager import StockDataManager
+from .async_stock_data_manager import AsyncStockDataManager
+from .stock_cache import StockCache
+from .price_memory_cache import PriceMemoryCache
+from .single_flight import SingleFlight
 from .stock_analyzer import StockAnalyzer
+from .panel_analyzer import PanelAnalyzer
+from .indicator_cache import IndicatorCache
+from .ohlcv_resampler import OHLCVResampler
+from .report_catalog import ReportCatalog
+from .blob_store import BlobStore
+from .state_persister import StatePersister
+from .streaming_indicators import IndicatorStream, StreamingSMA, StreamingEMA, StreamingRSI, StreamingRollingStats
 from .news_analyzer import NewsAnalyzer
 from .portfolio_manager import PortfolioManager
 from .user_query_builder import UserQueryBuilder
 
-__all__ = ["DataProcessor", "StockDataManager", "StockAnalyzer", "NewsAnalyzer", "PortfolioManager", "UserQueryBuilder"]
+__all__ = ["DataProcessor", "StockDataManager", "AsyncStockDataManager", "StockCache", "PriceMemoryCache", "SingleFlight", "StockAnalyzer", "PanelAnalyzer", "IndicatorCache", "OHLCVResampler", "ReportCatalog", "BlobStore", "StatePersister", "IndicatorStream", "StreamingSMA", "StreamingEMA", "StreamingRSI", "StreamingRollingStats", "NewsAnalyzer", "PortfolioManager", "UserQueryBuilder"]
@@ -0,0 +1,11 @@
+from .base_price_provider import BasePriceProvider
+from .yahoo_price_provider import YahooPriceProvider
+from .replay_price_provider import ReplayPriceProvider
+from .synthetic_price_provider import SyntheticPriceProvider
+
+# Maps the StockDataManager ``api`` name to its provider class.
+PRICE_PROVIDERS = {
+    "yahoo": YahooPriceProvider,
+    "replay": ReplayPriceProvider,
+    "synthetic": SyntheticPriceProvider,
+}
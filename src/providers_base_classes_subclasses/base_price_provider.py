@@ -0,0 +1,30 @@
+# base_price_provider.py
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+import pandas as pd
+
+
+class BasePriceProvider(ABC):
+    """
+    Abstract base class for every source of daily OHLCV bars.
+
+    Subclasses return one DataFrame per ticker with the columns
+    ['Date', 'Open', 'High', 'Low', 'Close', 'Volume'] and ``start <= Date < end``.
+    """
+
+    COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+
+    def __init__(self):
+        self.source = "Base Provider"
+
+    @abstractmethod
+    def fetch_data(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+        """
+        Return bars for every ticker in the half-open [start, end) date range.
+        Tickers without data map to an empty DataFrame.
+        """
+        pass
+
+    def __str__(self):
+        return f"{type(self).__name__}(source='{self.source}')"
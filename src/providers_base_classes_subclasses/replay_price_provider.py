@@ -0,0 +1,73 @@
+# replay_price_provider.py
+import os
+from typing import Dict, List
+
+import pandas as pd
+
+from .base_price_provider import BasePriceProvider
+
+
+class ReplayPriceProvider(BasePriceProvider):
+    """
+    Replays recorded OHLCV files from disk instead of calling a live API.
+
+    Each ticker is read from ``<data_dir>/<TICKER>.parquet`` or
+    ``<data_dir>/<TICKER>.csv`` (Parquet requires pyarrow or fastparquet).
+    Files are loaded once and then served from memory.
+    """
+
+    def __init__(self, data_dir: str = "data/replay"):
+        super().__init__()
+        if not os.path.isdir(data_dir):
+            raise FileNotFoundError(f"Replay folder not found: {data_dir}")
+        self.source = f"Replay files ({data_dir})"
+        self._data_dir = data_dir
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    @property
+    def data_dir(self):
+        return self._data_dir
+
+    def fetch_data(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+        start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+        frames = {}
+        for ticker in tickers:
+            history = self._load(ticker)
+            if history.empty:
+                frames[ticker] = pd.DataFrame()
+                continue
+            dates = history["Date"]
+            lo = dates.searchsorted(start_ts, side="left")
+            hi = dates.searchsorted(end_ts, side="left")
+            frames[ticker] = history.iloc[lo:hi].reset_index(drop=True)
+        return frames
+
+    def _load(self, ticker: str) -> pd.DataFrame:
+        key = ticker.upper()
+        if key in self._frames:
+            return self._frames[key]
+
+        parquet_path = os.path.join(self._data_dir, f"{key}.parquet")
+        csv_path = os.path.join(self._data_dir, f"{key}.csv")
+        if os.path.exists(parquet_path):
+            try:
+                frame = pd.read_parquet(parquet_path)
+            except ImportError as e:
+                raise ImportError("Reading Parquet replay files requires pyarrow: pip install pyarrow") from e
+        elif os.path.exists(csv_path):
+            frame = pd.read_csv(csv_path)
+        else:
+            frame = pd.DataFrame()
+
+        if not frame.empty:
+            if "Date" not in frame.columns:
+                frame = frame.reset_index()
+            missing = [c for c in self.COLUMNS if c not in frame.columns]
+            if missing:
+                raise ValueError(f"Replay file for {key} is missing columns: {missing}")
+            frame = frame[self.COLUMNS].copy()
+            frame["Date"] = pd.to_datetime(frame["Date"])
+            frame = frame.sort_values("Date").reset_index(drop=True)
+
+        self._frames[key] = frame
+        return frame
@@ -0,0 +1,67 @@
+# yahoo_price_provider.py
+from datetime import datetime
+from typing import Dict, List
+
+import pandas as pd
+import yfinance as yf
+
+from .base_price_provider import BasePriceProvider
+
+
+class YahooPriceProvider(BasePriceProvider):
+    """
+    Downloads daily bars from Yahoo Finance through yfinance.
+
+    A single ticker uses the plain ``yf.download`` call; several tickers are sent
+    as one grouped batch request.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.source = "Yahoo Finance"
+
+    def fetch_data(self, tickers: List[str], start: str, end: str) -> Dict[str, pd.DataFrame]:
+        if not tickers:
+            return {}
+
+        start_dt = datetime.strptime(start, "%Y-%m-%d")
+        end_dt = datetime.strptime(end, "%Y-%m-%d")
+
+        if len(tickers) == 1:
+            data = yf.download(tickers[0], start=start_dt, end=end_dt, progress=False)
+            return {tickers[0]: normalize_ohlcv(data)}
+
+        data = yf.download(
+            tickers, start=start_dt, end=end_dt,
+            group_by="ticker", progress=False, threads=True
+        )
+
+        frames = {}
+        for ticker in tickers:
+            if data is None or data.empty or not isinstance(data.columns, pd.MultiIndex):
+                frames[ticker] = pd.DataFrame()
+            elif ticker in data.columns.get_level_values(0):
+                frames[ticker] = normalize_ohlcv(data[ticker])
+            else:
+                frames[ticker] = pd.DataFrame()
+        return frames
+
+
+def normalize_ohlcv(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flatten a yfinance result into ['Date', 'Open', 'High', 'Low', 'Close', 'Volume'].
+
+    Newer yfinance versions return (field, ticker) MultiIndex columns even for a
+    single symbol, so the ticker level is dropped before selecting columns.
+    """
+    if data is None or data.empty:
+        return pd.DataFrame()
+
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = data.columns.get_level_values(0)
+
+    data = data.reset_index()
+    data = data.loc[:, ~data.columns.duplicated()]
+    data = data[BasePriceProvider.COLUMNS]
+    return data.dropna(subset=["Close"]).reset_index(drop=True)
@@ -2,6 +2,8 @@
 
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from pathlib import Path
@@ -9,11 +11,21 @@ from pathlib import Path
 import pandas as pd
 
 from src.classes.stock_data_manager import StockDataManager
+from src.classes.price_memory_cache import PriceMemoryCache
 from src.classes.stock_analyzer import StockAnalyzer
+from src.classes.indicator_cache import IndicatorCache
+from src.classes.ohlcv_resampler import OHLCVResampler
+from src.classes.report_catalog import ReportCatalog
+from src.classes.blob_store import BlobStore
 from src.classes.news_analyzer import NewsAnalyzer
 from src.classes.data_processor import DataProcessor
 from src.classes.portfolio_manager import PortfolioManager
 from src.classes.user_query_builder import UserQueryBuilder
+from src.Functions.analysis.indicator_kernels import to_float_array, to_optional_list
+from src.Functions.reporting.binary_report import (
+    BINARY_SUFFIX, dumps_binary_report, is_binary_report, read_binary_report, write_binary_report,
+)
+from src.Functions.reporting.stream_json import write_json_stream
 
 
 class SystemController:
@@ -22,14 +34,41 @@ class SystemController:
     analyzers, processors, and query builders.
     """
 
-    def __init__(self, portfolio_csv_path: Optional[str] = None, data_dir: str = "data"):
+    def __init__(self, portfolio_csv_path: Optional[str] = None, data_dir: str = "data",
+                 api: str = "yahoo", provider_options: Optional[dict] = None):
         self.data_dir = data_dir
         os.makedirs(self.data_dir, exist_ok=True)
         os.makedirs(os.path.join(self.data_dir, "analysis_reports"), exist_ok=True)
         os.makedirs(os.path.join(self.data_dir, "stock_cache"), exist_ok=True)
 
+        # Offline sources ('replay', 'synthetic') get their own cache folder so
+        # their bars never mix with real Yahoo data.
+        cache_dir = os.path.join(self.data_dir, "stock_cache")
+        if api.lower() != "yahoo":
+            cache_dir = os.path.join(cache_dir, api.lower())
+
         # Core components
-        self.data_manager = StockDataManager()
+        self.data_manager = StockDataManager(
+            api=api,
+            cache_dir=cache_dir,
+            memory_cache=PriceMemoryCache(ttl_seconds=300),
+            provider_options=provider_options,
+        )
+        # Indicator results keyed by bar fingerprint; spilled to disk so a
+        # repeated "Run Analysis" (or a CLI rerun) skips the computation.
+        self.indicator_cache = IndicatorCache(
+            spill_dir=os.path.join(self.data_dir, "indicator_cache")
+        )
+        # Weekly/monthly/quarterly aggregates, saved next to the daily bars.
+        self.resampler = OHLCVResampler(cache_dir=os.path.join(cache_dir, "resampled"))
+        # Index of exported reports (ticker, dates, indicators, hash) so
+        # reports can be searched without opening them (created on first export).
+        self.report_catalog = ReportCatalog(
+            os.path.join(self.data_dir, "analysis_reports", "catalog.sqlite3")
+        )
+        # Large arrays of deduplicated exports, stored once by content hash
+        # (folder created on the first deduplicated export).
+        self.blob_store = BlobStore(os.path.join(self.data_dir, "analysis_reports", "blobs"))
         self.data_processor = DataProcessor()
         self.news_analyzer = NewsAnalyzer()
         self.query_builder = UserQueryBuilder()
@@ -54,7 +93,20 @@ class SystemController:
     # =============================================================
     # STOCK TIME SERIES + INDICATORS
     # =============================================================
-    def get_stock_timeseries(self, ticker: str, start: str, end: str) -> Dict[str, Any]:
+    def get_stock_timeseries(self, ticker: str, start: str, end: str,
+                             indicators: Optional[List[str]] = None,
+                             interval: str = "D",
+                             max_points: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fetch prices and build the chart payload with SMA_20, RSI_14 and anomalies.
+
+        ``indicators`` optionally adds registry specs (e.g. ["EMA_12", "BBANDS_20_2",
+        "ATR_14"]) that are computed together and overlaid on the chart.
+        ``interval`` ("D", "W", "M" or "Q") resamples the daily bars first, so
+        indicators run on the coarse series. ``max_points`` downsamples the
+        chart (LTTB) while keeping every anomaly; ``indicators`` and
+        ``anomalies`` in the payload are remapped to the kept points.
+        """
 
         if not self.data_manager.validate_ticker(ticker):
             return {"error": f"Invalid ticker: {ticker}"}
@@ -84,31 +136,55 @@ class SystemController:
         except Exception:
             return {"error": "Close column contains invalid numerical values."}
 
+        if str(interval).upper() != "D":
+            try:
+                df = self.resampler.get(ticker, df, interval)
+            except ValueError as e:
+                return {"error": f"Invalid interval: {e}"}
+
         # Analyze indicators
-        analyzer = StockAnalyzer(ticker, df)
+        analyzer = StockAnalyzer(ticker, df, cache=self.indicator_cache)
         analyzer.calculate_sma(window=20)
         analyzer.calculate_rsi(window=14)
         anomalies = analyzer.detect_anomalies(threshold=0.07)
+        if indicators:
+            try:
+                analyzer.calculate_indicators(indicators)
+            except ValueError as e:
+                return {"error": f"Invalid indicator request: {e}"}
 
         close_data = df["Close"]
         if isinstance(close_data, pd.DataFrame):
             close_data = close_data.iloc[:, 0]
-        prices = close_data.tolist()
+        prices = close_data.to_numpy(dtype=float)
 
         date_data = df["Date"]
         if isinstance(date_data, pd.DataFrame):
             date_data = date_data.iloc[:, 0]
-        timestamps = date_data.astype(str).tolist()
+        timestamps = date_data.astype(str).to_numpy()
 
         payload = UserQueryBuilder.prepare_chart_payload(
             prices=prices,
             timestamps=timestamps,
             indicators=analyzer.indicators,
-            title=f"{ticker} Price Chart"
+            title=f"{ticker} Price Chart",
+            max_points=max_points,
+            keep_indices=anomalies,
         )
-
-        payload["indicators"] = analyzer.indicators
-        payload["anomalies"] = anomalies
+        payload["ticker"] = ticker.upper()
+
+        kept = payload.get("indices")
+        if kept is None:
+            payload["indicators"] = analyzer.indicators
+            payload["anomalies"] = anomalies
+        else:
+            # Downsampled: point positions changed, so remap series and anomaly indices.
+            position = {original: i for i, original in enumerate(kept)}
+            payload["indicators"] = {
+                name: to_optional_list(to_float_array(series)[kept])
+                for name, series in analyzer.indicators.items()
+            }
+            payload["anomalies"] = [position[i] for i in anomalies]
 
         return payload
 
@@ -141,13 +217,14 @@ class SystemController:
         portfolio = self.portfolio_manager.portfolio
         latest_prices = {}
 
+        frames = self.data_manager.fetch_many(
+            list(portfolio.keys()),
+            start="2024-01-01",
+            end=datetime.now().strftime("%Y-%m-%d")
+        )
         for ticker in portfolio.keys():
-            df = self.data_manager.fetch_stock_data(
-                ticker,
-                start="2024-01-01",
-                end=datetime.now().strftime("%Y-%m-%d")
-            )
-            price = df["Close"].iloc[-1] if not df.empty else None
+            df = frames.get(ticker)
+            price = df["Close"].iloc[-1] if df is not None and not df.empty else None
             latest_prices[ticker] = price
 
         return UserQueryBuilder.build_dashboard_summary(
@@ -169,25 +246,41 @@ class SystemController:
     # =============================================================
     # PERSISTENCE (Save/Load GUI State)
     # =============================================================
-    def save_state(self, state: dict, filename: str = "data/app_state.json") -> None:
+    def save_state(self, state: dict, filename: str = "data/app_state.json") -> bool:
+        """
+        Save GUI state; a ``.stkb`` filename selects the compact binary format.
+
+        The file is replaced atomically (temp file + rename), so an interrupted
+        save leaves the previous state intact, and an unchanged state is not
+        rewritten.
+
+        Returns:
+            bool: True if the state is on disk (written or already identical),
+            False if the write failed.
+        """
         path = Path(filename)
-        path.parent.mkdir(parents=True, exist_ok=True)
-
         try:
-            with path.open("w", encoding="utf-8") as f:
-                json.dump(state, f, indent=2)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.suffix == BINARY_SUFFIX:
+                content = dumps_binary_report(state)
+            else:
+                content = json.dumps(state, indent=2).encode("utf-8")
+            if not _same_content(str(path), content):
+                _atomic_write(str(path), content)
         except OSError as e:
             print(f"[WARNING] Failed to save state: {e}")
+            return False
+        return True
 
     def load_state(self, filename: str = "data/app_state.json") -> dict:
+        """Load GUI state saved as JSON or in the binary format (detected from the file)."""
         path = Path(filename)
         if not path.exists():
             return {}
 
         try:
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except (OSError, json.JSONDecodeError) as e:
+            return self._read_document(str(path))
+        except (OSError, ValueError, ImportError) as e:
             print(f"[WARNING] Failed to load state: {e}")
             return {}
 
@@ -208,17 +301,220 @@ class SystemController:
     # =============================================================
     # EXPORT ANALYSIS JSON
     # =============================================================
-    def export_analysis(self, payload: Dict[str, Any], filename: Optional[str] = None) -> str:
-        filename = filename or f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        out_path = os.path.join(self.data_dir, "analysis_reports", filename)
+    def export_analysis(self, payload: Dict[str, Any], filename: Optional[str] = None,
+                        compact: bool = False, dedupe: bool = False) -> str:
+        """
+        Write an analysis payload under data/analysis_reports and return its path.
+
+        ``compact=True`` (or a ``.stkb`` filename) writes the columnar binary
+        format instead of indented JSON; read either back with ``load_report``.
+        A compact export gets the ``.stkb`` suffix added when the filename has
+        none, and a different suffix (e.g. ``.json``) raises ValueError.
+        ``dedupe=True`` stores large arrays once in the content-addressed blob
+        store and writes only hash references into the report; an unchanged
+        re-export then writes nothing at all. Deduplicated reports must stay
+        inside data/analysis_reports (where ``prune_report_blobs`` looks for
+        references); any other location raises ValueError.
+        """
+        suffix = BINARY_SUFFIX if compact else ".json"
+        filename = filename or f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}"
+        if compact:
+            ext = os.path.splitext(filename)[1]
+            if not ext:
+                filename += BINARY_SUFFIX
+            elif ext != BINARY_SUFFIX:
+                raise ValueError(f"compact reports must use the {BINARY_SUFFIX} suffix, not {ext!r}")
+        out_path = self._report_path(filename, dedupe)
+        binary = compact or out_path.endswith(BINARY_SUFFIX)
+
+        if dedupe:
+            document = self.blob_store.dedupe(payload)
+            if binary:
+                content = dumps_binary_report(document, compression="none")
+            else:
+                content = json.dumps(document, indent=2, default=str).encode("utf-8")
+            if not _same_content(out_path, content):
+                _atomic_write(out_path, content)
+        elif binary:
+            write_binary_report(payload, out_path)
+        else:
+            with open(out_path, "w", encoding="utf-8") as f:
+                write_json_stream(payload, f, indent=2, default=str)
+
+        self._catalog_report(out_path, payload)
+        return out_path
 
+    def export_batch_analysis(self, tickers: List[str], start: str, end: str,
+                              filename: Optional[str] = None, dedupe: bool = False,
+                              **timeseries_options) -> str:
+        """
+        Analyze several tickers and stream them into one JSON report.
+
+        Each ticker's payload is built only when the writer reaches it and is
+        released before the next one, so memory stays at about one ticker's
+        payload however many tickers the report covers. Tickers that fail
+        appear with their ``{"error": ...}`` payload.
+
+        Args:
+            tickers (list[str]): Symbols to analyze.
+            start (str): Start date (YYYY-MM-DD).
+            end (str): End date (YYYY-MM-DD).
+            filename (str | None): Report name inside data/analysis_reports.
+            dedupe (bool): Store each ticker's arrays in the blob store (see ``export_analysis``).
+            **timeseries_options: Passed to ``get_stock_timeseries`` (indicators, interval, max_points).
+
+        Returns:
+            str: Path of the written report.
+
+        Raises:
+            ValueError: If ``dedupe`` is set and the report would be written outside data/analysis_reports.
+        """
+        filename = filename or f"batch_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        out_path = self._report_path(filename, dedupe)
+
+        indicator_names = set()
+
+        def results():
+            for t in tickers:
+                payload = self.get_stock_timeseries(t, start, end, **timeseries_options)
+                indicator_names.update(payload.get("indicators") or {})
+                yield {"ticker": t.upper(), "payload": self.blob_store.dedupe(payload) if dedupe else payload}
+
+        report = {"start": start, "end": end, "tickers": [t.upper() for t in tickers], "results": results()}
         with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, default=str)
+            write_json_stream(report, f, indent=2, default=str)
+
+        self._catalog_report(out_path, tickers=report["tickers"], start=start, end=end,
+                             indicators=indicator_names)
+        return out_path
 
+    def find_reports(self, **filters) -> List[Dict[str, Any]]:
+        """
+        Search exported reports through the catalog without opening them.
+
+        Accepts the filters of ``ReportCatalog.query`` (ticker, start, end,
+        indicator, created_after, created_before, content_hash, limit).
+        """
+        return self.report_catalog.query(**filters)
+
+    def rebuild_report_catalog(self) -> int:
+        """
+        Index every report in data/analysis_reports (e.g. files exported before the catalog existed).
+
+        Returns:
+            int: Number of reports indexed.
+        """
+        self.report_catalog.prune()
+        count = 0
+        for path in self._report_files():
+            try:
+                document = self._read_document(path)
+            except (OSError, ValueError, ImportError) as e:
+                print(f"[WARNING] Skipping unreadable report {path}: {e}")
+                continue
+            if isinstance(document, dict) and isinstance(document.get("results"), list):
+                self._catalog_report(
+                    path, tickers=document.get("tickers"), start=document.get("start"), end=document.get("end"),
+                    indicators={n for r in document["results"] for n in (r.get("payload") or {}).get("indicators") or {}},
+                )
+            else:
+                self._catalog_report(path, document)
+            count += 1
+        return count
+
+    def _catalog_report(self, path: str, payload: Optional[Dict[str, Any]] = None, **metadata) -> None:
+        try:
+            self.report_catalog.record(path, payload, **metadata)
+        except (OSError, sqlite3.Error) as e:
+            print(f"[WARNING] Failed to update report catalog for {path}: {e}")
+
+    def load_report(self, filename: str) -> Dict[str, Any]:
+        """
+        Read an exported analysis report in either format.
+
+        ``filename`` may be a path or a name inside data/analysis_reports.
+
+        Raises:
+            FileNotFoundError: If the report does not exist.
+            ValueError: If the file is neither JSON nor a binary report.
+        """
+        path = filename
+        if not os.path.exists(path):
+            path = os.path.join(self.data_dir, "analysis_reports", filename)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No analysis report at {filename}")
+        return self._read_document(path)
+
+    def prune_report_blobs(self, min_age_seconds: float = 300.0) -> int:
+        """
+        Delete blobs no report under data/analysis_reports refers to any more.
+
+        Blobs written or reused within ``min_age_seconds`` are kept, so an
+        export running at the same time never loses a blob it just referenced.
+
+        Returns:
+            int: Number of blobs removed.
+        """
+        referenced = set()
+        for path in self._report_files():
+            try:
+                referenced |= BlobStore.references(self._read_document(path, resolve=False))
+            except (OSError, ValueError, ImportError) as e:
+                print(f"[WARNING] Not pruning blobs: unreadable report {path}: {e}")
+                return 0
+        return self.blob_store.collect_garbage(referenced, min_age_seconds)
+
+    def _report_path(self, filename: str, dedupe: bool = False) -> str:
+        folder = os.path.join(self.data_dir, "analysis_reports")
+        out_path = os.path.join(folder, filename)
+        if dedupe:
+            root = os.path.realpath(folder)
+            if os.path.commonpath([root, os.path.realpath(out_path)]) != root:
+                raise ValueError(f"Deduplicated reports must be saved inside {folder}, not {out_path!r}")
         return out_path
 
+    def _report_files(self) -> List[str]:
+        """Every .json/.stkb report under data/analysis_reports, including subfolders (not blobs)."""
+        folder = os.path.join(self.data_dir, "analysis_reports")
+        blobs = os.path.realpath(self.blob_store.root)
+        found = []
+        for current, dirs, files in os.walk(folder):
+            dirs[:] = sorted(d for d in dirs if os.path.realpath(os.path.join(current, d)) != blobs)
+            found.extend(
+                os.path.join(current, name) for name in sorted(files)
+                if name.endswith((".json", BINARY_SUFFIX))
+            )
+        return found
+
+    def _read_document(self, path: str, resolve: bool = True) -> Any:
+        if is_binary_report(path):
+            document = read_binary_report(path)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                document = json.load(f)
+        return self.blob_store.resolve(document) if resolve else document
+
     def __str__(self):
         return "<SystemController: integrated app layer>"
 
 
-
+def _same_content(path: str, content: bytes) -> bool:
+    """True if ``path`` already holds exactly ``content`` (so rewriting it can be skipped)."""
+    if not os.path.exists(path) or os.path.getsize(path) != len(content):
+        return False
+    with open(path, "rb") as f:
+        return f.read() == content
+
+
+def _atomic_write(path: str, content: bytes) -> None:
+    """Write to a temp file in the same folder, fsync it, then rename it over ``path``."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
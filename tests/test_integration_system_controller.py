@@ -1,7 +1,10 @@
+import json
+import os
 from unittest.mock import MagicMock, patch
 import pandas as pd
 import pytest
 
+from src.Functions.reporting.binary_report import dumps_binary_report, loads_binary_report
 from system.system_controller import SystemController
 
 
@@ -68,3 +71,171 @@ def test_export_analysis_creates_file(tmp_path):
 
     assert "analysis_reports" in out
     assert (tmp_path / "analysis_reports" / "test.json").exists()
+
+
+def test_compact_report_and_state_round_trip(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    dates = [f"2020-01-{d:02d}" for d in range(1, 32)]
+    payload = {
+        "title": "AAPL Price Chart",
+        "labels": dates,
+        "datasets": [{"label": "Price", "data": [100.0 + i / 3 for i in range(31)], "type": "line"}],
+        "indicators": {"SMA_20": [None] * 19 + [101.25] * 12},
+        "anomalies": [3, 17],
+    }
+
+    json_path = sc.export_analysis(payload, "report.json")
+    compact_path = sc.export_analysis(payload, compact=True)
+
+    assert compact_path.endswith(".stkb")
+    assert os.path.getsize(compact_path) < os.path.getsize(json_path) / 2
+    assert sc.load_report(compact_path) == payload
+    assert sc.load_report("report.json") == payload
+
+    state_file = str(tmp_path / "app_state.stkb")
+    sc.save_state({"last_payload": payload}, state_file)
+    assert sc.load_state(state_file) == {"last_payload": payload}
+
+
+def test_binary_round_trip_keeps_dicts_that_look_like_columns():
+    document = {
+        "marker": {"__column__": 0},
+        "tilde": {"~__column__": 5, "~x": 1, "__column__": "text"},
+        "~": [{"__column__": 3}],
+        "prices": [float(i) for i in range(40)],
+    }
+    for compression in ("none", "gzip"):
+        assert loads_binary_report(dumps_binary_report(document, compression=compression)) == document
+
+
+def test_streamed_exports_match_json_dump(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    payload = {"title": "T", "labels": ["2020-01-01", "2020-01-02"], "meta": {"min": 1.0, "avg": None}, "x": []}
+    with open(sc.export_analysis(payload, "plain.json"), encoding="utf-8") as f:
+        assert f.read() == json.dumps(payload, indent=2)
+
+    frames = {
+        t: pd.DataFrame({"Date": pd.bdate_range("2020-01-01", periods=60),
+                         "Close": [100.0 + i + (5 * k) for i in range(60)]})
+        for k, t in enumerate(["AAPL", "MSFT"])
+    }
+    sc.data_manager = MagicMock()
+    sc.data_manager.validate_ticker.side_effect = lambda t: t != "BAD"
+    sc.data_manager.fetch_stock_data.side_effect = lambda t, s, e: frames[t]
+
+    path = sc.export_batch_analysis(["AAPL", "MSFT", "BAD"], "2020-01-01", "2020-04-01")
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+
+    assert report["tickers"] == ["AAPL", "MSFT", "BAD"]
+    assert [r["ticker"] for r in report["results"]] == ["AAPL", "MSFT", "BAD"]
+    assert len(report["results"][1]["payload"]["labels"]) == 60
+    assert "error" in report["results"][2]["payload"]
+
+
+def test_report_catalog_indexes_exports(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    aapl = {"ticker": "AAPL", "labels": ["2025-11-03", "2025-11-28"], "indicators": {"SMA_20": [], "RSI_14": []}}
+    msft = {"title": "MSFT Price Chart", "labels": ["2024-01-02T00:00:00", "2024-03-28T00:00:00"],
+            "datasets": [{"label": "Price"}, {"label": "EMA_12"}]}
+    aapl_path = sc.export_analysis(aapl, "aapl.json")
+    sc.export_analysis(msft, compact=True)
+
+    [entry] = sc.find_reports(ticker="aapl")
+    assert entry["path"] == os.path.abspath(aapl_path)
+    assert (entry["start_date"], entry["end_date"]) == ("2025-11-03", "2025-11-28")
+    assert entry["indicators"] == ["RSI_14", "SMA_20"]
+    assert entry["size_bytes"] == os.path.getsize(aapl_path)
+
+    assert [e["tickers"] for e in sc.find_reports(indicator="EMA_12")] == [["MSFT"]]
+    assert [e["tickers"] for e in sc.find_reports(start="2025-01-01")] == [["AAPL"]]
+    assert len(sc.find_reports(end="2025-01-01")) == 1
+    assert sc.find_reports(created_before="2000-01-01") == []
+
+    # Re-exporting the same name refreshes the entry; rebuild indexes the folder from scratch.
+    sc.export_analysis({**aapl, "ticker": "NVDA"}, "aapl.json")
+    assert sc.find_reports(ticker="AAPL") == [] and len(sc.find_reports(ticker="NVDA")) == 1
+    os.remove(sc.report_catalog.db_path)
+    rebuilt = SystemController(data_dir=str(tmp_path))
+    assert rebuilt.rebuild_report_catalog() == 2
+    assert {t for e in rebuilt.find_reports() for t in e["tickers"]} == {"NVDA", "MSFT"}
+
+
+def test_report_stores_are_created_on_first_export(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    reports = tmp_path / "analysis_reports"
+    assert sc.find_reports() == [] and len(sc.report_catalog) == 0
+    assert not (reports / "catalog.sqlite3").exists()
+    assert not (reports / "blobs").exists()
+    assert not (tmp_path / "indicator_cache").exists()
+
+    sc.export_analysis({"ticker": "AAPL", "labels": ["2025-01-02"]}, "a.json")
+    assert (reports / "catalog.sqlite3").exists() and not (reports / "blobs").exists()
+    sc.export_analysis({"ticker": "AAPL", "labels": ["2025-01-02"] * 300}, "b.json", dedupe=True)
+    assert (reports / "blobs").is_dir()
+
+
+def test_deduplicated_exports_share_blobs(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    labels = [str(d.date()) for d in pd.bdate_range("2020-01-01", periods=400)]
+    prices = [100.0 + i * 0.25 for i in range(400)]
+    sma = [None] * 19 + prices[19:]
+    payload = {"ticker": "AAPL", "labels": labels, "datasets": [{"label": "Price", "data": prices}],
+               "indicators": {"SMA_20": sma}, "anomalies": [3]}
+
+    first = sc.export_analysis(payload, "first.json", dedupe=True)
+    assert sc.blob_store.stats()["written"] == 3  # labels, prices, SMA
+    mtime = os.path.getmtime(first)
+
+    # Same series under another name and a plain rerun: no new blobs, no rewrite.
+    sc.export_analysis({**payload, "title": "Copy"}, "second.stkb", dedupe=True)
+    sc.export_analysis(payload, "first.json", dedupe=True)
+    assert sc.blob_store.stats() == {"written": 3, "reused": 6, "blobs": 3}
+    assert os.path.getmtime(first) == mtime
+    assert os.path.getsize(first) < 1024
+
+    assert sc.load_report("first.json") == payload
+    assert sc.load_report("second.stkb")["datasets"][0]["data"] == prices
+    assert sc.find_reports(ticker="AAPL", indicator="SMA_20")
+
+    os.remove(first)
+    assert sc.prune_report_blobs(min_age_seconds=0) == 0
+    os.remove(tmp_path / "analysis_reports" / "second.stkb")
+    assert sc.prune_report_blobs() == 0  # just written/reused: may belong to an export in flight
+    assert sc.prune_report_blobs(min_age_seconds=0) == 3
+
+
+def test_blob_pruning_sees_every_deduplicated_report(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    payload = {"ticker": "AAPL", "labels": [f"d{i}" for i in range(300)]}
+    with pytest.raises(ValueError, match="inside"):
+        sc.export_analysis(payload, str(tmp_path / "elsewhere.json"), dedupe=True)
+    with pytest.raises(ValueError, match="inside"):
+        sc.export_analysis(payload, os.path.join("..", "escape.json"), dedupe=True)
+    assert sc.export_analysis(payload, str(tmp_path / "plain.json")) == str(tmp_path / "plain.json")
+
+    os.makedirs(tmp_path / "analysis_reports" / "2025")
+    nested = sc.export_analysis(payload, os.path.join("2025", "aapl.json"), dedupe=True)
+    assert sc.prune_report_blobs(min_age_seconds=0) == 0
+    assert sc.load_report(nested) == payload
+
+
+def test_corrupt_binary_state_falls_back_cleanly(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    state_file = tmp_path / "app_state.stkb"
+    sc.save_state({"last_payload": {"labels": [f"2020-01-{d:02d}" for d in range(1, 29)]}}, str(state_file))
+    blob = state_file.read_bytes()
+
+    garbled = blob[:20] + bytes([blob[20] ^ 0xFF]) + blob[21:]
+    for broken in (blob[: len(blob) // 2], blob[:7], garbled):
+        state_file.write_bytes(broken)
+        assert sc.load_state(str(state_file)) == {}
+        with pytest.raises(ValueError):
+            sc.load_report(str(state_file))
+
+
+def test_compact_export_requires_binary_suffix(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        sc.export_analysis({"x": 1}, "report.json", compact=True)
+    assert sc.export_analysis({"x": 1}, "report", compact=True).endswith("report.stkb")
@@ -0,0 +1,181 @@
+import math
+import random
+import statistics
+
+import pandas as pd
+import pytest
+
+from src.Functions.analysis.calc_technical_indicators import calculate_technical_indicators
+from src.Functions.analysis.price_anomaly_detect import (
+    detect_price_anomalies,
+    detect_price_anomalies_batch,
+)
+from src.Functions.analysis.simple_moving_avg import simple_moving_average
+from src.classes.stock_analyzer import StockAnalyzer
+
+
+def reference_anomalies(prices, window=20, z_threshold=3.0, min_window_non_null=None):
+    """Original per-index statistics.pstdev implementation, kept as the oracle."""
+    if min_window_non_null is None:
+        min_window_non_null = math.ceil(window * 0.5)
+    n = len(prices)
+    returns = [None] * n
+    for i in range(1, n):
+        try:
+            returns[i] = math.log(prices[i] / prices[i - 1])
+        except (TypeError, ValueError, ZeroDivisionError):
+            returns[i] = None
+    alerts = []
+    for i in range(1, n):
+        window_vals = [r for r in returns[max(1, i - window):i] if r is not None]
+        if len(window_vals) < min_window_non_null or returns[i] is None:
+            continue
+        mean_w = statistics.mean(window_vals)
+        std_w = statistics.pstdev(window_vals)
+        z = (returns[i] - mean_w) / std_w if std_w != 0 else float("inf")
+        if abs(z) > z_threshold:
+            alerts.append({"index": i, "timestamp": None, "price": prices[i],
+                           "z_score": round(z, 4), "reason": "High volatility detected"})
+    return alerts
+
+
+def random_prices(rng, n):
+    price, out = 100.0, []
+    for _ in range(n):
+        if rng.random() > 0.2:
+            price *= math.exp(rng.gauss(0, 0.02) + (rng.gauss(0, 0.2) if rng.random() < 0.03 else 0))
+        roll = rng.random()
+        out.append(None if roll < 0.05 else (0.0 if roll < 0.07 else round(price, 2)))
+    return out
+
+
+# ---------------------------
+# Rolling z-score anomalies (UNIT)
+# ---------------------------
+
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_anomalies_match_reference(seed):
+    rng = random.Random(seed)
+    prices = random_prices(rng, rng.randint(2, 250))
+    window = rng.choice([2, 5, 20])
+
+    expected = reference_anomalies(prices, window=window, z_threshold=2.0)
+    assert detect_price_anomalies(prices, window=window, z_threshold=2.0) == expected
+
+
+def test_constant_window_gives_infinite_z():
+    # A flat window has zero deviation, so every bar after it is flagged with
+    # an infinite z-score, exactly like the statistics.pstdev version.
+    prices = [100.0] * 10 + [105.0]
+    alerts = detect_price_anomalies(prices, window=5)
+    assert alerts == reference_anomalies(prices, window=5)
+    assert alerts[-1]["index"] == 10
+    assert alerts[-1]["z_score"] == float("inf")
+
+
+def test_batch_matches_single_series():
+    rng = random.Random(42)
+    series = {f"T{i}": random_prices(rng, rng.randint(30, 120)) for i in range(6)}
+
+    batch = detect_price_anomalies_batch(series, window=10, z_threshold=2.0)
+    assert batch == {t: detect_price_anomalies(p, window=10, z_threshold=2.0) for t, p in series.items()}
+
+
+def test_invalid_inputs_still_raise():
+    with pytest.raises(ValueError):
+        detect_price_anomalies([1.0])
+    with pytest.raises(ValueError):
+        detect_price_anomalies_batch({"A": [1.0, 2.0]}, window=1)
+
+
+
+# ---------------------------
+# Unified indicator kernels (UNIT)
+# ---------------------------
+
+def reference_running_sma(values, window):
+    """Original simple_moving_avg.py loop."""
+    out, running_sum = [None] * len(values), 0.0
+    for i, v in enumerate(values):
+        running_sum += float(v)
+        if i >= window:
+            running_sum -= float(values[i - window])
+        if i >= window - 1:
+            out[i] = running_sum / window
+    return out
+
+
+def reference_technical_indicators(prices, window):
+    """Original calc_technical_indicators.py loops (direct window sums, inf rs on zero loss)."""
+    n = len(prices)
+    sma = [None if i + 1 < window else sum(prices[i + 1 - window:i + 1]) / window for i in range(n)]
+    gains, losses = [0.0], [0.0]
+    for i in range(1, n):
+        change = prices[i] - prices[i - 1]
+        gains.append(max(change, 0))
+        losses.append(max(-change, 0))
+    rsi = []
+    for i in range(n):
+        if i + 1 < window:
+            rsi.append(None)
+            continue
+        avg_gain = sum(gains[i + 1 - window:i + 1]) / window
+        avg_loss = sum(losses[i + 1 - window:i + 1]) / window
+        rs = avg_gain / avg_loss if avg_loss != 0 else math.inf
+        rsi.append(100 - (100 / (1 + rs)))
+    return {"SMA": sma, "RSI": rsi}
+
+
+def random_walk(rng, n):
+    """Prices with occasional flat stretches so zero-loss/zero-gain windows occur."""
+    price, out = 100.0, []
+    for _ in range(n):
+        if rng.random() > 0.3:
+            price = max(1.0, price + rng.gauss(0, 1))
+        out.append(rng.choice([round(price, 2), int(price)]) if rng.random() < 0.1 else round(price, 2))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_all_sma_and_rsi_callers_agree_with_original_loops(seed):
+    rng = random.Random(seed)
+    prices = random_walk(rng, rng.randint(2, 300))
+    window = rng.randint(2, min(30, len(prices)))
+
+    assert simple_moving_average(prices, window) == reference_running_sma(prices, window)
+
+    expected = reference_technical_indicators(prices, window)
+    result = calculate_technical_indicators(prices, window)
+    assert result["SMA"] == pytest.approx(expected["SMA"], rel=1e-9, abs=1e-9)
+    assert result["RSI"] == pytest.approx(expected["RSI"], rel=1e-9, abs=1e-9)
+
+    analyzer = StockAnalyzer("test", pd.DataFrame({"Close": prices}))
+    assert analyzer.calculate_sma(window) == simple_moving_average(prices, window)
+    assert analyzer.calculate_rsi(window) == result["RSI"]
+
+
+def test_kernel_callers_keep_their_validation():
+    with pytest.raises(TypeError):
+        simple_moving_average((1, 2, 3), 2)
+    with pytest.raises(TypeError):
+        simple_moving_average([1, None, 3], 2)
+    with pytest.raises(ValueError):
+        calculate_technical_indicators([1.0, 2.0], window=3)
+    assert simple_moving_average([1.0, float("nan"), 3.0, 4.0], 2)[1:] == pytest.approx(
+        reference_running_sma([1.0, float("nan"), 3.0, 4.0], 2)[1:], nan_ok=True)
+
+
+@pytest.mark.parametrize("prices", [
+    [1.0, float("nan"), 3.0, 4.0, 5.0],
+    [float("nan"), 2.0, 3.0, 2.5, 4.0, 5.0],
+    [1.0, 2.0, 1.5, 3.0, 4.0, float("nan")],
+    [5.0, 4.0, float("nan"), float("nan"), 3.0, 2.0, 4.0, 6.0, 5.0],
+])
+@pytest.mark.parametrize("window", [2, 3])
+def test_technical_indicators_keep_nan_windows(prices, window):
+    expected = reference_technical_indicators(prices, window)
+    result = calculate_technical_indicators(prices, window)
+    for key in ("SMA", "RSI"):
+        assert [v is None for v in result[key]] == [v is None for v in expected[key]]
+        assert [v for v in result[key] if v is not None] == pytest.approx(
+            [v for v in expected[key] if v is not None], nan_ok=True)
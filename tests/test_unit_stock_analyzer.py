@@ -0,0 +1,390 @@
+import json
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.Functions.analysis import indicator_registry as registry_module
+from src.Functions.analysis.indicator_registry import parse_indicator_spec
+from src.Functions.analysis.price_anomaly_detect import detect_price_anomalies
+from src.classes.indicator_cache import IndicatorCache
+from src.classes.panel_analyzer import PanelAnalyzer
+from src.classes.stock_analyzer import StockAnalyzer
+from src.classes.streaming_indicators import IndicatorStream, StreamingIndicator
+
+
+def make_analyzer(closes):
+    return StockAnalyzer("aapl", pd.DataFrame({"Close": closes}))
+
+
+# ---------------------------
+# Vectorized indicators (UNIT)
+# ---------------------------
+
+def test_sma_matches_running_sum_definition():
+    analyzer = make_analyzer([1.0, 2.0, 3.0, 4.0, 5.0])
+    assert analyzer.calculate_sma(window=3) == [None, None, 2.0, 3.0, 4.0]
+    assert analyzer.indicators["SMA_3"] == [None, None, 2.0, 3.0, 4.0]
+
+
+def test_sma_skips_missing_values_like_original_loop():
+    analyzer = make_analyzer([1.0, None, 3.0, 4.0, "bad", 6.0])
+    # Missing entries add nothing to the running sum, stay None, and are never
+    # subtracted when they leave the window.
+    assert analyzer.calculate_sma(window=2) == [None, None, 1.5, 3.5, None, 4.5]
+
+
+def test_rsi_flat_gains_and_losses():
+    analyzer = make_analyzer([1.0, 2.0, 3.0, 2.0, 1.0])
+    rsi = analyzer.calculate_rsi(window=2)
+    assert rsi == [None, 100.0, 100.0, 50.0, 0.0]
+
+
+def test_rsi_mixed_window():
+    analyzer = make_analyzer([10.0, 11.0, 10.5, 11.5])
+    rsi = analyzer.calculate_rsi(window=3)
+    # gains [0, 1, 0, 1], losses [0, 0, 0.5, 0]
+    assert rsi[:2] == [None, None]
+    assert rsi[2] == pytest.approx(100 - 100 / (1 + 1.0 / 0.5))
+    assert rsi[3] == pytest.approx(100 - 100 / (1 + 2.0 / 0.5))
+
+
+def test_detect_anomalies_returns_indices():
+    analyzer = make_analyzer([100.0, 110.0, 111.0, 0.0, 50.0, None, 80.0])
+    assert analyzer.detect_anomalies(threshold=0.05) == [1, 3]
+
+
+def test_long_history_is_vectorized():
+    closes = 100 + np.cumsum(np.random.default_rng(0).normal(size=200_000))
+    analyzer = make_analyzer(closes)
+    sma = analyzer.calculate_sma(window=50)
+    rsi = analyzer.calculate_rsi(window=14)
+    assert len(sma) == len(rsi) == 200_000
+    assert sma[-1] == pytest.approx(closes[-50:].mean())
+
+
+def test_sweeps_match_single_window_calls():
+    closes = 100 + np.cumsum(np.random.default_rng(3).normal(size=2_000))
+    analyzer = make_analyzer(closes)
+    windows = list(range(5, 201))
+
+    sma = analyzer.sweep_sma(windows)
+    rsi = analyzer.sweep_rsi([7, 14, 21])
+    assert sma.shape == (len(windows), 2_000)
+    assert rsi.shape == (3, 2_000)
+    for row, w in zip(sma[::15], windows[::15]):
+        expected = np.array(analyzer.calculate_sma(w), dtype=float)
+        np.testing.assert_allclose(row, expected, rtol=1e-12, equal_nan=True)
+    for row, w in zip(rsi, [7, 14, 21]):
+        np.testing.assert_array_equal(row, np.array(analyzer.calculate_rsi(w), dtype=float))
+
+
+def test_sma_sweep_keeps_missing_value_semantics():
+    analyzer = make_analyzer([1.0, None, 3.0, 4.0, "bad", 6.0])
+    sweep = analyzer.sweep_sma([2, 10])
+    assert [None if np.isnan(v) else v for v in sweep[0]] == analyzer.calculate_sma(2)
+    assert np.isnan(sweep[1]).all()
+    with pytest.raises(ValueError):
+        analyzer.sweep_rsi([])
+
+
+# ---------------------------
+# Streaming indicators (UNIT)
+# ---------------------------
+
+def test_stream_matches_batch_indicators_and_restores_state():
+    closes = list(100 + np.cumsum(np.random.default_rng(1).normal(size=300)))
+    history, live = closes[:250], closes[250:]
+
+    stream = make_analyzer(history).to_stream(
+        sma_windows=(20,), rsi_windows=(14,), ema_spans=(12,), stats_windows=(20,)
+    )
+    restored = IndicatorStream.from_state(json.loads(json.dumps(stream.to_state())))
+    for close in live:
+        latest = restored.update(close)
+
+    full = make_analyzer(closes)
+    assert latest["SMA_20"] == full.calculate_sma(20)[-1]
+    assert latest["RSI_14"] == pytest.approx(full.calculate_rsi(14)[-1])
+    assert latest["EMA_12"] == pytest.approx(
+        pd.Series(closes).ewm(span=12, adjust=False).mean().iloc[-1])
+    stats = restored.indicators["STATS_20"]
+    assert stats.value == pytest.approx(np.mean(closes[-20:]))
+    assert stats.std == pytest.approx(np.std(closes[-20:]))
+
+
+def test_incomplete_streaming_indicator_cannot_be_created():
+    class NoState(StreamingIndicator):
+        kind = "nostate"
+
+        def update(self, value):
+            return value
+
+    with pytest.raises(TypeError):
+        NoState()
+    with pytest.raises(TypeError):
+        StreamingIndicator()
+
+
+# ---------------------------
+# Panel analyzer (UNIT)
+# ---------------------------
+
+def test_panel_rows_match_single_ticker_analyzer():
+    rng = np.random.default_rng(2)
+    dates = pd.bdate_range("2024-01-01", periods=120)
+    closes = {t: 100 + np.cumsum(rng.normal(size=120)) for t in ("AAPL", "MSFT", "NVDA")}
+    frames = {t: pd.DataFrame({"Date": dates, "Close": c}) for t, c in closes.items()}
+
+    panel = PanelAnalyzer.from_frames(frames)
+    result = panel.analyze(sma_window=10, rsi_window=14, threshold=0.01)
+    assert result["SMA_10"].shape == (3, 120)
+    assert panel.tickers == ["AAPL", "MSFT", "NVDA"]
+
+    for i, ticker in enumerate(panel.tickers):
+        single = make_analyzer(closes[ticker])
+        assert [None if np.isnan(v) else v for v in result["SMA_10"][i]] == single.calculate_sma(10)
+        np.testing.assert_allclose(
+            result["RSI_14"][i], np.array(single.calculate_rsi(14), dtype=float), equal_nan=True)
+        assert panel.anomaly_indices(ticker) == single.detect_anomalies(threshold=0.01)
+    np.testing.assert_allclose(result["RETURNS"][0, 1:], np.diff(closes["AAPL"]) / closes["AAPL"][:-1])
+
+
+def test_panel_analyze_uses_the_same_default_threshold():
+    closes = [100.0, 106.0, 106.0, 100.0, 101.0]  # 6% moves: flagged at 0.05, not at 0.07
+    panel = PanelAnalyzer.from_frames({"AAA": pd.DataFrame({"Date": pd.bdate_range("2024-01-01", periods=5),
+                                                            "Close": closes})})
+    flags = panel.analyze()["ANOMALY"]
+    assert np.array_equal(flags, panel.detect_anomalies())
+    assert panel.anomaly_indices("AAA") == make_analyzer(closes).detect_anomalies() == [1, 3]
+
+
+def test_panel_aligns_dates_and_exposes_frames():
+    frames = {
+        "AAA": pd.DataFrame({"Date": pd.to_datetime(["2024-01-02", "2024-01-03"]), "Close": [1.0, 2.0]}),
+        "BBB": pd.DataFrame({"Date": pd.to_datetime(["2024-01-03", "2024-01-04"]), "Close": [5.0, 6.0]}),
+        "EMPTY": pd.DataFrame(),
+    }
+    panel = PanelAnalyzer.from_frames(frames)
+    assert panel.closes.shape == (2, 3)
+    assert not panel.closes.flags.writeable
+    assert np.isnan(panel.closes[1, 0]) and np.isnan(panel.closes[0, 2])
+
+    panel.calculate_returns()
+    returns = panel.to_frame("RETURNS")
+    assert list(returns.columns) == ["AAA", "BBB"]
+    assert returns.loc["2024-01-03", "AAA"] == pytest.approx(1.0)
+    assert np.isnan(returns.loc["2024-01-03", "BBB"])
+
+    with pytest.raises(ValueError):
+        PanelAnalyzer(["A"], pd.bdate_range("2024-01-01", periods=2), np.ones((2, 2)))
+
+    # The caller's float64 array is used without copying but must stay writable.
+    closes = np.ones((1, 3))
+    panel = PanelAnalyzer(["A"], pd.bdate_range("2024-01-01", periods=3), closes)
+    closes[0, 0] = 2.0
+    assert closes.flags.writeable and not panel.closes.flags.writeable
+
+
+# ---------------------------
+# Indicator registry (UNIT)
+# ---------------------------
+
+def make_ohlcv(n=300, seed=4):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(size=n))
+    spread = rng.uniform(0.1, 2.0, size=n)
+    return pd.DataFrame({
+        "Open": close + rng.normal(scale=0.5, size=n),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000, 10_000, size=n).astype(float),
+    })
+
+
+def test_registry_indicators_match_pandas_definitions():
+    df = make_ohlcv()
+    analyzer = StockAnalyzer("aapl", df)
+    out = analyzer.calculate_indicators(["EMA_12", "MACD_12_26_9", "BBANDS_20_2", "ATR_14", "VWAP", "OBV"])
+
+    close = df["Close"]
+    ema12 = close.ewm(span=12, adjust=False).mean()
+    macd = ema12 - close.ewm(span=26, adjust=False).mean()
+    assert out["EMA_12"] == pytest.approx(ema12.tolist())
+    assert out["MACD_12_26_9"] == pytest.approx(macd.tolist())
+    assert out["MACD_SIGNAL_12_26_9"] == pytest.approx(macd.ewm(span=9, adjust=False).mean().tolist())
+
+    upper = close.rolling(20).mean() + 2 * close.rolling(20).std(ddof=0)
+    np.testing.assert_allclose(np.array(out["BB_UPPER_20_2"], dtype=float), upper, equal_nan=True)
+
+    prev = close.shift()
+    tr = pd.concat([df["High"] - df["Low"], (df["High"] - prev).abs(), (df["Low"] - prev).abs()], axis=1).max(axis=1)
+    atr = tr.ewm(alpha=1 / 14, adjust=False).mean()
+    assert out["ATR_14"][:13] == [None] * 13
+    assert out["ATR_14"][13:] == pytest.approx(atr[13:].tolist())
+
+    typical = (df["High"] + df["Low"] + close) / 3
+    vwap = (typical * df["Volume"]).cumsum() / df["Volume"].cumsum()
+    assert out["VWAP"] == pytest.approx(vwap.tolist())
+    obv = (np.sign(close.diff()).fillna(0) * df["Volume"]).cumsum()
+    assert out["OBV"] == pytest.approx(obv.tolist())
+
+    # Every output is stored for chart overlay at full length.
+    assert all(len(analyzer.indicators[name]) == len(df) for name in out)
+
+
+def test_registry_rejects_bad_specs_and_missing_columns():
+    analyzer = make_analyzer([1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        analyzer.calculate_indicators(["NOPE_3"])
+    with pytest.raises(ValueError):
+        analyzer.calculate_indicators(["EMA_3_4"])
+    with pytest.raises(ValueError):
+        analyzer.calculate_indicators(["ATR_2"])
+    for spec in ("SMA_2.5", "RSI_0", "EMA_1e3", "MACD_12_26_9.5", "BBANDS_20_-2", "BBANDS_20_nan"):
+        with pytest.raises(ValueError):
+            parse_indicator_spec(spec)
+    assert parse_indicator_spec("BBANDS_20_1.5") == ("BBANDS", (20, 1.5))
+    assert analyzer.calculate_indicators(["SMA_2"]) == {"SMA_2": [None, 1.5, 2.5]}
+
+
+# ---------------------------
+# Lazy derived-series graph (UNIT)
+# ---------------------------
+
+def test_context_computes_shared_nodes_once():
+    registry = "src.Functions.analysis.indicator_registry"
+    with patch(f"{registry}.gain_loss_prefix_sums", wraps=registry_module.gain_loss_prefix_sums) as prefixes, \
+         patch(f"{registry}.log_returns", wraps=registry_module.log_returns) as returns:
+        analyzer = StockAnalyzer("aapl", make_ohlcv(200))
+        analyzer.calculate_indicators(["RSI_14", "RSI_28", "ZSCORE_20"])
+        analyzer.calculate_rsi(7)
+        analyzer.calculate_indicators(["VOLATILITY_20"])
+
+    assert prefixes.call_count == 1
+    assert returns.call_count == 1
+
+    z = np.array(analyzer.indicators["ZSCORE_20"], dtype=float)
+    alerts = detect_price_anomalies(analyzer.data["Close"].tolist(), window=20, z_threshold=2.0)
+    assert [a["index"] for a in alerts] == np.flatnonzero(np.abs(z) > 2.0).tolist()
+
+
+def test_append_data_invalidates_and_refreshes_indicators():
+    df = make_ohlcv(120)
+    analyzer = StockAnalyzer("aapl", df.iloc[:100])
+    analyzer.calculate_sma(10)
+    analyzer.calculate_indicators(["EMA_12"])
+    old_context = analyzer.context
+
+    analyzer.append_data(df.iloc[100:])
+    assert analyzer.context is not old_context
+    full = StockAnalyzer("aapl", df)
+    assert analyzer.indicators["SMA_10"] == full.calculate_sma(10)
+    assert analyzer.indicators["EMA_12"] == pytest.approx(full.calculate_indicators(["EMA_12"])["EMA_12"])
+    assert len(analyzer.data) == 120
+
+
+# ---------------------------
+# Zero-copy mode (UNIT)
+# ---------------------------
+
+def to_list(values):
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def test_zero_copy_mode_never_writes_to_caller_frame():
+    df = make_ohlcv(200)
+    before = df.copy()
+    analyzer = StockAnalyzer("aapl", df, copy=False)
+
+    sma = analyzer.calculate_sma(20)
+    out = analyzer.calculate_indicators(["EMA_12", "BBANDS_20_2"])
+    analyzer.calculate_rsi(14)
+
+    assert analyzer.data is df
+    pd.testing.assert_frame_equal(df, before)
+    assert isinstance(sma, np.ndarray) and sma.dtype == np.float64
+    assert not sma.flags.writeable
+    assert not analyzer.context.column("Close").flags.writeable
+    assert isinstance(out["BB_UPPER_20_2"], np.ndarray)
+
+    copied = StockAnalyzer("aapl", df)
+    assert to_list(sma) == copied.calculate_sma(20)
+
+    frame = analyzer.to_frame()
+    assert {"SMA_20", "RSI_14", "EMA_12", "BB_MID_20_2"} <= set(frame.columns)
+    np.testing.assert_array_equal(frame["SMA_20"].to_numpy(), sma)
+    pd.testing.assert_frame_equal(df, before)
+
+
+# ---------------------------
+# Indicator result cache (UNIT)
+# ---------------------------
+
+def test_repeat_analysis_is_served_from_cache(tmp_path):
+    df = make_ohlcv(300)
+    cache = IndicatorCache(spill_dir=str(tmp_path))
+
+    first = StockAnalyzer("aapl", df, cache=cache)
+    sma = first.calculate_sma(20)
+    rsi = first.calculate_rsi(14)
+    anomalies = first.detect_anomalies(0.01)
+    first.calculate_indicators(["MACD_12_26_9"])
+    assert cache.stats()["misses"] == 4
+
+    second = StockAnalyzer("aapl", df.copy(), cache=cache)
+    with patch("src.Functions.analysis.indicator_registry.sma_kernel") as sma_kernel:
+        assert second.calculate_sma(20) == sma
+    sma_kernel.assert_not_called()
+    assert second.calculate_rsi(14) == rsi
+    assert second.detect_anomalies(0.01) == anomalies
+    assert cache.stats()["hits"] == 3
+
+    # A fresh process (new cache object) finds the spilled results on disk.
+    reloaded = IndicatorCache(spill_dir=str(tmp_path))
+    third = StockAnalyzer("aapl", df, cache=reloaded)
+    assert third.calculate_rsi(14) == rsi
+    assert reloaded.stats()["disk_hits"] == 1
+
+    changed = df.copy()
+    changed.loc[299, "Close"] += 1.0
+    StockAnalyzer("aapl", changed, cache=cache).calculate_sma(20)
+    assert cache.stats()["misses"] == 5
+
+
+def test_indicator_cache_spill_keeps_disk_budget_without_rescanning(tmp_path):
+    spill = tmp_path / "spill"
+    cache = IndicatorCache(spill_dir=str(spill), max_disk_bytes=3_000)
+    assert not spill.exists()
+    cache.put("fp0", "SMA", (20,), {"SMA_20": np.zeros(100)})
+    os.remove(next(spill.glob("*.npz")))  # e.g. cleared by another process
+
+    with patch("src.classes.indicator_cache.os.listdir", side_effect=AssertionError("rescanned")):
+        for i in range(1, 6):
+            cache.put(f"fp{i}", "SMA", (20,), {"SMA_20": np.zeros(100)})
+    files = list(spill.glob("*.npz"))
+    assert 1 <= len(files) < 5
+    assert sum(f.stat().st_size for f in files) <= 3_000
+    assert IndicatorCache(spill_dir=str(spill)).get("fp5", "SMA", (20,))["SMA_20"].shape == (100,)
+
+
+def test_indicator_cache_keeps_parameter_spellings_apart():
+    cache = IndicatorCache()
+    df = make_ohlcv(60)
+    cached = StockAnalyzer("aapl", df, cache=cache)
+    assert list(cached.calculate_indicators(["BBANDS_20_2"])) == ["BB_UPPER_20_2", "BB_MID_20_2", "BB_LOWER_20_2"]
+    spelled = cached.calculate_indicators(["BBANDS_20_2.0"])
+    assert spelled == StockAnalyzer("aapl", df).calculate_indicators(["BBANDS_20_2.0"])
+    assert list(spelled) == ["BB_UPPER_20_2.0", "BB_MID_20_2.0", "BB_LOWER_20_2.0"]
+
+
+def test_indicator_cache_evicts_to_memory_budget():
+    cache = IndicatorCache(max_bytes=2_000)
+    for i in range(5):
+        cache.put(f"fp{i}", "SMA", (20,), {"SMA_20": np.zeros(100)})
+    assert cache.stats()["bytes"] <= 2_000
+    assert cache.get("fp0", "SMA", (20,)) is None
+    assert cache.get("fp4", "SMA", (20,))["SMA_20"].shape == (100,)
@@ -0,0 +1,407 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+import pandas as pd
+import pytest
+
+from src.classes.stock_data_manager import StockDataManager
+from src.classes.async_stock_data_manager import AsyncStockDataManager
+from src.classes.portfolio_manager import PortfolioManager
+from src.classes.ohlcv_resampler import OHLCVResampler
+from src.classes.price_memory_cache import PriceMemoryCache
+from src.providers_base_classes_subclasses import ReplayPriceProvider, SyntheticPriceProvider
+from system.system_controller import SystemController
+
+YF_DOWNLOAD = "src.providers_base_classes_subclasses.yahoo_price_provider.yf.download"
+
+
+def make_bars(start, end):
+    dates = pd.bdate_range(start, end, inclusive="left")
+    close = [100.0 + i for i in range(len(dates))]
+    return pd.DataFrame({
+        "Date": dates,
+        "Open": close,
+        "High": close,
+        "Low": close,
+        "Close": close,
+        "Volume": [1000.0] * len(dates),
+    }).set_index("Date")
+
+
+def fake_download(ticker, start, end, **kwargs):
+    return make_bars(start, end)
+
+
+# ---------------------------
+# On-disk cache (UNIT)
+# ---------------------------
+
+def test_cached_fetch_only_downloads_missing_gaps(tmp_path):
+    dm = StockDataManager(cache_dir=str(tmp_path))
+
+    with patch(YF_DOWNLOAD, side_effect=fake_download) as dl:
+        first = dm.fetch_stock_data("AAPL", "2024-02-01", "2024-03-01")
+        again = dm.fetch_stock_data("AAPL", "2024-02-05", "2024-02-20")
+        assert dl.call_count == 1
+
+        wider = dm.fetch_stock_data("AAPL", "2024-01-01", "2024-03-01")
+        assert dl.call_count == 2
+        gap_start, gap_end = dl.call_args.kwargs["start"], dl.call_args.kwargs["end"]
+        assert gap_start.strftime("%Y-%m-%d") == "2024-01-01"
+        assert gap_end.strftime("%Y-%m-%d") == "2024-02-01"
+
+    assert list(first.columns) == ["Date", "Open", "High", "Low", "Close", "Volume"]
+    assert again["Date"].min() >= pd.Timestamp("2024-02-05")
+    assert again["Date"].max() < pd.Timestamp("2024-02-20")
+    assert wider["Date"].is_unique
+    assert len(wider) == len(pd.bdate_range("2024-01-01", "2024-03-01", inclusive="left"))
+
+
+def test_empty_download_is_not_cached(tmp_path):
+    dm = StockDataManager(cache_dir=str(tmp_path))
+
+    with patch(YF_DOWNLOAD, return_value=pd.DataFrame()) as dl:
+        assert dm.fetch_stock_data("AAPL", "2024-02-01", "2024-03-01").empty
+        assert dm.fetch_stock_data("AAPL", "2024-02-01", "2024-03-01").empty
+        assert dl.call_count == 2
+
+
+# ---------------------------
+# Batched download (UNIT)
+# ---------------------------
+
+def fake_batch_download(tickers, start, end, **kwargs):
+    frames = {t: make_bars(start, end) for t in tickers}
+    return pd.concat(frames, axis=1)
+
+
+def test_fetch_many_uses_one_grouped_request(tmp_path):
+    dm = StockDataManager(cache_dir=str(tmp_path))
+
+    with patch(YF_DOWNLOAD, side_effect=fake_batch_download) as dl:
+        frames = dm.fetch_many(["AAPL", "MSFT", "NVDA"], "2024-02-01", "2024-03-01")
+        assert dl.call_count == 1
+        assert dl.call_args.args[0] == ["AAPL", "MSFT", "NVDA"]
+
+        dm.fetch_many(["AAPL", "MSFT", "NVDA"], "2024-02-01", "2024-03-01")
+        assert dl.call_count == 1
+
+    assert set(frames) == {"AAPL", "MSFT", "NVDA"}
+    assert all(list(df.columns) == ["Date", "Open", "High", "Low", "Close", "Volume"] for df in frames.values())
+
+
+def test_portfolio_total_value_uses_fetch_many(tmp_path):
+    csv_file = tmp_path / "portfolio.csv"
+    csv_file.write_text("ticker,shares,buy_price\nAAPL,10,100\nMSFT,2,50\n")
+
+    dm = MagicMock()
+    dm.fetch_many.return_value = {
+        "AAPL": pd.DataFrame({"Close": [1.0, 2.0]}),
+        "MSFT": pd.DataFrame({"Close": [5.0]}),
+    }
+    pm = PortfolioManager(str(csv_file), data_manager=dm)
+
+    assert pm.compute_total_value("2024-01-01", "2024-02-01") == 30.0
+    dm.fetch_many.assert_called_once_with(["AAPL", "MSFT"], "2024-01-01", "2024-02-01")
+    dm.fetch_stock_data.assert_not_called()
+
+
+# ---------------------------
+# Incremental refresh (UNIT)
+# ---------------------------
+
+def test_refresh_fetches_from_last_stored_bar_and_dedups(tmp_path):
+    dm = StockDataManager(cache_dir=str(tmp_path))
+
+    with patch(YF_DOWNLOAD, side_effect=fake_download):
+        dm.fetch_stock_data("AAPL", "2024-01-01", "2024-02-01")
+    assert dm.cache.last_date("AAPL") == "2024-01-31"
+
+    with patch(YF_DOWNLOAD, side_effect=fake_download) as dl:
+        delta = dm.refresh(["AAPL"])
+        assert dl.call_count == 1
+        assert dl.call_args.kwargs["start"].strftime("%Y-%m-%d") == "2024-01-31"
+
+    history = dm.cache.read("AAPL", "2024-01-01", "2100-01-01")
+    assert history["Date"].is_unique
+    assert history["Date"].is_monotonic_increasing
+    assert delta["AAPL"]["Date"].iloc[0] == pd.Timestamp("2024-01-31")
+    # The boundary day was replaced by the refreshed bar.
+    assert history.loc[history["Date"] == "2024-01-31", "Close"].iloc[0] == 100.0
+
+
+# ---------------------------
+# In-memory cache (UNIT)
+# ---------------------------
+
+def test_memory_cache_answers_sub_ranges_by_slicing():
+    cache = PriceMemoryCache(ttl_seconds=60)
+    dm = StockDataManager(memory_cache=cache)
+
+    with patch(YF_DOWNLOAD, side_effect=fake_download) as dl:
+        year = dm.fetch_stock_data("AAPL", "2024-01-01", "2025-01-01")
+        month = dm.fetch_stock_data("AAPL", "2024-12-01", "2025-01-01")
+        assert dl.call_count == 1
+
+    assert month["Date"].min() >= pd.Timestamp("2024-12-01")
+    assert month.equals(year[year["Date"] >= "2024-12-01"].reset_index(drop=True))
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_cache_ttl_and_lru_eviction():
+    now = [0.0]
+    cache = PriceMemoryCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    bars = make_bars("2024-01-01", "2024-02-01").reset_index()
+
+    cache.put("AAPL", "2024-01-01", "2024-02-01", bars)
+    cache.put("MSFT", "2024-01-01", "2024-02-01", bars)
+    assert cache.get("AAPL", "2024-01-02", "2024-01-10") is not None
+    cache.put("NVDA", "2024-01-01", "2024-02-01", bars)
+
+    assert cache.get("MSFT", "2024-01-02", "2024-01-10") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] = 11.0
+    assert cache.get("AAPL", "2024-01-02", "2024-01-10") is None
+
+
+def test_memory_cache_merge_keeps_the_original_expiry():
+    now = [0.0]
+    cache = PriceMemoryCache(ttl_seconds=10, clock=lambda: now[0])
+    cache.put("AAPL", "2024-01-01", "2024-02-01", make_bars("2024-01-01", "2024-02-01").reset_index())
+    for t in (6.0, 9.0):  # frequent overlapping refreshes must not extend the old bars' lifetime
+        now[0] = t
+        cache.put("AAPL", "2024-01-20", "2024-02-15", make_bars("2024-01-20", "2024-02-15").reset_index())
+    assert cache.get("AAPL", "2024-01-02", "2024-02-10") is not None
+
+    now[0] = 10.5
+    assert cache.get("AAPL", "2024-01-02", "2024-01-10") is None
+
+
+# ---------------------------
+# Offline providers (UNIT)
+# ---------------------------
+
+def test_synthetic_provider_is_deterministic_across_ranges():
+    provider = SyntheticPriceProvider(seed=3)
+    short = provider.fetch_data(["AAPL"], "2024-03-01", "2024-04-01")["AAPL"]
+    long = provider.fetch_data(["AAPL", "MSFT"], "2023-01-01", "2024-06-01")["AAPL"]
+
+    overlap = long[(long["Date"] >= "2024-03-01") & (long["Date"] < "2024-04-01")]
+    assert overlap.reset_index(drop=True).equals(short)
+    assert (short["Low"] <= short["Close"]).all() and (short["Close"] <= short["High"]).all()
+
+
+def test_replay_provider_serves_recorded_csv(tmp_path):
+    make_bars("2024-01-01", "2024-03-01").reset_index().to_csv(tmp_path / "AAPL.csv", index=False)
+    dm = StockDataManager(api="replay", provider=ReplayPriceProvider(str(tmp_path)))
+
+    df = dm.fetch_stock_data("AAPL", "2024-02-01", "2024-02-08")
+    assert list(df["Date"].dt.strftime("%Y-%m-%d")) == [
+        "2024-02-01", "2024-02-02", "2024-02-05", "2024-02-06", "2024-02-07"
+    ]
+    assert dm.fetch_many(["MSFT"], "2024-02-01", "2024-02-08")["MSFT"].empty
+
+
+def test_system_controller_runs_offline_with_synthetic_prices(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path), api="synthetic")
+    payload = sc.get_stock_timeseries("AAPL", "2024-01-01", "2024-06-01")
+
+    assert "error" not in payload
+    assert len(payload["labels"]) == len(payload["datasets"][0]["data"])
+    assert (tmp_path / "stock_cache" / "synthetic" / "AAPL.npz").exists()
+
+
+# ---------------------------
+# Async concurrent fetching (UNIT)
+# ---------------------------
+
+class FlakyProvider(SyntheticPriceProvider):
+    """Fails the first call for every ticker and tracks peak concurrency."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = {}
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def fetch_data(self, tickers, start, end):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            count = self.calls[tickers[0]] = self.calls.get(tickers[0], 0) + 1
+        try:
+            time.sleep(0.01)
+            if count == 1:
+                raise ConnectionError("temporary outage")
+            if tickers[0] == "BAD":
+                raise RuntimeError("permanent failure")
+            return super().fetch_data(tickers, start, end)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_async_manager_retries_and_bounds_concurrency():
+    provider = FlakyProvider()
+    dm = AsyncStockDataManager(provider=provider, max_concurrency=3, retries=2, backoff=0)
+    tickers = [f"T{i}" for i in range(10)] + ["BAD"]
+
+    frames = dm.fetch_many_concurrent(tickers, "2024-01-01", "2024-02-01")
+
+    assert all(not frames[f"T{i}"].empty for i in range(10))
+    assert frames["BAD"].empty
+    assert list(dm.last_errors) == ["BAD"]
+    assert provider.peak <= 3
+    assert provider.calls["T0"] == 2
+
+
+class HangingProvider(FlakyProvider):
+    """First call per ticker hangs past the timeout; 'EMPTY' returns nothing; 'DENIED' hits a local error."""
+
+    def fetch_data(self, tickers, start, end):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            count = self.calls[tickers[0]] = self.calls.get(tickers[0], 0) + 1
+        try:
+            if tickers[0] == "DENIED":
+                raise PermissionError("cache folder is read-only")
+            if tickers[0] == "EMPTY":
+                return {}
+            time.sleep(0.3 if count == 1 else 0.01)
+            return SyntheticPriceProvider.fetch_data(self, tickers, start, end)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_async_manager_timeouts_never_exceed_concurrency():
+    provider = HangingProvider()
+    dm = AsyncStockDataManager(provider=provider, max_concurrency=2, timeout=0.05, retries=3, backoff=0)
+    tickers = ["A", "B", "C", "EMPTY", "DENIED"]
+
+    frames = dm.fetch_many_concurrent(tickers, "2024-01-01", "2024-02-01")
+
+    assert provider.peak <= 2  # abandoned attempts keep their slot until they finish
+    assert not frames["A"].empty and not frames["C"].empty
+    assert dm.last_errors["EMPTY"].startswith("EmptyDataError")
+    assert provider.calls["EMPTY"] == 4  # empty results are retried like failures
+    assert dm.last_errors["DENIED"].startswith("PermissionError")
+    assert provider.calls["DENIED"] == 1  # local OSErrors are not retried
+
+
+# ---------------------------
+# Single-flight coalescing (UNIT)
+# ---------------------------
+
+def test_concurrent_identical_fetches_share_one_download():
+    release = threading.Event()
+
+    def slow_download(ticker, start, end, **kwargs):
+        release.wait(timeout=5)
+        return make_bars(start, end)
+
+    dm = StockDataManager()
+    results = []
+
+    with patch(YF_DOWNLOAD, side_effect=slow_download) as dl:
+        workers = [
+            threading.Thread(target=lambda: results.append(
+                dm.fetch_stock_data("AAPL", "2024-01-01", "2024-02-01")))
+            for _ in range(5)
+        ]
+        for w in workers:
+            w.start()
+        while dm.single_flight.stats()["shared"] < 4:
+            time.sleep(0.001)
+        release.set()
+        for w in workers:
+            w.join()
+
+    assert dl.call_count == 1
+    assert len(results) == 5
+    assert all(df.equals(results[0]) for df in results)
+    assert len({id(df) for df in results}) == 5
+
+
+# ---------------------------
+# Resampling (UNIT)
+# ---------------------------
+
+def synthetic_daily(start, end):
+    return SyntheticPriceProvider().fetch_data(["AAPL"], start, end)["AAPL"]
+
+
+def test_resample_matches_pandas_calendar_aggregation():
+    daily = synthetic_daily("2023-01-01", "2024-07-01")
+    indexed = daily.set_index("Date")
+    agg = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+    for rule, pandas_rule in (("W", "W-SUN"), ("M", "ME"), ("Q", "QE")):
+        expected = indexed.resample(pandas_rule).agg(agg).dropna(subset=["Close"])
+        result = OHLCVResampler.resample(daily, rule)
+        assert len(result) == len(expected)
+        for column in agg:
+            assert result[column].tolist() == pytest.approx(expected[column].tolist())
+        # Bars are labelled with their last trading day.
+        assert result["Date"].iloc[-1] == daily["Date"].iloc[-1]
+
+
+def test_resampler_extends_cached_aggregates_incrementally():
+    daily = synthetic_daily("2024-01-01", "2024-06-15")
+    resampler = OHLCVResampler()
+
+    first = resampler.get("AAPL", daily.iloc[:80], "W")
+    again = resampler.get("AAPL", daily.iloc[:80], "W")
+    extended = resampler.get("AAPL", daily, "W")
+
+    pd.testing.assert_frame_equal(first, again)
+    pd.testing.assert_frame_equal(extended, OHLCVResampler.resample(daily, "W"))
+    assert resampler.stats() == {"hits": 1, "incremental": 1, "full": 1, "entries": 1}
+    with pytest.raises(ValueError):
+        resampler.get("AAPL", daily, "H")
+
+
+def test_resampler_recomputes_when_cached_bars_are_revised():
+    daily = synthetic_daily("2024-01-01", "2024-06-15")
+    resampler = OHLCVResampler()
+    before = resampler.get("AAPL", daily, "W")
+
+    revised = daily.copy()
+    revised.loc[revised.index[-1], "Close"] += 5.0  # refetched last day
+    after = resampler.get("AAPL", revised, "W")
+    assert after["Close"].iloc[-1] == before["Close"].iloc[-1] + 5.0
+    pd.testing.assert_frame_equal(after, OHLCVResampler.resample(revised, "W"))
+
+    # A back-adjusted early bar must not be extended incrementally either.
+    adjusted = pd.concat([revised, synthetic_daily("2024-06-16", "2024-06-30")], ignore_index=True)
+    adjusted.loc[0, "Close"] *= 0.5
+    pd.testing.assert_frame_equal(resampler.get("AAPL", adjusted, "W"), OHLCVResampler.resample(adjusted, "W"))
+    assert resampler.stats() == {"hits": 0, "incremental": 0, "full": 3, "entries": 1}
+
+
+def test_resampler_persists_aggregates_next_to_daily_cache(tmp_path):
+    daily = synthetic_daily("2024-01-01", "2024-06-15")
+    folder = tmp_path / "resampled"
+    OHLCVResampler(cache_dir=str(folder)).get("AAPL", daily.iloc[:80], "M")
+    assert [p.name for p in folder.iterdir()] == ["AAPL_M.npz"]
+
+    # A new session starts warm: the saved aggregate is extended, not rebuilt.
+    fresh = OHLCVResampler(cache_dir=str(folder))
+    pd.testing.assert_frame_equal(fresh.get("AAPL", daily, "M"), OHLCVResampler.resample(daily, "M"))
+    assert fresh.stats() == {"hits": 0, "incremental": 1, "full": 0, "entries": 1}
+    fresh.invalidate("AAPL")
+    assert list(folder.iterdir()) == []
+
+
+def test_system_controller_charts_weekly_bars(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path), api="synthetic")
+    daily = sc.get_stock_timeseries("AAPL", "2023-01-01", "2024-06-01")
+    weekly = sc.get_stock_timeseries("AAPL", "2023-01-01", "2024-06-01", interval="W")
+
+    assert len(weekly["labels"]) < len(daily["labels"]) / 4
+    assert len(weekly["indicators"]["SMA_20"]) == len(weekly["labels"])
+    assert "error" in sc.get_stock_timeseries("AAPL", "2023-01-01", "2024-06-01", interval="5min")
@@ -1,7 +1,14 @@
+import json
+import os
+import time
+
 import pytest
 from unittest.mock import MagicMock, patch
+import numpy as np
 import pandas as pd
 
+from src.Functions.interface.charting import prepare_chart_payload
+from src.classes.state_persister import StatePersister
 from system.system_controller import SystemController
 
 
@@ -50,6 +57,79 @@ def test_missing_close_column_returns_error():
     assert "error" in result
 
 
+def test_extra_indicators_are_overlaid(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path), api="synthetic")
+    payload = sc.get_stock_timeseries("AAPL", "2024-01-01", "2024-06-01",
+                                      indicators=["EMA_12", "ATR_14", "OBV"])
+
+    labels = [d["label"] for d in payload["datasets"]]
+    assert {"SMA_20", "RSI_14", "EMA_12", "ATR_14", "OBV"} <= set(labels)
+    assert "error" in sc.get_stock_timeseries("AAPL", "2024-01-01", "2024-06-01", indicators=["BOGUS"])
+    assert "error" in sc.get_stock_timeseries("AAPL", "2024-01-01", "2024-06-01", indicators=["SMA_2.5"])
+
+
+# ---------------------------
+# Chart downsampling (UNIT)
+# ---------------------------
+
+def test_lttb_payload_applies_one_selection_to_every_dataset():
+    prices = [100.0 + (i % 50) - (25.0 if i == 777 else 0.0) for i in range(5_000)]
+    sma = [None] * 10 + [float(i) for i in range(10, 5_000)]
+    labels = [f"t{i}" for i in range(5_000)]
+
+    payload = prepare_chart_payload(prices, labels, {"SMA_10": sma}, max_points=500, keep_indices=[1234])
+
+    kept = payload["indices"]
+    assert len(kept) <= 500
+    assert kept[0] == 0 and kept[-1] == 4_999
+    assert 1234 in kept and 777 in kept  # forced index and the visual outlier
+    assert payload["labels"] == [labels[i] for i in kept]
+    assert payload["datasets"][0]["data"] == [round(prices[i], 4) for i in kept]
+    assert payload["datasets"][1]["data"] == [sma[i] for i in kept]
+    assert payload["meta"]["min"] == min(prices)
+
+    short = prepare_chart_payload(prices[:100], max_points=500)
+    assert "indices" not in short and len(short["labels"]) == 100
+
+
+def test_columnar_payload_matches_list_payload_and_nulls_nan():
+    rng = np.random.default_rng(7)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 1_000))
+    sma = np.r_[np.full(9, np.nan), prices[9:] * 0.99]
+    dates = pd.bdate_range("2020-01-01", periods=1_000)
+
+    columnar = prepare_chart_payload(prices, dates.to_numpy(), {"SMA_10": sma})
+    listed = prepare_chart_payload(
+        prices.tolist(), dates.to_pydatetime().tolist(),
+        {"SMA_10": [None if np.isnan(v) else float(v) for v in sma]},
+    )
+
+    assert columnar == listed
+    assert columnar["labels"][0] == "2020-01-01T00:00:00"
+    assert columnar["datasets"][1]["data"][:9] == [None] * 9
+    assert columnar["datasets"][0]["data"] == [round(float(v), 4) for v in prices]
+    assert columnar["meta"]["avg"] == round(float(prices.mean()), 4)
+    assert json.dumps(columnar)  # plain Python floats/None only
+
+
+def test_downsampled_timeseries_remaps_anomalies(tmp_path):
+    dates = pd.bdate_range("2012-01-02", periods=3_000)
+    close = [100.0 + (i % 40) * 0.1 for i in range(3_000)]
+    for i in (500, 1500, 2500):
+        close[i] *= 1.2  # 20% spikes -> anomalies
+    sc = SystemController(data_dir=str(tmp_path))
+    sc.data_manager = MagicMock()
+    sc.data_manager.validate_ticker.return_value = True
+    sc.data_manager.fetch_stock_data.return_value = pd.DataFrame({"Date": dates, "Close": close})
+
+    full = sc.get_stock_timeseries("AAPL", "2012-01-01", "2024-01-01")
+    small = sc.get_stock_timeseries("AAPL", "2012-01-01", "2024-01-01", max_points=300)
+
+    assert full["anomalies"] and len(small["labels"]) <= 300
+    assert [small["labels"][i] for i in small["anomalies"]] == [full["labels"][i] for i in full["anomalies"]]
+    assert small["indicators"]["SMA_20"][-1] == full["indicators"]["SMA_20"][-1]
+    assert len(small["indicators"]["RSI_14"]) == len(small["labels"])
+
 # ---------------------------
 # CSV Import (UNIT)
 # ---------------------------
@@ -72,3 +152,90 @@ def test_save_and_load_state(tmp_path):
     loaded = sc.load_state(str(file))
 
     assert loaded["x"] == 1
+
+
+# ---------------------------
+# Background state persistence (UNIT)
+# ---------------------------
+
+def test_state_persister_coalesces_and_skips_unchanged(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    state_file = str(tmp_path / "app_state.stkb")
+    saves = []
+
+    def save(state):
+        saves.append(state)
+        sc.save_state(state, state_file)
+
+    persister = StatePersister(save, debounce_seconds=60)
+    for i in range(50):
+        persister.request_save({"last_payload": {"prices": [float(i)] * 100}})
+    assert saves == []  # still debouncing; nothing written on the caller's thread
+
+    assert persister.flush(timeout=5)
+    assert len(saves) == 1 and saves[0]["last_payload"]["prices"][0] == 49.0
+    assert sc.load_state(state_file) == saves[0]
+
+    persister.request_save({"last_payload": {"prices": [49.0] * 100}})
+    persister.close()
+    assert persister.stats() == {"requested": 51, "written": 1, "skipped": 1, "failed": 0}
+    with pytest.raises(RuntimeError):
+        persister.request_save({})
+
+
+def test_state_persister_retries_failed_saves(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    target = {"path": str(blocker / "app_state.stkb")}
+    assert sc.save_state({"a": 1}, target["path"]) is False
+
+    persister = StatePersister(lambda s: sc.save_state(s, target["path"]), debounce_seconds=0)
+    persister.request_save({"a": 1})
+    assert persister.flush(timeout=5)
+    assert persister.stats()["failed"] == 1
+
+    # The fingerprint was not recorded, so the same state is written once the path works.
+    target["path"] = str(tmp_path / "app_state.stkb")
+    persister.request_save({"a": 1})
+    persister.close()
+    assert persister.stats() == {"requested": 2, "written": 1, "skipped": 0, "failed": 1}
+    assert sc.load_state(target["path"]) == {"a": 1}
+
+
+def test_state_persister_max_wait_bounds_debounce():
+    saves = []
+    persister = StatePersister(saves.append, debounce_seconds=60, max_wait_seconds=0.2)
+    deadline = time.monotonic() + 5
+    i = 0
+    while not saves and time.monotonic() < deadline:
+        persister.request_save({"i": i})  # keeps resetting the quiet period
+        i += 1
+        time.sleep(0.01)
+    persister.close()
+    assert saves and saves[0]["i"] < i
+
+
+def test_save_state_is_atomic(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    state_file = tmp_path / "app_state.json"
+    sc.save_state({"v": 1}, str(state_file))
+
+    with patch("system.system_controller.os.replace", side_effect=OSError("disk full")):
+        sc.save_state({"v": 2}, str(state_file))
+
+    assert sc.load_state(str(state_file)) == {"v": 1}
+    assert os.listdir(tmp_path).count("app_state.json") == 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_deduplicated_export_is_atomic(tmp_path):
+    sc = SystemController(data_dir=str(tmp_path))
+    payload = {"ticker": "AAPL", "labels": [f"d{i}" for i in range(300)]}
+    path = sc.export_analysis(payload, "a.json", dedupe=True)
+
+    with patch("system.system_controller.os.replace", side_effect=OSError("disk full")), \
+            pytest.raises(OSError):
+        sc.export_analysis({**payload, "title": "changed"}, "a.json", dedupe=True)
+    assert sc.load_report(path) == payload
+    assert not [n for n in os.listdir(tmp_path / "analysis_reports") if n.endswith(".tmp")]